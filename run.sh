@@ -1,8 +1,17 @@
 #!/bin/bash
 # Runs the experiments specified in experiments/workunits.txt
 # Must be in smt virtual environment and have done setup_run.sh
+# Usage: run.sh [number of shards for each workunit]
 
+NUM_SHARD=${1:-1}
 for w in `cat experiments/workunits.txt`
   do
-    python smarte/workunit_runner.py $w &
+    if [ ${NUM_SHARD} -eq 1 ]; then
+      python smarte/workunit_runner.py $w &
+    else
+      for (( i=0; i<${NUM_SHARD}; i++ ))
+        do
+          python smarte/workunit_runner.py $w --shard $i/${NUM_SHARD} &
+        done
+    fi
   done
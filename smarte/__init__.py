@@ -1,7 +1,7 @@
 import smarte.constants as cn
-from smarte.condition import Condition
+from smarte.condition import Condition, FrozenCondition
 from smarte.workunit_runner import WorkunitRunner
-from smarte.result import Result
+from smarte.result import Result, FrozenResult
 from smarte.result_collection import ResultCollection
 from smarte.condition_collection import ConditionCollection
 from smarte.extended_dict import ExtendedDict
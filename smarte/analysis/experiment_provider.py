@@ -20,7 +20,7 @@ DIR_PAT = "%s--%s"
 STATISTICS_FILE = "statistics.csv"
 # Deprecated symols
 NUM_LATINCUBE = "num_latincube"
-BLC_SUFFIX = "_blc"  # suffix for best latincube
+BLC_SUFFIX = cn.BLC_SUFFIX  # suffix for best latincube
 
 
 class ExperimentProvider(object):
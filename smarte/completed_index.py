@@ -0,0 +1,238 @@
+"""Index of conditions that are completed or being run.
+
+The index is an SQLite database that is shared by runners. A runner claims a
+condition before running it and marks it completed when its result is
+journaled. A claim succeeds only if no other runner has claimed or completed
+the condition, if the claim has the same owner (a restarted runner of the
+same workunit), or if a claim is older than the claim timeout (the runner
+was interrupted and not restarted). Each change is a single statement so that concurrent
+writers do not duplicate work. The database uses write-ahead logging so
+that readers do not block writers.
+"""
+
+import smarte.constants as cn
+from smarte.analysis.experiment_provider import ExperimentProvider
+from smarte.condition import makeKey
+from smarte.types.elemental_type import convertStr
+from smarte.workunit import WORKUNIT_FILE_PREFIX
+
+import os
+import pandas as pd
+import socket
+import sqlite3
+import time
+
+CLAIMED = 0
+COMPLETED = 1
+CLAIM_TIMEOUT = 7*24*3600  # Seconds after which a claim can be taken over
+CONNECT_TIMEOUT = 60  # Seconds to wait for a lock on the database
+INSERT_BATCH_SIZE = 10000  # Keys inserted in a transaction
+
+
+def readResults(directory=cn.EXPERIMENT_DIR):
+    """
+    Reads the results in the CSV files of workunits and zip archives.
+
+    Parameters
+    ----------
+    directory: str
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    dfs = []
+    for ffile in os.listdir(directory):
+        if ffile.startswith(WORKUNIT_FILE_PREFIX) and ffile.endswith(".csv"):
+            dfs.append(pd.read_csv(os.path.join(directory, ffile)))
+    if len(ExperimentProvider.getZippaths(directory=directory)) > 0:
+        dfs.append(ExperimentProvider.makeDataframe(directory=directory))
+    if len(dfs) == 0:
+        return pd.DataFrame(columns=cn.SD_ALL)
+    return pd.concat(dfs, ignore_index=True)
+
+
+class CompletedIndex(object):
+
+    def __init__(self, path=cn.COMPLETED_INDEX_PATH,
+          claim_timeout=CLAIM_TIMEOUT, owner=None):
+        """
+        Parameters
+        ----------
+        path: str (path to the database)
+        claim_timeout: float (seconds after which a claim can be taken over)
+        owner: str (name of the claims of this process)
+            default: host and process id
+            A runner uses the file name of its workunit so that it takes
+            back its claims when it is restarted.
+        """
+        self.path = path
+        self.claim_timeout = claim_timeout
+        if owner is None:
+            owner = "%s:%d" % (socket.gethostname(), os.getpid())
+        self.owner = owner
+        self._connection = None
+
+    def __getstate__(self):
+        # Connections are not shared between processes
+        state = dict(self.__dict__)
+        state["_connection"] = None
+        return state
+
+    def _getConnection(self):
+        """
+        Provides the connection to the database, creating the database
+        if needed.
+
+        Returns
+        -------
+        sqlite3.Connection
+        """
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=CONNECT_TIMEOUT,
+                  isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("""CREATE TABLE IF NOT EXISTS conditions (
+                  key TEXT PRIMARY KEY,
+                  state INTEGER NOT NULL,
+                  owner TEXT,
+                  updated REAL NOT NULL)""")
+            self._connection = connection
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def claim(self, condition):
+        """
+        Claims the condition for this process.
+
+        Parameters
+        ----------
+        condition: Condition
+
+        Returns
+        -------
+        bool (True if the condition should be run by this process)
+        """
+        key = makeKey(condition)
+        now = time.time()
+        connection = self._getConnection()
+        cursor = connection.execute(
+              "INSERT OR IGNORE INTO conditions VALUES (?, ?, ?, ?)",
+              (key, CLAIMED, self.owner, now))
+        if cursor.rowcount == 1:
+            return True
+        # Take back an own claim or take over a claim of an interrupted runner
+        cursor = connection.execute("""UPDATE conditions
+              SET owner = ?, updated = ?
+              WHERE key = ? AND state = ? AND (owner = ? OR updated < ?)""",
+              (self.owner, now, key, CLAIMED, self.owner,
+              now - self.claim_timeout))
+        return cursor.rowcount == 1
+
+    def complete(self, condition):
+        """
+        Records that the condition has a result.
+
+        Parameters
+        ----------
+        condition: Condition
+        """
+        self._getConnection().execute(
+              "INSERT OR REPLACE INTO conditions VALUES (?, ?, ?, ?)",
+              (makeKey(condition), COMPLETED, self.owner, time.time()))
+
+    def release(self, condition):
+        """
+        Removes the claim of this process for a condition that was not
+        completed.
+
+        Parameters
+        ----------
+        condition: Condition
+        """
+        self._getConnection().execute(
+              "DELETE FROM conditions WHERE key = ? AND state = ? AND owner = ?",
+              (makeKey(condition), CLAIMED, self.owner))
+
+    def isCompleted(self, condition):
+        """
+        Tests if the condition has a result.
+
+        Parameters
+        ----------
+        condition: Condition
+
+        Returns
+        -------
+        bool
+        """
+        cursor = self._getConnection().execute(
+              "SELECT state FROM conditions WHERE key = ?",
+              (makeKey(condition),))
+        row = cursor.fetchone()
+        return (row is not None) and (row[0] == COMPLETED)
+
+    def __contains__(self, condition):
+        return self.isCompleted(condition)
+
+    def __len__(self):
+        cursor = self._getConnection().execute(
+              "SELECT COUNT(*) FROM conditions WHERE state = ?", (COMPLETED,))
+        return cursor.fetchone()[0]
+
+    def addResults(self, df):
+        """
+        Records the conditions of results as completed.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            columns: cn.SD_CONDITIONS
+
+        Returns
+        -------
+        int (number of results with conditions)
+        """
+        if len(set(cn.SD_CONDITIONS).difference(df.columns)) > 0:
+            return 0
+        df = df[cn.SD_CONDITIONS].dropna()
+        keys = set()
+        for row in df.astype(str).to_dict("records"):
+            condition = {k: convertStr(v) for k, v in row.items()}
+            keys.add(makeKey(condition))
+        keys = sorted(keys)
+        now = time.time()
+        connection = self._getConnection()
+        for start in range(0, len(keys), INSERT_BATCH_SIZE):
+            records = [(k, COMPLETED, self.owner, now)
+                  for k in keys[start:start + INSERT_BATCH_SIZE]]
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(
+                      "INSERT OR REPLACE INTO conditions VALUES (?, ?, ?, ?)",
+                      records)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return len(df)
+
+    def addResultFiles(self, directory=cn.EXPERIMENT_DIR):
+        """
+        Records the conditions of the results in the CSV files of workunits
+        and zip archives in a directory.
+
+        Parameters
+        ----------
+        directory: str
+
+        Returns
+        -------
+        int (number of results with conditions)
+        """
+        return self.addResults(readResults(directory=directory))
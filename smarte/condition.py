@@ -1,10 +1,56 @@
 """A Condition is a specification of one level for all factors."""
 
 import smarte.constants as cn
+from smarte.types.elemental_dict import KEY_VALUE_SEP, VALUE_SEP
+from smarte.types.frozen_sv_dict import FrozenSVDict
 from smarte.types.sv_dict import SVDict
 
+# Factors whose levels are integers
+INT_FACTORS = [k for k, v in cn.SD_CONDITION_DCT.items()
+      if isinstance(v, int) or (k in cn.SD_CONDITION_EXPANSION_DCT)]
+
+
+def makeKey(condition):
+    """
+    Creates the key of a condition. Values are converted so that a condition
+    read from a file has the same key as the condition parsed from a
+    workunit string.
+
+    Parameters
+    ----------
+    condition: dict/Condition
+
+    Returns
+    -------
+    str
+    """
+    stgs = []
+    for factor in sorted(cn.SD_CONDITIONS):
+        value = condition[factor]
+        if isinstance(value, float) and (factor in INT_FACTORS)  \
+              and value.is_integer():
+            value = int(value)
+        stgs.append(factor + VALUE_SEP + str(value))
+    return KEY_VALUE_SEP.join(stgs)
+
 
 class Condition(SVDict):
+    __slots__ = ()
     # Select single values or None if multiple values specified
     default_dct = {k: None if v == cn.SD_CONDITION_VALUE_ALL else v
          for k, v in  cn.SD_CONDITION_DCT.items()}
+
+    def freeze(self):
+        """
+        Creates an immutable, hashable copy.
+
+        Returns
+        -------
+        FrozenCondition
+        """
+        return FrozenCondition(**self)
+
+
+class FrozenCondition(FrozenSVDict):
+    __slots__ = ()
+    sv_dict_cls = Condition
@@ -0,0 +1,230 @@
+"""Array representation of a collection of conditions.
+
+A ConditionSpace encodes each condition as the positions of its levels in
+the list of levels of each factor. Codes are kept in an integer array with
+a row for each condition and a column for each factor, so that selection,
+exclusion, sharding, and the calculation of costs are array operations. A
+Condition is constructed only when it is requested.
+"""
+
+from smarte.condition import Condition
+
+import numpy as np
+
+
+class ConditionSpace(object):
+
+    def __init__(self, level_dct, code_arr=None):
+        """
+        Parameters
+        ----------
+        level_dct: dict
+            key: factor
+            value: list of levels
+        code_arr: np.array-int
+            rows: conditions
+            columns: factors in the order of level_dct
+            values: position of the level
+            default: all combinations of levels in the order of
+                MVDictHypercube iteration. There are no conditions if there
+                are no factors.
+        """
+        self.level_dct = {k: list(v) for k, v in level_dct.items()}
+        self.factors = list(self.level_dct.keys())
+        self._column_dct = {f: n for n, f in enumerate(self.factors)}
+        if code_arr is None:
+            sizes = [len(v) for v in self.level_dct.values()]
+            num_condition = 0
+            if len(sizes) > 0:
+                num_condition = int(np.prod(sizes))
+            if max(sizes, default=0) <= np.iinfo(np.int16).max:
+                dtype = np.int16
+            else:
+                dtype = np.int32
+            code_arr = np.zeros((num_condition, len(sizes)), dtype=dtype)
+            if num_condition > 0:
+                codes = np.unravel_index(np.arange(num_condition), sizes)
+                code_arr[:, :] = np.array(codes).T
+        self.code_arr = code_arr
+
+    @classmethod
+    def makeFromConditionCollection(cls, condition_collection):
+        """
+        Constructs the space of the conditions in the hypercube.
+
+        Parameters
+        ----------
+        condition_collection: ConditionCollection
+
+        Returns
+        -------
+        ConditionSpace
+        """
+        level_dct = {k: condition_collection[k]
+              for k in condition_collection.keys()}
+        return cls(level_dct)
+
+    def __len__(self):
+        return len(self.code_arr)
+
+    def _getLevelPositions(self, factor, levels):
+        """
+        Finds the positions of levels of a factor.
+
+        Returns
+        -------
+        list-int
+        """
+        return [n for n, v in enumerate(self.level_dct[factor]) if v in levels]
+
+    def _makeSubspace(self, selector):
+        return self.__class__(self.level_dct, code_arr=self.code_arr[selector])
+
+    def getCondition(self, idx):
+        """
+        Constructs the condition at a position.
+
+        Parameters
+        ----------
+        idx: int
+
+        Returns
+        -------
+        Condition
+        """
+        codes = self.code_arr[idx]
+        dct = {f: self.level_dct[f][c] for f, c in zip(self.factors, codes)}
+        return Condition(**dct)
+
+    def __getitem__(self, selector):
+        """
+        Parameters
+        ----------
+        selector: int/slice/array-int/array-bool
+
+        Returns
+        -------
+        Condition if selector is an int
+        ConditionSpace otherwise
+        """
+        if isinstance(selector, (int, np.integer)):
+            return self.getCondition(selector)
+        return self._makeSubspace(selector)
+
+    def iterate(self):
+        """
+        Iterates on the conditions.
+
+        Returns
+        -------
+        Condition
+        """
+        for idx in range(len(self)):
+            yield self.getCondition(idx)
+
+    def getValues(self, factor):
+        """
+        Provides the level of a factor for each condition.
+
+        Parameters
+        ----------
+        factor: str
+
+        Returns
+        -------
+        np.array
+        """
+        levels = np.empty(len(self.level_dct[factor]), dtype=object)
+        levels[:] = self.level_dct[factor]
+        return levels[self.code_arr[:, self._column_dct[factor]]]
+
+    def select(self, **kwargs):
+        """
+        Selects the conditions with the specified levels.
+
+        Parameters
+        ----------
+        kwargs: dict
+            key: factor
+            value: list of levels
+
+        Returns
+        -------
+        ConditionSpace
+        """
+        sel_arr = np.repeat(True, len(self))
+        for factor, levels in kwargs.items():
+            positions = self._getLevelPositions(factor, levels)
+            sel_arr &= np.isin(self.code_arr[:, self._column_dct[factor]],
+                  positions)
+        return self._makeSubspace(sel_arr)
+
+    def exclude(self, factor_collection):
+        """
+        Removes conditions that have an excluded level of a factor.
+        This is the same as the exclusion done by Workunit.iterate.
+
+        Parameters
+        ----------
+        factor_collection: dict/FactorCollection
+            key: factor
+            value: list of levels
+
+        Returns
+        -------
+        ConditionSpace
+        """
+        sel_arr = np.repeat(True, len(self))
+        for factor, levels in factor_collection.items():
+            if (len(levels) == 0) or (not factor in self._column_dct):
+                continue
+            positions = self._getLevelPositions(factor, levels)
+            sel_arr &= ~np.isin(self.code_arr[:, self._column_dct[factor]],
+                  positions)
+        return self._makeSubspace(sel_arr)
+
+    def calcCosts(self, cost_fn, factors=None):
+        """
+        Calculates the cost of each condition. A Condition is constructed
+        only for the first condition with each combination of the levels of
+        the factors that determine the cost.
+
+        Parameters
+        ----------
+        cost_fn: Function
+            Parameters: Condition
+            Returns: float
+        factors: list-str (factors that determine the cost)
+            default: all factors
+
+        Returns
+        -------
+        np.array-float
+        """
+        if len(self) == 0:
+            return np.zeros(0)
+        if factors is None:
+            factors = self.factors
+        columns = [self._column_dct[f] for f in factors if f in self._column_dct]
+        if len(columns) == 0:
+            return np.repeat(float(cost_fn(self.getCondition(0))), len(self))
+        _, idxs, inverse_arr = np.unique(self.code_arr[:, columns], axis=0,
+              return_index=True, return_inverse=True)
+        costs = np.array([cost_fn(self.getCondition(i)) for i in idxs],
+              dtype=float)
+        return costs[inverse_arr.reshape(-1)]
+
+    def shard(self, num_shard):
+        """
+        Partitions the conditions into contiguous shards of nearly equal size.
+
+        Parameters
+        ----------
+        num_shard: int
+
+        Returns
+        -------
+        list-ConditionSpace
+        """
+        return [self.__class__(self.level_dct, code_arr=a)
+              for a in np.array_split(self.code_arr, num_shard)]
@@ -19,7 +19,13 @@ MILLISECONDS = "milliseconds"
 PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 EXPERIMENT_DIR = os.path.join(PROJECT_DIR, "experiments")
 DATA_DIR = os.path.join(PROJECT_DIR, "data")
+MODEL_CACHE_DIR = os.path.join(PROJECT_DIR, "model_cache")  # Compiled models
+STDS_CACHE_DIR = os.path.join(MODEL_CACHE_DIR, "stds")  # Simulation stds
+MUTEABLE_PARAMETER_PATH = os.path.join(MODEL_CACHE_DIR,
+      "muteable_parameters.csv")
 WORKUNITS_FILE = os.path.join(EXPERIMENT_DIR, "workunits.txt")
+# Conditions completed or being run by any runner
+COMPLETED_INDEX_PATH = os.path.join(EXPERIMENT_DIR, "completed_index.db")
 NUM_BIOMODEL_MAX = 1160
 # Keys in statistics dictionary
 SD_AVG_TIME = "avg_time"  #average time for an evaluation
@@ -40,6 +46,8 @@ SD_NUM_SPECIES = "num_species"  #number of floating species
 SD_NUM_REACTION = "num_reaction"  #number of reactions
 SD_NUM_PARAMETER = "num_parameter"  #number of parameters
 SD_RSSQ = "rssq"  # residual sum of squares for fit
+SD_SIMULATION_CACHE_HITS = "simulation_cache_hits"  # simulations found in cache
+SD_SIMULATION_CACHE_MISSES = "simulation_cache_misses"  # simulations not in cache
 SD_TOT_TIME = "tot_time"  #total run time
 SD_TS_INSTANCE = "ts_instance"  # instance of the synthetic observational data
 SD_NOISE_MAG = "noise_mag"  #magnitude of the noise used
@@ -47,6 +55,7 @@ SD_LATINCUBE_IDX = "latincube_idx"  # index of the latin cube strip used
 SD_RANGE_MAX_FRAC = "range_max_frac"  # fraction of value for max of range
 SD_RANGE_MIN_FRAC = "range_min_frac"  # fraction of value for min of range
 SD_STATUS = "status"  #str (reason for failure)
+BLC_SUFFIX = "_blc"  # suffix of the method for the best latincube
 # Universal values for conditions
 SD_CONDITION_VALUE_ALL = ALL
 SD_CONDITION_EXPANSION_DCT = {
@@ -77,6 +86,8 @@ SD_ERROR_METRICS =  [SD_MEDIAN_LOGERR, SD_MAX_LOGERR, SD_MIN_LOGERR, SD_RSSQ,
 SD_TIME_METRICS =  [SD_AVG_TIME, SD_CNT, SD_TOT_TIME, ]
 SD_METRICS = list(SD_ERROR_METRICS)
 SD_METRICS.extend(SD_TIME_METRICS)
+# Statistics of SBMLFitter.evaluateFit that are not in results
+SD_CACHE_METRICS = [SD_SIMULATION_CACHE_HITS, SD_SIMULATION_CACHE_MISSES]
 SD_ALL = list(SD_QUALIFIERS)
 SD_ALL.extend(SD_METRICS)
 SD_ALL.append(SD_STATUS)
@@ -84,6 +95,9 @@ SD_ALL_DCT = {k: None for k in SD_ALL}
 {SD_ALL_DCT.update({k: v}) for k, v in SD_CONDITION_DCT.items()}
 # Field values
 SD_STATUS_SUCCESS = "Success!"
+# Fitting methods
+METHOD_DIFFERENTIAL_EVOLUTION = "differential_evolution"
+METHOD_LEASTSQ = "leastsq"
 # Miscellaneous
 VALUE_SEP = "--"
 # Other data column nammes
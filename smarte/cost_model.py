@@ -0,0 +1,219 @@
+"""Predicts the time to run a condition.
+
+The log of the total time of a fit is modelled as a linear function of the
+logs of the numbers of species, reactions, and parameters of the BioModel,
+the log of max_fev, and an intercept for each method. Coefficients are
+estimated by least squares from previous results. Predictions are
+exponentiated with the mean of the exponentiated residuals so that they
+estimate the expected time rather than the median time.
+"""
+
+import smarte.constants as cn
+from smarte.analysis.experiment_provider import ExperimentProvider
+
+import numpy as np
+import pandas as pd
+
+DESCRIPTORS = list(cn.SD_MODEL_DESCRIPTORS)
+NUMERIC_COLUMNS = [cn.SD_BIOMODEL_NUM, cn.SD_MAX_FEV, cn.SD_TOT_TIME]
+NUMERIC_COLUMNS.extend(DESCRIPTORS)
+# Factors of a condition that determine its predicted time
+COST_FACTORS = [cn.SD_BIOMODEL_NUM, cn.SD_METHOD, cn.SD_MAX_FEV]
+
+
+class CostModel(object):
+
+    def __init__(self, methods, coef_arr, smearing, descriptor_df):
+        """
+        Parameters
+        ----------
+        methods: list-str (methods with an intercept)
+        coef_arr: np.array (coefficients of the log descriptors and max_fev,
+            followed by the intercepts of methods)
+        smearing: float (mean of the exponentiated residuals)
+        descriptor_df: pd.DataFrame
+            index: biomodel_num
+            columns: DESCRIPTORS
+        """
+        self.methods = list(methods)
+        self.coef_arr = np.array(coef_arr)
+        self.smearing = smearing
+        self.descriptor_df = descriptor_df
+        # Used for BioModels and methods not in the data
+        self.default_descriptor_arr = descriptor_df.median().values
+        self.default_intercept = np.mean(self.coef_arr[-len(self.methods):])
+
+    @staticmethod
+    def _makeFeatureArr(descriptor_arr, max_fevs):
+        """
+        Constructs the features other than the method intercepts.
+
+        Parameters
+        ----------
+        descriptor_arr: np.array (rows are conditions, columns are DESCRIPTORS)
+        max_fevs: np.array
+
+        Returns
+        -------
+        np.array
+        """
+        return np.column_stack([np.log1p(descriptor_arr),
+              np.log(np.maximum(max_fevs, 1))])
+
+    @classmethod
+    def makeFromDataframe(cls, df):
+        """
+        Estimates the model from results.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            columns: cn.SD_ALL
+
+        Returns
+        -------
+        CostModel
+        """
+        df = df.copy()
+        if cn.SD_STATUS in df.columns:
+            df = df[df[cn.SD_STATUS] == cn.SD_STATUS_SUCCESS].copy()
+        for column in NUMERIC_COLUMNS:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+        df = df.dropna(subset=NUMERIC_COLUMNS + [cn.SD_METHOD])
+        df = df[df[cn.SD_TOT_TIME] > 0]
+        if len(df) == 0:
+            raise ValueError("No results with times and model descriptors.")
+        methods = sorted(df[cn.SD_METHOD].astype(str).unique())
+        feature_arr = cls._makeFeatureArr(df[DESCRIPTORS].values,
+              df[cn.SD_MAX_FEV].values)
+        method_arr = np.column_stack([(df[cn.SD_METHOD] == m).values
+              for m in methods]).astype(float)
+        x_arr = np.column_stack([feature_arr, method_arr])
+        y_arr = np.log(df[cn.SD_TOT_TIME].values.astype(float))
+        coef_arr, _, _, _ = np.linalg.lstsq(x_arr, y_arr, rcond=None)
+        residual_arr = y_arr - x_arr.dot(coef_arr)
+        smearing = float(np.mean(np.exp(residual_arr)))
+        descriptor_df = df.groupby(cn.SD_BIOMODEL_NUM)[DESCRIPTORS].median()
+        descriptor_df.index = descriptor_df.index.astype(int)
+        return cls(methods, coef_arr, smearing, descriptor_df)
+
+    @classmethod
+    def makeFromExperimentProvider(cls, provider=None, **kwargs):
+        """
+        Estimates the model from the results of an ExperimentProvider.
+
+        Parameters
+        ----------
+        provider: ExperimentProvider
+            default: results in the zip files of cn.EXPERIMENT_DIR
+        kwargs: dict (optional arguments for ExperimentProvider)
+
+        Returns
+        -------
+        CostModel
+        """
+        if provider is None:
+            provider = ExperimentProvider(**kwargs)
+        return cls.makeFromDataframe(provider.df)
+
+    @classmethod
+    def makeFromCsvs(cls, paths):
+        """
+        Estimates the model from CSV files of results.
+
+        Parameters
+        ----------
+        paths: list-str
+
+        Returns
+        -------
+        CostModel
+        """
+        df = pd.concat([pd.read_csv(p) for p in paths])
+        return cls.makeFromDataframe(df)
+
+    def predictMany(self, conditions):
+        """
+        Predicts the time to run each condition.
+
+        Parameters
+        ----------
+        conditions: list-Condition
+
+        Returns
+        -------
+        np.array (seconds)
+        """
+        if len(conditions) == 0:
+            return np.array([])
+        descriptor_arr = np.array([self._getDescriptors(c[cn.SD_BIOMODEL_NUM])
+              for c in conditions])
+        max_fevs = np.array([c[cn.SD_MAX_FEV] for c in conditions],
+              dtype=float)
+        feature_arr = self._makeFeatureArr(descriptor_arr, max_fevs)
+        num_feature = feature_arr.shape[1]
+        intercepts = np.array([self._getIntercept(c[cn.SD_METHOD])
+              for c in conditions])
+        log_times = feature_arr.dot(self.coef_arr[:num_feature]) + intercepts
+        return np.exp(log_times)*self.smearing
+
+    def predict(self, condition):
+        """
+        Predicts the time to run a condition.
+
+        Parameters
+        ----------
+        condition: Condition
+
+        Returns
+        -------
+        float (seconds)
+        """
+        return float(self.predictMany([condition])[0])
+
+    def _getDescriptors(self, biomodel_num):
+        if biomodel_num in self.descriptor_df.index:
+            return self.descriptor_df.loc[biomodel_num].values
+        return self.default_descriptor_arr
+
+    def _getIntercept(self, method):
+        # Methods of the best latincube have the time of the method
+        method = str(method).replace(cn.BLC_SUFFIX, "")
+        if method in self.methods:
+            num_feature = len(self.coef_arr) - len(self.methods)
+            return self.coef_arr[num_feature + self.methods.index(method)]
+        return self.default_intercept
+
+    def orderLongestFirst(self, conditions):
+        """
+        Orders conditions by decreasing predicted time.
+
+        Parameters
+        ----------
+        conditions: list-Condition
+
+        Returns
+        -------
+        list-Condition
+        """
+        times = self.predictMany(conditions)
+        return [conditions[n] for n in np.argsort(-times, kind="stable")]
+
+    def estimateRemainingTime(self, conditions, num_worker=1):
+        """
+        Estimates the wall time to run the conditions with a number of
+        workers that each run one condition at a time.
+
+        Parameters
+        ----------
+        conditions: list-Condition
+        num_worker: int
+
+        Returns
+        -------
+        float (seconds)
+        """
+        times = self.predictMany(conditions)
+        if len(times) == 0:
+            return 0.0
+        return float(max(np.sum(times)/max(num_worker, 1), np.max(times)))
@@ -1,5 +1,7 @@
 """Extensions to Dictionary type"""
 
+from smarte.types.elemental_dict import parseStr
+
 
 # Separators
 KEY_VALUE_SEP = "__"  # Separates key-value pairs
@@ -122,56 +124,7 @@ class ExtendedDict(dict):
         -------
         ExtendedDict
         """
-        def convert(value):
-            """
-            Converts to correct type.
-
-            Parameters
-            ----------
-            value: str
-
-            Returns
-            -------
-            int, bool, float, str
-            """
-            # bool
-            if str(value) in ["True", "False"]:
-                new_value = eval(value)
-            # int
-            elif isinstance(eval(value), int):
-                new_value = int(value)
-            # float
-            elif isinstance(eval(value), float):
-                new_value = float(value)
-            # str
-            else:
-                new_value = value
-            return new_value
-        #
-        if LIST_BREAK in stg:
-            raise ValueError("Cannot convert a string with a list break: %s" % stg)
-        dct = {}
-        key_values = stg.split(KEY_VALUE_SEP)
-        for key_value in key_values:
-            # Parse the key and value(s)
-            parts = key_value.split(VALUE_SEP)
-            if len(parts) == 2:
-                key, values = parts
-            elif len(parts) < 2:
-                raise RuntimeError("Wrong size.")
-            else:
-                key = parts[0]
-                values = parts[1:]
-            # Decode the types
-            if isinstance(values, str):
-                try:
-                    dct[key] = convert(values)
-                except NameError:
-                    dct[key] = values
-            elif isinstance(values, list):
-                dct[key] = [convert(v) for v in values]
-            else:
-                dct[key] = values
+        dct = parseStr(stg)
         return cls(**dct)
 
     def copy(self):
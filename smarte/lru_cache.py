@@ -0,0 +1,129 @@
+"""Bounded least recently used (LRU) cache that reports its usage."""
+
+import collections
+
+# Keys in statistics dictionary
+HITS = "hits"
+MISSES = "misses"
+EVICTIONS = "evictions"
+SIZE = "size"
+
+
+class LRUCache(object):
+
+    def __init__(self, max_size=100, size_func=None):
+        """
+        Parameters
+        ----------
+        max_size: float (maximum total size of the entries in the cache)
+        size_func: Function
+            argument: value stored
+            returns: float (size of the value)
+            default: each entry has a size of 1
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive.")
+        self.max_size = max_size
+        self.size_func = size_func
+        if self.size_func is None:
+            self.size_func = lambda _: 1
+        self._dct = collections.OrderedDict()  # key: (value, size)
+        self.size = 0
+        self.num_hit = 0
+        self.num_miss = 0
+        self.num_eviction = 0
+
+    def __len__(self):
+        return len(self._dct)
+
+    def __contains__(self, key):
+        """
+        Tests if the key is present. Does not change usage statistics.
+
+        Parameters
+        ----------
+        key: hashable
+
+        Returns
+        -------
+        bool
+        """
+        return key in self._dct
+
+    def get(self, key, default=None):
+        """
+        Retrieves the value for the key and makes it the most recently used.
+
+        Parameters
+        ----------
+        key: hashable
+        default: object (returned if the key is not present)
+
+        Returns
+        -------
+        object
+        """
+        if key in self._dct:
+            self.num_hit += 1
+            self._dct.move_to_end(key)
+            return self._dct[key][0]
+        self.num_miss += 1
+        return default
+
+    def put(self, key, value):
+        """
+        Inserts the value, evicting least recently used values if the
+        cache is too large. A value larger than the cache is not stored.
+
+        Parameters
+        ----------
+        key: hashable
+        value: object
+        """
+        self.delete(key)
+        size = self.size_func(value)
+        if size > self.max_size:
+            return
+        self._dct[key] = (value, size)
+        self.size += size
+        while self.size > self.max_size:
+            _, (_, evicted_size) = self._dct.popitem(last=False)
+            self.size -= evicted_size
+            self.num_eviction += 1
+
+    def delete(self, key):
+        """
+        Removes the key if it is present.
+
+        Parameters
+        ----------
+        key: hashable
+        """
+        if key in self._dct:
+            _, size = self._dct.pop(key)
+            self.size -= size
+
+    def clear(self):
+        """
+        Removes all entries and resets the statistics.
+        """
+        self._dct.clear()
+        self.size = 0
+        self.num_hit = 0
+        self.num_miss = 0
+        self.num_eviction = 0
+
+    def getStatistics(self):
+        """
+        Provides usage statistics.
+
+        Returns
+        -------
+        dict
+            hits: number of successful retrievals
+            misses: number of unsuccessful retrievals
+            evictions: number of values removed to make space
+            size: total size of the values in the cache
+        """
+        return {HITS: self.num_hit, MISSES: self.num_miss,
+              EVICTIONS: self.num_eviction, SIZE: self.size}
@@ -0,0 +1,151 @@
+"""Process-wide cache of compiled BioModels.
+
+Loading a BioModel parses its SBML and compiles it with roadrunner. The cache
+keeps compiled models so that the conditions for the same BioModel share a
+single load. A model is restored to its initial state each time it is
+retrieved so that results do not depend on prior uses.
+Models not in memory are read from a ModelDiskCache, if one is provided,
+before they are loaded from SBML.
+The cache is bounded by the estimated memory of the compiled models, which
+is proportional to the size of their SBML.
+"""
+
+from smarte.lru_cache import LRUCache
+from smarte.model_disk_cache import ModelDiskCache, SBMLReadError
+import SBMLModel as mdl
+
+MAX_MODEL_MEMORY = 2e9  # Default bytes of compiled models kept in memory
+MODEL_MEMORY_FACTOR = 20  # Bytes of a compiled model per byte of its SBML
+
+
+def estimateModelMemory(model):
+    """
+    Estimates the memory used by a compiled model.
+
+    Parameters
+    ----------
+    model: Model
+
+    Returns
+    -------
+    float (bytes)
+    """
+    return MODEL_MEMORY_FACTOR*len(model.roadrunner.getSBML())
+
+
+class _ModelEntry(object):
+
+    def __init__(self, model):
+        """
+        Parameters
+        ----------
+        model: Model
+        """
+        self.model = model
+        self.initial_dct = dict(model.get(model.parameter_names))
+        self.selections = list(model.roadrunner.timeCourseSelections)
+        self.memory = estimateModelMemory(model)
+
+    def reset(self):
+        """
+        Restores the simulation state, the selections, and the parameter values
+        that the model had when it was loaded.
+        """
+        self.model.roadrunner.resetAll()
+        self.model.roadrunner.timeCourseSelections = self.selections
+        for name, value in self.initial_dct.items():
+            try:
+                self.model.set({name: value})
+            except Exception:
+                # Parameters that cannot be set cannot have been changed
+                continue
+
+
+class ModelCache(object):
+
+    def __init__(self, max_size=MAX_MODEL_MEMORY, loader=None, disk_cache=None):
+        """
+        Parameters
+        ----------
+        max_size: float (maximum estimated bytes of compiled models kept)
+        loader: Function
+            argument: int (BioModel number)
+            returns: Model or None
+            default: Model.getBiomodel
+        disk_cache: ModelDiskCache (persistent cache of compiled models)
+        """
+        self.loader = loader
+        self.disk_cache = disk_cache
+        self.cache = LRUCache(max_size=max_size, size_func=lambda e: e.memory)
+
+    def _load(self, biomodel_num):
+        """
+        Loads the model from the disk cache if possible. Otherwise, the model
+        is constructed and saved in the disk cache.
+        A BioModel whose source SBML cannot be read is reported and does not
+        use the disk cache. Failures to write the disk cache are not errors.
+        """
+        disk_cache = self.disk_cache
+        if disk_cache is not None:
+            try:
+                model = disk_cache.get(biomodel_num)
+            except SBMLReadError as exp:
+                print("*** Model disk cache is not used. %s" % str(exp))
+                disk_cache = None
+                model = None
+            if model is not None:
+                return model
+        if self.loader is None:
+            model = mdl.Model.getBiomodel(biomodel_num)
+        else:
+            model = self.loader(biomodel_num)
+        if (model is not None) and (disk_cache is not None):
+            try:
+                disk_cache.put(biomodel_num, model)
+            except Exception:
+                pass
+        return model
+
+    def get(self, biomodel_num):
+        """
+        Retrieves the compiled model, loading it if it is not in the cache.
+        Exceptions raised by the loader are propagated.
+
+        Parameters
+        ----------
+        biomodel_num: int
+
+        Returns
+        -------
+        Model (None if the model cannot be constructed)
+        """
+        entry = self.cache.get(biomodel_num)
+        if entry is None:
+            model = self._load(biomodel_num)
+            if model is None:
+                return None
+            entry = _ModelEntry(model)
+            self.cache.put(biomodel_num, entry)
+        else:
+            entry.reset()
+        return entry.model
+
+    def clear(self):
+        """
+        Removes all models and resets the statistics.
+        """
+        self.cache.clear()
+
+    def getStatistics(self):
+        """
+        Provides usage statistics.
+
+        Returns
+        -------
+        dict (see LRUCache.getStatistics)
+        """
+        return self.cache.getStatistics()
+
+
+# Cache shared by the objects in a process
+MODEL_CACHE = ModelCache(disk_cache=ModelDiskCache())
@@ -0,0 +1,244 @@
+"""Persistent cache of compiled BioModels shared by processes.
+
+A compiled model is saved as serialized roadrunner state. Entries are
+organized by roadrunner version since saved state can only be loaded by the
+version that created it. The key of an entry is the BioModel number and a
+hash of its source SBML. The source SBML is read, which is much faster than
+compiling it, so that an entry is used only if it was compiled from the
+current SBML by the current version of roadrunner.
+Writes are atomic so that concurrent processes can share the cache.
+"""
+
+import smarte.constants as cn
+import SBMLModel as mdl
+
+import hashlib
+import os
+import roadrunner
+
+ENTRY_EXT = ".rrstate"
+ENTRY_PAT = "%d" + cn.VALUE_SEP + "%s" + ENTRY_EXT  # biomodel_num, hash
+HASH_ATTR = "_smarte_sbml_hash"  # Attribute of a model with its hash
+
+
+class SBMLReadError(Exception):
+    """The source SBML of a BioModel cannot be read."""
+    pass
+
+
+
+def calcSBMLHash(sbml):
+    """
+    Calculates a hash of SBML.
+
+    Parameters
+    ----------
+    sbml: str
+
+    Returns
+    -------
+    str
+    """
+    return hashlib.sha256(sbml.encode()).hexdigest()
+
+def getModelHash(model):
+    """
+    Provides the hash of the model's SBML, calculating it only once for a model.
+
+    Parameters
+    ----------
+    model: Model
+
+    Returns
+    -------
+    str
+    """
+    model_hash = getattr(model, HASH_ATTR, None)
+    if model_hash is None:
+        model_hash = calcSBMLHash(model.roadrunner.getSBML())
+        setattr(model, HASH_ATTR, model_hash)
+    return model_hash
+
+def readBiomodelSBML(biomodel_num):
+    """
+    Reads the source SBML of a BioModel without compiling it.
+
+    Parameters
+    ----------
+    biomodel_num: int
+
+    Returns
+    -------
+    str
+    """
+    return mdl.Model.getBiomodelSBML(biomodel_num)
+
+
+class ModelDiskCache(object):
+
+    def __init__(self, directory=cn.MODEL_CACHE_DIR, sbml_reader=None):
+        """
+        Parameters
+        ----------
+        directory: str (root directory of the cache)
+        sbml_reader: Function
+            argument: int (BioModel number)
+            returns: str (source SBML)
+            default: readBiomodelSBML
+        """
+        self.directory = os.path.join(directory, roadrunner.__version__)
+        self.sbml_reader = sbml_reader
+        if self.sbml_reader is None:
+            self.sbml_reader = readBiomodelSBML
+        self.hash_dct = {}  # key: biomodel_num, value: hash of source SBML
+
+    def getHash(self, biomodel_num):
+        """
+        Provides the hash of the source SBML of the BioModel. The SBML is
+        read once for a BioModel.
+
+        Parameters
+        ----------
+        biomodel_num: int
+
+        Returns
+        -------
+        str
+
+        Raises
+        ------
+        SBMLReadError: the SBML reader failed
+        """
+        if not biomodel_num in self.hash_dct:
+            try:
+                sbml = self.sbml_reader(biomodel_num)
+            except Exception as exp:
+                raise SBMLReadError("Cannot read the SBML of BioModel %d: %s"
+                      % (biomodel_num, str(exp))) from exp
+            self.hash_dct[biomodel_num] = calcSBMLHash(sbml)
+        return self.hash_dct[biomodel_num]
+
+    def _getPath(self, biomodel_num, model_hash):
+        return os.path.join(self.directory, ENTRY_PAT % (biomodel_num, model_hash))
+
+    def _getPaths(self, biomodel_num):
+        """
+        Finds the entries for the BioModel, including stale entries.
+
+        Returns
+        -------
+        list-str
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        prefix = "%d%s" % (biomodel_num, cn.VALUE_SEP)
+        return [os.path.join(self.directory, f) for f in os.listdir(self.directory)
+              if f.startswith(prefix) and f.endswith(ENTRY_EXT)]
+
+    def isExist(self, biomodel_num):
+        """
+        Tests if there is an entry for the current SBML of the BioModel.
+
+        Parameters
+        ----------
+        biomodel_num: int
+
+        Returns
+        -------
+        bool
+        """
+        return os.path.isfile(self._getPath(biomodel_num,
+              self.getHash(biomodel_num)))
+
+    def isStale(self, biomodel_num):
+        """
+        Tests if the BioModel only has entries for SBML that has changed.
+
+        Parameters
+        ----------
+        biomodel_num: int
+
+        Returns
+        -------
+        bool
+        """
+        return (len(self._getPaths(biomodel_num)) > 0)  \
+              and (not self.isExist(biomodel_num))
+
+    def get(self, biomodel_num):
+        """
+        Retrieves a compiled model. An entry that cannot be loaded is
+        removed.
+
+        Parameters
+        ----------
+        biomodel_num: int
+
+        Returns
+        -------
+        Model (None if there is no usable entry for the current SBML)
+
+        Raises
+        ------
+        SBMLReadError: the SBML reader failed
+        """
+        model_hash = self.getHash(biomodel_num)
+        path = self._getPath(biomodel_num, model_hash)
+        if not os.path.isfile(path):
+            return None
+        rr = roadrunner.RoadRunner()
+        try:
+            rr.loadState(path)
+        except Exception:
+            # Partial or corrupt entry
+            self._remove(path)
+            return None
+        model = mdl.Model(rr)
+        model.biomodel_num = biomodel_num
+        return model
+
+    def put(self, biomodel_num, model):
+        """
+        Saves the compiled model, replacing existing entries for the BioModel.
+        The model should be compiled from the current SBML of the BioModel
+        and be in its initial state.
+
+        Parameters
+        ----------
+        biomodel_num: int
+        model: Model
+
+        Returns
+        -------
+        str (path to the entry)
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._getPath(biomodel_num, self.getHash(biomodel_num))
+        stale_paths = [p for p in self._getPaths(biomodel_num) if p != path]
+        # Write to a process specific file and rename so readers never
+        # see a partial entry
+        tmp_path = "%s.%d.tmp" % (path, os.getpid())
+        model.roadrunner.saveState(tmp_path)
+        os.replace(tmp_path, path)
+        for stale_path in stale_paths:
+            self._remove(stale_path)
+        return path
+
+    def delete(self, biomodel_num):
+        """
+        Removes the entries for the BioModel.
+
+        Parameters
+        ----------
+        biomodel_num: int
+        """
+        for path in self._getPaths(biomodel_num):
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Removed by another process
+            pass
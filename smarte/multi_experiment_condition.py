@@ -1,114 +1,356 @@
-"""MultiExperimentCondition compactly represents many ExperimentConditions"""
+"""MultiExperimentCondition compactly represents many conditions
 
-"""
-A MultiExperimentCondition is a compact representation of a set of ExperimentConditions.
-The keys are factors. The values are a non-empty set of levels. To further simplify this
-representation, there is a "universal set" defined for each factor. The entry "*" indicates
-that the set of levels for a factor is its universal set.
-"""
-
-"""
-TODO
-1. Specify cn.SD_UNIVERSAL, cn.SD_UNIVERSAL_DCT
-2. Implement DictIterator
+A MultiExperimentCondition is a set of conditions represented as a union of
+disjoint boxes. A box is a hypercube. It has a set of levels for each factor
+in cn.SD_CONDITIONS and contains all combinations of these levels. Set
+operations are done on boxes, so conditions are never enumerated, and the
+number of conditions is the sum of the sizes of the boxes.
 """
 
-from smarte.experiment_condition import ExperimentCondition
 import smarte.constants as cn
-from smarte.extended_dict import ExtendedDict
-from smarte.dict_iterator import DictIterator
+from smarte.condition import Condition
+from smarte.condition_collection import ConditionCollection
+from smarte.workunit import Workunit
+
+import numpy as np
+
+FACTORS = list(cn.SD_CONDITIONS)
+
+
+############### Operations on boxes ###############
+# A box is a dict. Keys are factors. Values are non-empty frozenset of levels.
+
+def _calcBoxSize(box):
+    return int(np.prod([len(box[f]) for f in FACTORS], dtype=object))
+
+def _intersectBoxes(box1, box2):
+    """
+    Constructs the box of conditions in both boxes.
+
+    Returns
+    -------
+    dict (None if the intersection is empty)
+    """
+    box = {}
+    for factor in FACTORS:
+        levels = box1[factor].intersection(box2[factor])
+        if len(levels) == 0:
+            return None
+        box[factor] = levels
+    return box
+
+def _subtractBox(box1, box2):
+    """
+    Constructs disjoint boxes of the conditions in box1 that are not in box2.
+    The levels of box1 that are not in box2 are split off one factor at
+    a time.
+
+    Returns
+    -------
+    list-dict
+    """
+    if _intersectBoxes(box1, box2) is None:
+        return [box1]
+    boxes = []
+    remainder = dict(box1)
+    for factor in FACTORS:
+        levels = remainder[factor].difference(box2[factor])
+        if len(levels) > 0:
+            box = dict(remainder)
+            box[factor] = levels
+            boxes.append(box)
+        remainder[factor] = remainder[factor].intersection(box2[factor])
+    return boxes
+
+def _mergeBoxes(boxes):
+    """
+    Combines boxes that differ in the levels of only one factor.
+
+    Parameters
+    ----------
+    boxes: list-dict (disjoint boxes)
 
+    Returns
+    -------
+    list-dict
+    """
+    boxes = list(boxes)
+    is_changed = True
+    while is_changed:
+        is_changed = False
+        for factor in FACTORS:
+            # Group boxes with the same levels for the other factors
+            group_dct = {}
+            for box in boxes:
+                key = tuple(box[f] for f in FACTORS if f != factor)
+                group_dct.setdefault(key, []).append(box)
+            if len(group_dct) == len(boxes):
+                continue
+            boxes = []
+            for group in group_dct.values():
+                box = dict(group[0])
+                box[factor] = frozenset().union(*[b[factor] for b in group])
+                boxes.append(box)
+            is_changed = True
+    return boxes
 
-class MultiExperimentCondition(ExtendedDict):
 
-    def __init__(self, condition, **kwargs):
+class MultiExperimentCondition(object):
+
+    def __init__(self, boxes=None):
         """
         Parameters
         ----------
-        condition: ExperimentCondition (default levels for factors)
-        kwargs: dict
+        boxes: list-dict
             key: factor
-            value: list (or "*") of levels
-        """
-        for factor, level in condition.items():
-            if factor in kwargs.keys():
-                if kwargs[key] == cn.SD_UNIVERSAL:
-                    self[key] = cn.SD_UNIVERSAL_DCT[key]
-                else:
-                    self[key] = kwargs[key]
-            else:
-                self[key] = [value]
-
-    def iterator(self):
-        """
-        Iteratively returns all ExperimentConditions specified by the
-        MultiExperimentCondition.
- 
+            value: collection of levels
+            Boxes may overlap.
+        """
+        self.boxes = []
+        for box in boxes or []:
+            box = {f: frozenset(box[f]) for f in FACTORS}
+            if _calcBoxSize(box) > 0:
+                self.boxes.extend(self._subtractFromBox(box))
+
+    def _subtractFromBox(self, box):
+        """
+        Constructs disjoint boxes of the conditions in the box that are not
+        in this set.
+
         Returns
         -------
-        iterator-ExperimentCondition
+        list-dict
         """
-        for dct in iterateDict(self):
-            yield ExperimentCondition(dct)
+        boxes = [box]
+        for other_box in self.boxes:
+            new_boxes = []
+            for this_box in boxes:
+                new_boxes.extend(_subtractBox(this_box, other_box))
+            boxes = new_boxes
+        return boxes
 
-    def add(self, dct):
+    @classmethod
+    def _makeFromBoxes(cls, boxes):
+        # Constructs from disjoint boxes
+        multi_condition = cls()
+        multi_condition.boxes = _mergeBoxes(boxes)
+        return multi_condition
+
+    @classmethod
+    def makeFromDct(cls, dct):
         """
-        Adds the levels for a set of factors.
+        Constructs the set of conditions of a hypercube. Factors that are not
+        specified have their default levels.
 
         Parameters
         ----------
         dct: dict
             key: factor
-            value: list-level (float, int, str)
-        
+            value: list of levels, a level, or cn.SD_CONDITION_VALUE_ALL
+
         Returns
         -------
         MultiExperimentCondition
         """
+        return cls.makeFromConditionCollection(ConditionCollection(**dct))
 
-    def subtract(self, dct):
+    @classmethod
+    def makeFromConditionCollection(cls, condition_collection):
         """
-        Removes the levels for a set of factors.
+        Constructs the set of conditions of a hypercube. The excluded
+        conditions of a Workunit are not in the set.
 
         Parameters
         ----------
-        dct: dict
-            key: factor
-            value: list-level (float, int, str)
-        
+        condition_collection: ConditionCollection/Workunit
+
         Returns
         -------
         MultiExperimentCondition
         """
+        if isinstance(condition_collection, Workunit):
+            condition_collection = condition_collection.permitted_collection
+        return cls([{f: condition_collection[f] for f in FACTORS}])
+
+    @classmethod
+    def makeFromWorkunitsFile(cls, path):
+        """
+        Constructs the set of conditions of the workunits in a file.
+
+        Parameters
+        ----------
+        path: str (path to file of workunits in string representation)
+
+        Returns
+        -------
+        MultiExperimentCondition
+        """
+        workunits = Workunit.makeWorkunitsFromFile(path)
+        multi_condition = cls()
+        for workunit in workunits:
+            multi_condition = multi_condition.union(
+                  cls.makeFromConditionCollection(workunit))
+        return multi_condition
+
+    def __len__(self):
+        return sum([_calcBoxSize(b) for b in self.boxes])
+
+    def isEmpty(self):
+        """
+        Tests if there are no conditions in the set.
+
+        Returns
+        -------
+        bool
+        """
+        return len(self.boxes) == 0
+
+    def __contains__(self, condition):
+        """
+        Tests if the condition is in the set.
+
+        Parameters
+        ----------
+        condition: Condition
+
+        Returns
+        -------
+        bool
+        """
+        for box in self.boxes:
+            if all([condition[f] in box[f] for f in FACTORS]):
+                return True
+        return False
+
+    def iterate(self):
+        """
+        Iteratively returns the conditions in the set.
+
+        Returns
+        -------
+        Condition
+        """
+        for collection in self.makeConditionCollections():
+            for condition in collection.iterate(Condition):
+                yield condition
+
+    def makeConditionCollections(self):
+        """
+        Creates a hypercube for each box. Levels are sorted.
+
+        Returns
+        -------
+        list-ConditionCollection
+        """
+        return [ConditionCollection(**{f: sorted(b[f]) for f in FACTORS})
+              for b in self.boxes]
 
     def union(self, other):
         """
-        Computes the union of levels for the factors.
+        Computes the conditions in either set.
 
         Parameters
         ----------
         other: MultiExperimentCondition
-            key: factor
-            value: list-level (float, int, str)
-        
+
         Returns
         -------
         MultiExperimentCondition
         """
+        boxes = list(self.boxes)
+        for box in other.boxes:
+            boxes.extend(self._subtractFromBox(box))
+        return self._makeFromBoxes(boxes)
 
     def intersection(self, other):
         """
-        Computes the intersection of levels for the factors.
-        Raises an exception if the intersection of levels is empty
-        for some factor.
+        Computes the conditions in both sets. The result may be empty.
 
         Parameters
         ----------
         other: MultiExperimentCondition
+
+        Returns
+        -------
+        MultiExperimentCondition
+        """
+        boxes = []
+        for box1 in self.boxes:
+            for box2 in other.boxes:
+                box = _intersectBoxes(box1, box2)
+                if box is not None:
+                    boxes.append(box)
+        return self._makeFromBoxes(boxes)
+
+    def difference(self, other):
+        """
+        Computes the conditions in this set that are not in the other set.
+
+        Parameters
+        ----------
+        other: MultiExperimentCondition
+
+        Returns
+        -------
+        MultiExperimentCondition
+        """
+        boxes = []
+        for box in self.boxes:
+            boxes.extend(other._subtractFromBox(box))
+        return self._makeFromBoxes(boxes)
+
+    def add(self, dct):
+        """
+        Adds the conditions of a hypercube.
+
+        Parameters
+        ----------
+        dct: dict
+            key: factor
+            value: list of levels (see makeFromDct)
+
+        Returns
+        -------
+        MultiExperimentCondition
+        """
+        return self.union(self.makeFromDct(dct))
+
+    def subtract(self, dct):
+        """
+        Removes the conditions that have one of the levels of a factor.
+        This is the same as excluding a FactorCollection from a Workunit.
+
+        Parameters
+        ----------
+        dct: dict
             key: factor
             value: list-level (float, int, str)
-        
+
         Returns
         -------
         MultiExperimentCondition
         """
+        boxes = []
+        for box in self.boxes:
+            new_box = dict(box)
+            for factor, levels in dct.items():
+                new_box[factor] = box[factor].difference(levels)
+            if _calcBoxSize(new_box) > 0:
+                boxes.append(new_box)
+        return self._makeFromBoxes(boxes)
+
+    def equals(self, other):
+        """
+        Tests if the sets have the same conditions.
+
+        Parameters
+        ----------
+        other: MultiExperimentCondition
+
+        Returns
+        -------
+        bool
+        """
+        if len(self) != len(other):
+            return False
+        return self.difference(other).isEmpty()
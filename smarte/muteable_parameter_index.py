@@ -0,0 +1,113 @@
+"""Index of the parameters of models whose values can be changed.
+
+Determining if a parameter is muteable requires trying to set its value.
+The index does this once for a model. Results are kept for each model
+object and by the hash of the model's SBML. An index file created by
+tools/make_muteable_parameter_index.py provides results computed previously.
+"""
+
+import smarte.constants as cn
+from smarte.model_disk_cache import getModelHash
+
+import os
+import pandas as pd
+
+MUTEABLE_ATTR = "_smarte_muteable_names"  # Attribute of a model with its names
+NAME_SEP = " "  # Separates names in the index file
+# Columns in the index file
+SBML_HASH = "sbml_hash"
+MUTEABLE_PARAMETERS = "muteable_parameters"
+
+
+def calcMuteableParameterNames(model):
+    """
+    Finds the parameters whose values can be set.
+
+    Parameters
+    ----------
+    model: Model
+
+    Returns
+    -------
+    list-str
+    """
+    names = []
+    for name, value in model.get(model.parameter_names).items():
+        try:
+            model.set({name: value})
+            names.append(name)
+        except Exception:
+            continue
+    return names
+
+
+class MuteableParameterIndex(object):
+
+    def __init__(self, path=cn.MUTEABLE_PARAMETER_PATH):
+        """
+        Parameters
+        ----------
+        path: str (CSV file of the index)
+        """
+        self.path = path
+        self._dct = None  # key: SBML hash, value: list-str
+
+    def _getDct(self):
+        if self._dct is None:
+            self._dct = {}
+            if (self.path is not None) and os.path.isfile(self.path):
+                df = pd.read_csv(self.path, keep_default_na=False)
+                for model_hash, stg in zip(df[SBML_HASH],
+                      df[MUTEABLE_PARAMETERS]):
+                    self._dct[model_hash] = [n for n in stg.split(NAME_SEP)
+                          if len(n) > 0]
+        return self._dct
+
+    def get(self, model):
+        """
+        Provides the names of the muteable parameters of the model.
+
+        Parameters
+        ----------
+        model: Model
+
+        Returns
+        -------
+        list-str
+        """
+        names = getattr(model, MUTEABLE_ATTR, None)
+        if names is None:
+            dct = self._getDct()
+            model_hash = getModelHash(model)
+            if not model_hash in dct:
+                dct[model_hash] = calcMuteableParameterNames(model)
+            names = dct[model_hash]
+            setattr(model, MUTEABLE_ATTR, names)
+        return list(names)
+
+    def save(self, biomodel_iter):
+        """
+        Writes the index file for models.
+
+        Parameters
+        ----------
+        biomodel_iter: iterable-(int, Model)
+            BioModel number and its model
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        dct = {cn.SD_BIOMODEL_NUM: [], SBML_HASH: [], MUTEABLE_PARAMETERS: []}
+        for biomodel_num, model in biomodel_iter:
+            dct[cn.SD_BIOMODEL_NUM].append(biomodel_num)
+            dct[SBML_HASH].append(getModelHash(model))
+            dct[MUTEABLE_PARAMETERS].append(NAME_SEP.join(self.get(model)))
+        df = pd.DataFrame(dct)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        df.to_csv(self.path, index=False)
+        return df
+
+
+# Index shared by the objects in a process
+MUTEABLE_PARAMETER_INDEX = MuteableParameterIndex()
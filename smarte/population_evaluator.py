@@ -0,0 +1,157 @@
+"""Evaluates populations of parameter values in parallel.
+
+differential_evolution evaluates a population of candidate parameter values
+in each generation. A PopulationEvaluator is provided to the optimizer as its
+map-like workers argument. It simulates all candidates in a process pool, in
+which each worker has its own compiled copy of the model, and saves the
+results in the SBMLFitter so that the objective function does not repeat
+the simulations.
+"""
+
+import SBMLModel as mdl
+
+import copy
+import multiprocessing
+import roadrunner
+
+# State of a worker process
+_worker_dct = {}
+
+
+def _initializeWorker(state, start_time, end_time, num_point, columns):
+    """
+    Constructs the model used by a worker process.
+
+    Parameters
+    ----------
+    state: bytes (roadrunner state)
+    start_time: float
+    end_time: float
+    num_point: int
+    columns: list-str (selections for the simulation)
+    """
+    rr = roadrunner.RoadRunner()
+    rr.loadStateS(state)
+    _worker_dct.update(model=mdl.Model(rr), start_time=start_time,
+          end_time=end_time, num_point=num_point, columns=columns)
+
+def _simulateWorker(parameter_dct):
+    """
+    Simulates the model for parameter values in the same way
+    as SBMLFitter._simulate.
+
+    Parameters
+    ----------
+    parameter_dct: dict
+        key: parameter name
+        value: value assigned
+
+    Returns
+    -------
+    NamedArray
+    """
+    model = _worker_dct["model"]
+    model.set(parameter_dct)
+    model.roadrunner.reset()
+    return model.roadrunner.simulate(_worker_dct["start_time"], _worker_dct["end_time"],
+          _worker_dct["num_point"], _worker_dct["columns"])
+
+
+class PopulationEvaluator(object):
+
+    def __init__(self, sfitter, workers):
+        """
+        Parameters
+        ----------
+        sfitter: SBMLFitter
+        workers: int (number of processes)
+        """
+        self.sfitter = sfitter
+        self.workers = workers
+        self._pool = None
+        # Transformations from optimizer (internal) values to parameter values.
+        # These are the transformations done by lmfit.
+        self.transforms = []
+        for name, parameter in sfitter.parameters.items():
+            if not parameter.vary:
+                continue
+            new_parameter = copy.deepcopy(parameter)
+            _ = new_parameter.setup_bounds()
+            self.transforms.append((name, new_parameter.from_internal))
+
+    def _getPool(self):
+        if self._pool is None:
+            state = self.sfitter.model.roadrunner.saveStateS()
+            initargs = (state, self.sfitter.start_time, self.sfitter.end_time,
+                  self.sfitter.num_point, self.sfitter.data_columns)
+            self._pool = multiprocessing.Pool(processes=self.workers,
+                  initializer=_initializeWorker, initargs=initargs)
+        return self._pool
+
+    def makeParameterDct(self, values):
+        """
+        Constructs the parameter values for values used by the optimizer.
+
+        Parameters
+        ----------
+        values: array-float (internal values of varying parameters)
+
+        Returns
+        -------
+        dict
+            key: parameter name
+            value: float
+        """
+        dct = self.sfitter.parameters.valuesdict()
+        for (name, transform), value in zip(self.transforms, values):
+            dct[name] = float(transform(value))
+        return dct
+
+    def simulate(self, parameter_dcts):
+        """
+        Simulates the model for each set of parameter values.
+
+        Parameters
+        ----------
+        parameter_dcts: list-dict
+            key: parameter name
+            value: value assigned
+
+        Returns
+        -------
+        list-NamedArray
+        """
+        return self._getPool().map(_simulateWorker, parameter_dcts)
+
+    def __call__(self, func, iterable):
+        """
+        Evaluates func for each member of the population.
+
+        Parameters
+        ----------
+        func: Function (objective function)
+        iterable: iterable-array (population)
+
+        Returns
+        -------
+        list
+        """
+        population = list(iterable)
+        parameter_dcts = [self.makeParameterDct(v) for v in population]
+        arrs = self.simulate(parameter_dcts)
+        for parameter_dct, arr in zip(parameter_dcts, arrs):
+            self.sfitter.prefetch_dct[self.sfitter.makeSimulationKey(
+                  parameter_dct)] = arr
+        try:
+            return [func(v) for v in population]
+        finally:
+            self.sfitter.prefetch_dct.clear()
+
+    def close(self):
+        """
+        Terminates the worker processes.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
@@ -1,9 +1,26 @@
 """A Result specifies the conditions and outcomes of an experiment."""
 
 import smarte.constants as cn
+from smarte.types.frozen_sv_dict import FrozenSVDict
 from smarte.types.sv_dict import SVDict
 
 
 class Result(SVDict):
+    __slots__ = ()
     default_dct = {k: None if v == cn.SD_CONDITION_VALUE_ALL else v
          for k, v in  cn.SD_ALL_DCT.items()}
+
+    def freeze(self):
+        """
+        Creates an immutable, hashable copy.
+
+        Returns
+        -------
+        FrozenResult
+        """
+        return FrozenResult(**self)
+
+
+class FrozenResult(FrozenSVDict):
+    __slots__ = ()
+    sv_dict_cls = Result
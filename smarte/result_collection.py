@@ -1,9 +1,66 @@
-"""A ResultCollection describes the outcomes of a collection of experiments"""
+"""A ResultCollection describes the outcomes of a collection of experiments
 
+Values are kept in a ColumnBuffer for each key so that metrics are stored in
+float arrays, counts in int arrays, and strings such as method and status
+as categorical codes. Appending a result does not create a python object for
+each value. The DataFrame of results has the dtypes of a DataFrame of lists
+of the values, and its numeric columns use the arrays of the buffers.
+"""
 
 import smarte.constants as cn
+from smarte.types.column_buffer import ColumnBuffer
+from smarte.types.elemental_dict import makeStr
+from smarte.types.elemental_type import isList
 from smarte.types.mv_dict_hypercube import MVDictTable
 
+import pandas as pd
+
 
 class ResultCollection(MVDictTable):
     default_dct = {k: [] for k in cn.SD_ALL}
+
+    def __init__(self, **kwargs):
+        """
+        Parameters
+        ----------
+        kwargs: dict
+            key: key in cn.SD_ALL
+            value: list of values
+        """
+        super().__init__(**kwargs)
+        for key, value in list(self.items()):
+            self[key] = value
+
+    def __setitem__(self, key, value):
+        if isList(value):
+            value = ColumnBuffer(value)
+        super().__setitem__(key, value)
+
+    def __str__(self):
+        """
+        Creates the same string as for a dictionary of lists.
+
+        Returns
+        -------
+        str
+        """
+        dct = {k: list(v) for k, v in self.items()}
+        return makeStr(dct)
+
+    def makeDataframe(self):
+        """
+        Creates a dataframe from the columns without copying the arrays of
+        numeric columns.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        dct = {}
+        for key, value in self.items():
+            if isinstance(value, ColumnBuffer):
+                dct[key] = value.makeSeries()
+            else:
+                # Collection created before columns were buffered
+                dct[key] = pd.Series(value)
+        return pd.DataFrame(dct, copy=False)
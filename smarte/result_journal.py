@@ -0,0 +1,86 @@
+"""Append-only log of the results of a Workunit.
+
+Each line of the journal is a JSON record with the result of a condition and
+the iteration index at which to restart after the condition. A record is
+forced to disk when it is written so that the journal has all completed
+conditions if the process is interrupted. A partial last line is ignored.
+"""
+
+from smarte.result import Result
+
+import json
+import os
+
+ITERATE_IDX = "iterate_idx"
+RESULT = "result"
+
+
+def _convert(value):
+    # Converts numpy scalars to python values
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError("Cannot write value %s" % str(value))
+
+
+class ResultJournal(object):
+
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path: str (path to the journal file)
+        """
+        self.path = path
+
+    def append(self, iterate_idx, result):
+        """
+        Writes the result to the journal.
+
+        Parameters
+        ----------
+        iterate_idx: int (iteration index at which to restart)
+        result: Result
+        """
+        record = {ITERATE_IDX: iterate_idx, RESULT: dict(result)}
+        line = json.dumps(record, default=_convert) + "\n"
+        with open(self.path, "a") as fd:
+            fd.write(line)
+            fd.flush()
+            os.fsync(fd.fileno())
+
+    def iterateRecords(self):
+        """
+        Iterates across the records in the journal.
+
+        Returns
+        -------
+        int (iteration index at which to restart)
+        Result
+        """
+        if not self.isExist():
+            return
+        with open(self.path, "r") as fd:
+            for line in fd:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Partial line from an interruption
+                    continue
+                yield record[ITERATE_IDX], Result(**record[RESULT])
+
+    def isExist(self):
+        """
+        Tests if the journal exists.
+
+        Returns
+        -------
+        bool
+        """
+        return os.path.isfile(self.path)
+
+    def delete(self):
+        """
+        Deletes the journal if it exists.
+        """
+        if os.path.isfile(self.path):
+            os.remove(self.path)
@@ -9,15 +9,56 @@ Synthetic data are
 """
 
 import smarte.constants as cn
+from smarte.lru_cache import LRUCache
+import smarte.lru_cache as lru
+from smarte.model_cache import MODEL_CACHE
+from smarte.model_disk_cache import HASH_ATTR, getModelHash
+from smarte.muteable_parameter_index import MUTEABLE_PARAMETER_INDEX
+from smarte.population_evaluator import PopulationEvaluator
+from smarte.stds_cache import STDS_CACHE
 import fitterpp as fpp
 import SBMLModel as mdl
 
+import concurrent.futures
 import lmfit
 import numpy as np
 import pandas as pd
+import roadrunner
 
 MIN_FRAC = 0.5
 MAX_FRAC = 2
+SIMULATION_CACHE_DIGITS = 10  # Significant digits of parameters in cache keys
+
+
+def _evaluateLatincube(state, biomodel_num, model_hash, observed_ts,
+      latincube_idx, evaluate_opt):
+    """
+    Evaluates the fit for one start of a multistart. The model is constructed
+    from the saved roadrunner state so that each start begins with the
+    initial parameter values.
+
+    Parameters
+    ----------
+    state: bytes (roadrunner state)
+    biomodel_num: int
+    model_hash: str (hash of the SBML)
+    observed_ts: Timeseries
+    latincube_idx: int
+    evaluate_opt: dict (options for SBMLFitter.evaluateBiomodelFit)
+
+    Returns
+    -------
+    dict (see SBMLFitter.evaluateBiomodelFit)
+    """
+    rr = roadrunner.RoadRunner()
+    rr.loadStateS(state)
+    model = mdl.Model(rr)
+    model.biomodel_num = biomodel_num
+    setattr(model, HASH_ATTR, model_hash)
+    dct = SBMLFitter.evaluateBiomodelFit(model, observed_ts,
+          latincube_idx=latincube_idx, **evaluate_opt)
+    dct[cn.SD_LATINCUBE_IDX] = latincube_idx
+    return dct
 
 
 class SBMLFitter():
@@ -26,7 +67,8 @@ class SBMLFitter():
           parameters:lmfit.Parameters,
           data,
           start_time= cn.START_TIME, end_time=cn.END_TIME,
-          point_density=10, **fitterpp_opt):
+          point_density=10, workers=1, simulation_cache_size=0,
+          **fitterpp_opt):
         """
         Constructs estimates of parameter values. Only muteable parameters are
         considered.
@@ -47,6 +89,11 @@ class SBMLFitter():
             end time for the simulation
         point_density: float
             number of points simulated for each time unit
+        workers: int
+            number of processes used to evaluate the population
+            for differential_evolution
+        simulation_cache_size: int
+            number of simulation results kept for reuse (0 is no caching)
         fitterpp_opt: dict
             options for Fitterpp constructor
 
@@ -65,19 +112,69 @@ class SBMLFitter():
         self.end_time = end_time
         self.start_time = start_time
         self.num_point = int(point_density*(self.end_time - start_time)) + 1
+        self.time_idxs, self.observed_arr = self._makeObservedArr()
         # Calculate standard deviations
         self.full_columns = list(self.data_columns)
         if cn.TIME not in self.full_columns:
             self.full_columns.append(cn.TIME)
-        self.std_ser = self.model.calculateStds(self.start_time, self.end_time,
-              self.num_point, self.full_columns)
+        self.std_ser = STDS_CACHE.calculateStds(self.model, self.start_time,
+              self.end_time, self.num_point, self.full_columns)
+        # Buffers used by calcResiduals. Created on first use.
+        self._residual_buf = None
+        # Simulation results calculated in advance
+        self.prefetch_dct = {}
+        # Simulation results calculated previously
+        self.simulation_cache = None
+        if simulation_cache_size > 0:
+            self.simulation_cache = LRUCache(max_size=simulation_cache_size)
         # Set up the fitter
         self.fitter = fpp.Fitterpp(self._simulate, self.parameters, self.data_ts,
               **fitterpp_opt)
+        self.population_evaluator = None
+        if workers > 1:
+            self.population_evaluator = PopulationEvaluator(self, workers)
+            self._setMethodKwargs(cn.METHOD_DIFFERENTIAL_EVOLUTION,
+                  workers=self.population_evaluator, updating="deferred")
+
+    def _setMethodKwargs(self, method_name, **kwargs):
+        """
+        Adds to the keyword arguments that the fitter provides to lmfit
+        for a method.
+
+        Parameters
+        ----------
+        method_name: str
+        kwargs: dict
+        """
+        for method in self.fitter.methods:
+            if method.method == method_name:
+                method.kwargs.update(kwargs)
+
+    def _makeObservedArr(self):
+        """
+        Finds the observed values at the simulated times.
+
+        Returns
+        -------
+        np.array-int (indices of simulated times that are observed)
+        np.array (observed values)
+            rows: observed times
+            columns: self.data_columns
+        """
+        times = np.linspace(self.start_time, self.end_time, self.num_point)
+        simulated_mss = [int(np.round(1000*t)) for t in times]
+        position_dct = {int(np.round(t)): p
+              for p, t in enumerate(self.data_ts.index)}
+        time_idxs = [i for i, t in enumerate(simulated_mss) if t in position_dct]
+        positions = [position_dct[simulated_mss[i]] for i in time_idxs]
+        observed_arr = np.array(self.data_ts[self.data_columns].values[positions, :],
+              dtype=float)
+        return np.array(time_idxs, dtype=int), observed_arr
 
     def subsetToMuteableParameters(self, parameters):
         """
         Returns a subset of parameters that can be modified.
+        The model is assigned the values of these parameters.
 
         Parameters
         ----------
@@ -87,19 +184,43 @@ class SBMLFitter():
         -------
         lmfit.Parameters
         """
+        muteable_names = set(MUTEABLE_PARAMETER_INDEX.get(self.model))
+        model_parameter_names = set(self.model.parameter_names)
         parameter_dct = parameters.valuesdict()
         new_parameters = lmfit.Parameters()
+        muteable_dct = {}
         for name, value in parameter_dct.items():
             if np.isclose(value, 0.0):
                 continue
-            try:
-                self.model.set({name: value})
-                parameter = parameters.get(name)
-                new_parameters.add(parameter)
-            except Exception:
-                continue
+            if not name in muteable_names:
+                if name in model_parameter_names:
+                    continue
+                # Not a model parameter. Check if it can be set.
+                try:
+                    self.model.set({name: value})
+                except Exception:
+                    continue
+            muteable_dct[name] = value
+            parameter = parameters.get(name)
+            new_parameters.add(parameter)
+        self.model.set(muteable_dct)
         return new_parameters
 
+    @staticmethod
+    def makeSimulationKey(parameter_dct):
+        """
+        Creates a key for the simulation of parameter values.
+
+        Parameters
+        ----------
+        parameter_dct: dict
+
+        Returns
+        -------
+        tuple
+        """
+        return tuple(sorted(parameter_dct.items()))
+
     def _simulate(self, is_dataframe=False, **parameter_dct):
         """
         Runs the simulation for particular parameter values.
@@ -118,19 +239,138 @@ class SBMLFitter():
         numpy.array if not is_dataframe
             columns: columns in data
         """
+        if (not is_dataframe) and (len(self.prefetch_dct) > 0):
+            key = self.makeSimulationKey(parameter_dct)
+            if key in self.prefetch_dct:
+                return self.prefetch_dct[key]
+        if self.simulation_cache is not None:
+            cache_key = (is_dataframe,) + tuple((n, float("%.*g"
+                  % (SIMULATION_CACHE_DIGITS, v)))
+                  for n, v in sorted(parameter_dct.items()))
+            result = self.simulation_cache.get(cache_key)
+            if result is not None:
+                return result
         # Set the value of the parameters
         self.model.set(parameter_dct)
         # Run the simulation
-        self.model.roadrunner.reset()
         if is_dataframe:
+            self.model.roadrunner.reset()
             arr = self.model.simulate(self.start_time,
                   self.end_time, self.num_point, self.full_columns)
             result = mdl.Timeseries(arr)
         else:
-            result = self.model.roadrunner.simulate(self.start_time,
-                  self.end_time, self.num_point, self.data_columns)
+            result = self._simulateDataColumns()
+        if self.simulation_cache is not None:
+            self.simulation_cache.put(cache_key, result)
         return result
 
+    def _simulateDataColumns(self):
+        """
+        Simulates the data columns from the initial state using the current
+        parameter values. The roadrunner selections are set only if they
+        have been changed so that they are not parsed for each simulation.
+        This is the simulation done for each evaluation by the fitter.
+
+        Returns
+        -------
+        NamedArray
+            rows: simulated times
+            columns: self.data_columns
+        """
+        rr = self.model.roadrunner
+        if list(rr.timeCourseSelections) != self.data_columns:
+            rr.timeCourseSelections = self.data_columns
+        rr.reset()
+        return rr.simulate(self.start_time, self.end_time, self.num_point)
+
+    def calcCandidateResiduals(self, candidate_arr):
+        """
+        Calculates the residuals of simulations for a batch of candidate
+        parameter values. The simulations are done in parallel if the
+        fitter has workers.
+
+        Parameters
+        ----------
+        candidate_arr: np.array
+            rows: candidates
+            columns: parameters in the order of self.parameters
+
+        Returns
+        -------
+        np.array (observed - simulated)
+            dimension 0: candidates
+            dimension 1: observed times
+            dimension 2: self.data_columns
+        """
+        candidate_arr = np.atleast_2d(np.array(candidate_arr, dtype=float))
+        names = list(self.parameters.keys())
+        if candidate_arr.shape[1] != len(names):
+            raise ValueError("Candidates must have values for %s" % str(names))
+        parameter_dcts = [dict(zip(names, row)) for row in candidate_arr]
+        if self.population_evaluator is None:
+            arrs = [self._simulate(**d) for d in parameter_dcts]
+        else:
+            # The pool is not kept since the fitter may not be closed
+            try:
+                arrs = self.population_evaluator.simulate(parameter_dcts)
+            finally:
+                self.population_evaluator.close()
+        residual_arr = np.empty((len(parameter_dcts), len(self.time_idxs),
+              len(self.data_columns)))
+        for idx, arr in enumerate(arrs):
+            residual_arr[idx] = self.observed_arr  \
+                  - np.array(arr)[self.time_idxs, :]
+        return residual_arr
+
+    def _initializeResiduals(self):
+        """
+        Creates the buffers and normalized observed values used by
+        calcResiduals.
+        """
+        std_arr = np.array(self.std_ser[self.data_columns].values, dtype=float)
+        std_arr[np.isclose(std_arr, 0)] = 1.0
+        self._residual_parameter_names = list(self.parameters.keys())
+        self._inverse_std_arr = 1.0/std_arr
+        self._normalized_observed_arr = self.observed_arr*self._inverse_std_arr
+        self._simulated_buf = np.empty(self.observed_arr.shape)
+        self._residual_buf = np.empty(self.observed_arr.shape)
+
+    def calcResiduals(self, values):
+        """
+        Calculates the residuals of a simulation normalized by the standard
+        deviations of the columns. The simulation is the one done by the
+        fitter, and the residuals are calculated in reused buffers. Fits do
+        not use this since fitterpp calculates its own residuals.
+
+        Parameters
+        ----------
+        values: array-float (values of parameters in the order of self.parameters)
+
+        Returns
+        -------
+        np.array (observed - simulated)/std
+            rows: observed times
+            columns: self.data_columns
+            The array is reused by the next call.
+        """
+        if self._residual_buf is None:
+            self._initializeResiduals()
+        self.model.set(dict(zip(self._residual_parameter_names, values)))
+        arr = self._simulateDataColumns()
+        np.take(arr, self.time_idxs, axis=0, out=self._simulated_buf)
+        np.multiply(self._simulated_buf, self._inverse_std_arr,
+              out=self._simulated_buf)
+        np.subtract(self._normalized_observed_arr, self._simulated_buf,
+              out=self._residual_buf)
+        return self._residual_buf
+
+    def close(self):
+        """
+        Releases the worker processes.
+        """
+        if self.population_evaluator is not None:
+            self.population_evaluator.close()
+
     def fit(self):
         """
         Fits the model by adjusting values of parameters based on
@@ -142,7 +382,10 @@ class SBMLFitter():
         sfitter = Smarte(sbml_model, data)
         sfitter.fit(parameters)
         """
-        self.fitter.fit()
+        try:
+            self.fitter.fit()
+        finally:
+            self.close()
 
     def getAccuracies(self, true_parameters):
         """
@@ -212,6 +455,8 @@ class SBMLFitter():
             num_species: number of floating species
             num_reactions: number of reactions
             num_parameters: number of parameters
+            simulation_cache_hits: simulations reused (if caching)
+            simulation_cache_misses: simulations run (if caching)
             status: str (result of running)
             tot_time: total run time
         """
@@ -236,6 +481,10 @@ class SBMLFitter():
         dct[cn.SD_NUM_SPECIES] = len(self.model.species_names)
         dct[cn.SD_NUM_PARAMETER] = len(self.model.parameter_names)
         dct[cn.SD_NUM_REACTION] = len(self.model.reaction_names)
+        if self.simulation_cache is not None:
+            stat_dct = self.simulation_cache.getStatistics()
+            dct[cn.SD_SIMULATION_CACHE_HITS] = stat_dct[lru.HITS]
+            dct[cn.SD_SIMULATION_CACHE_MISSES] = stat_dct[lru.MISSES]
         dct[cn.SD_STATUS] = "Success!"
         return dct
 
@@ -286,7 +535,7 @@ class SBMLFitter():
             model = model_num
         else:
             try:
-                model = mdl.Model.getBiomodel(model_num)
+                model = MODEL_CACHE.get(model_num)
                 if model is None:
                     success = False
             except Exception:
@@ -320,6 +569,95 @@ class SBMLFitter():
             dct[cn.SD_STATUS] = "No parameters or no floating species."
         return dct
 
+    @classmethod
+    def evaluateBiomodelMultistart(cls, model_num, observed_ts,
+          latincube_idxs=cn.SD_CONDITION_EXPANSION_DCT[cn.SD_LATINCUBE_IDX],
+          max_workers=1, rssq_threshold=None, **evaluate_opt):
+        """
+        Evaluates the fits for the latin cube starts of a BioModel. Starts run
+        concurrently in worker processes that share the compiled model.
+        Starts that have not begun are abandoned once a fit has an rssq no
+        larger than rssq_threshold. The best start is reported in the same way
+        as ExperimentProvider.calcBestLatincubeFits.
+
+        Parameters
+        ----------
+        model_num: int/Model (model number in data directory)
+        observed_ts: Timeseries
+            data used for parameter estimation
+        latincube_idxs: list-int
+        max_workers: int (number of processes)
+        rssq_threshold: float (no early abort if None)
+        evaluate_opt: dict (options for evaluateBiomodelFit)
+
+        Returns
+        -------
+        list-dict (see evaluateBiomodelFit)
+            the result of each completed start in the order of latincube_idxs
+            followed by the result of the best start with:
+                <method> = <method>_blc
+                latincube_idx = -len(latincube_idxs)
+        """
+        if "Model" in str(type(model_num)):
+            model = model_num
+        else:
+            try:
+                model = MODEL_CACHE.get(model_num)
+            except Exception:
+                model = None
+        if model is None:
+            return [{cn.SD_STATUS: "Could not construct model."}]
+        args = (model.roadrunner.saveStateS(), model.biomodel_num,
+              getModelHash(model), observed_ts)
+        #
+        def isAbort(dct):
+            if rssq_threshold is None:
+                return False
+            return dct.get(cn.SD_RSSQ, np.inf) <= rssq_threshold
+        #
+        result_dct = {}
+        if max_workers <= 1:
+            for latincube_idx in latincube_idxs:
+                dct = _evaluateLatincube(*args, latincube_idx, evaluate_opt)
+                result_dct[latincube_idx] = dct
+                if isAbort(dct):
+                    break
+        else:
+            # Only max_workers starts are submitted at a time so that
+            # the remaining starts are not run if there is an abort
+            latincube_iter = iter(latincube_idxs)
+            pending_dct = {}
+            is_abort = False
+            with concurrent.futures.ProcessPoolExecutor(
+                  max_workers=max_workers) as executor:
+                while True:
+                    if not is_abort:
+                        for latincube_idx in latincube_iter:
+                            future = executor.submit(_evaluateLatincube, *args,
+                                  latincube_idx, evaluate_opt)
+                            pending_dct[future] = latincube_idx
+                            if len(pending_dct) >= max_workers:
+                                break
+                    if len(pending_dct) == 0:
+                        break
+                    done_futures, _ = concurrent.futures.wait(pending_dct,
+                          return_when=concurrent.futures.FIRST_COMPLETED)
+                    # Starts that are running when there is an abort are completed
+                    for future in done_futures:
+                        dct = future.result()
+                        result_dct[pending_dct.pop(future)] = dct
+                        is_abort = is_abort or isAbort(dct)
+        results = [result_dct[i] for i in latincube_idxs if i in result_dct]
+        # Construct the result for the best start
+        fit_results = [d for d in results
+              if not np.isnan(d.get(cn.SD_RSSQ, np.nan))]
+        if len(fit_results) > 0:
+            best_dct = dict(min(fit_results, key=lambda d: d[cn.SD_RSSQ]))
+            best_dct[cn.SD_LATINCUBE_IDX] = -len(latincube_idxs)
+            best_dct[cn.SD_METHOD] += cn.BLC_SUFFIX
+            results.append(best_dct)
+        return results
+
     @classmethod
     def makeBiomodelSyntheticData(cls, model_num, noise_mag, num_dataset=1):
         """
@@ -342,7 +680,7 @@ class SBMLFitter():
             model = model_num
         else:
             try:
-                model = mdl.Model.getBiomodel(model_num)
+                model = MODEL_CACHE.get(model_num)
                 if model is None:
                     success = False
             except Exception:
@@ -354,7 +692,7 @@ class SBMLFitter():
             if len(results) >= num_dataset:
                 break
             observed_ts = model.simulate(noise_mag=noise_mag,
-                  std_ser=model.calculateStds())
+                  std_ser=STDS_CACHE.calculateStds(model))
             results.append(observed_ts)
         #
         return results
@@ -0,0 +1,100 @@
+"""Cache of the standard deviations of model simulations.
+
+Model.calculateStds runs a simulation. The result depends only on the model,
+its parameter values, and the arguments of calculateStds. So, results are
+kept in memory and, optionally, in a directory shared by processes.
+"""
+
+import smarte.constants as cn
+from smarte.lru_cache import LRUCache
+from smarte.model_disk_cache import getModelHash
+from smarte.persister import Persister
+
+import hashlib
+import os
+
+MAX_STDS = 1000  # Default number of results kept in memory
+STDS_EXT = ".pcl"
+
+
+class StdsCache(object):
+
+    def __init__(self, max_size=MAX_STDS, directory=None):
+        """
+        Parameters
+        ----------
+        max_size: int (maximum number of results kept in memory)
+        directory: str (directory where results are saved)
+        """
+        self.cache = LRUCache(max_size=max_size)
+        self.directory = directory
+
+    def _makeKey(self, model, args):
+        parameter_dct = model.get(model.parameter_names)
+        stg = str((getModelHash(model), sorted(parameter_dct.items()), args))
+        return hashlib.sha256(stg.encode()).hexdigest()
+
+    def _getPersister(self, key):
+        return Persister(os.path.join(self.directory, key + STDS_EXT))
+
+    def calculateStds(self, model, *args):
+        """
+        Provides the result of model.calculateStds(*args).
+
+        Parameters
+        ----------
+        model: Model
+        args: list (arguments of Model.calculateStds)
+
+        Returns
+        -------
+        pd.Series
+        """
+        key = self._makeKey(model, args)
+        std_ser = self.cache.get(key)
+        if std_ser is not None:
+            return std_ser.copy()
+        persister = None
+        if self.directory is not None:
+            persister = self._getPersister(key)
+            if persister.isExist():
+                try:
+                    std_ser = persister.load()
+                except Exception:
+                    # Incomplete file
+                    std_ser = None
+        if std_ser is None:
+            std_ser = model.calculateStds(*args)
+            if persister is not None:
+                self._save(persister, std_ser)
+        self.cache.put(key, std_ser)
+        return std_ser.copy()
+
+    @staticmethod
+    def _save(persister, std_ser):
+        # Rename a process specific file so readers never see a partial file
+        os.makedirs(os.path.dirname(persister.path), exist_ok=True)
+        path = persister.path
+        tmp_persister = Persister("%s.%d.tmp" % (path, os.getpid()))
+        tmp_persister.dump(std_ser)
+        os.replace(tmp_persister.path, path)
+
+    def clear(self):
+        """
+        Removes the results in memory.
+        """
+        self.cache.clear()
+
+    def getStatistics(self):
+        """
+        Provides usage statistics for results in memory.
+
+        Returns
+        -------
+        dict (see LRUCache.getStatistics)
+        """
+        return self.cache.getStatistics()
+
+
+# Cache shared by the objects in a process
+STDS_CACHE = StdsCache(directory=cn.STDS_CACHE_DIR)
@@ -0,0 +1,317 @@
+"""Growable column of values stored in a typed array.
+
+A ColumnBuffer holds the values of one column of an MVDictTable. The kind
+of the column is set by the first value that is not None:
+    int: values in an int64 array
+    float: values in a float64 array
+    str: int32 codes of a list of categories
+An int column becomes a float column when a float is appended, and ints
+appended to a float column are stored as floats. Such ints are recorded so
+that they are returned as ints. A value of another type, or a value that
+does not match the kind of the column, changes the column to a list of
+objects. None values are recorded in a mask. Arrays double in size when they are full so that appends are
+amortized O(1). Values are returned as python objects so that their
+strings are the same as for a list.
+"""
+
+from smarte.types.elemental_type import isInt, isStr
+
+import numpy as np
+import pandas as pd
+
+KIND_NONE = "none"  # No value other than None has been appended
+KIND_INT = "int"
+KIND_FLOAT = "float"
+KIND_STR = "str"
+KIND_OBJECT = "object"
+DTYPE_DCT = {KIND_INT: np.int64, KIND_FLOAT: np.float64, KIND_STR: np.int32}
+MISSING_DCT = {KIND_INT: 0, KIND_FLOAT: np.nan, KIND_STR: -1}
+INITIAL_CAPACITY = 16
+MAX_EXACT_INT = 2**53  # Largest int that is exact in a float64
+
+
+def _getKind(value):
+    if value is None:
+        return KIND_NONE
+    if isInt(value):
+        return KIND_INT
+    if isinstance(value, float):
+        return KIND_FLOAT
+    if isStr(value):
+        return KIND_STR
+    return KIND_OBJECT
+
+
+class ColumnBuffer(object):
+
+    def __init__(self, values=None):
+        """
+        Parameters
+        ----------
+        values: list (initial values)
+        """
+        self.kind = KIND_NONE
+        self._length = 0
+        self._arr = None  # values or codes
+        self._mask_arr = None  # True if the value is None
+        self._int_arr = None  # True if the value of a float column is an int
+        self._categories = []  # values of codes
+        self._code_dct = {}  # key: category, value: code
+        self._objects = None  # values if the kind is object
+        if values is not None:
+            self.extend(values)
+
+    def __len__(self):
+        return self._length
+
+    def _setKind(self, kind):
+        """
+        Changes the kind of the column. A column that has no values other
+        than None can become any kind. Other columns become object columns.
+
+        Parameters
+        ----------
+        kind: str
+        """
+        if kind == KIND_OBJECT:
+            self._objects = self.tolist()
+            self._arr = None
+            self._mask_arr = None
+            self._int_arr = None
+            self._categories = []
+            self._code_dct = {}
+        else:
+            capacity = max(INITIAL_CAPACITY, 2*self._length)
+            self._arr = np.empty(capacity, dtype=DTYPE_DCT[kind])
+            self._arr[:self._length] = MISSING_DCT[kind]
+            self._mask_arr = np.zeros(capacity, dtype=bool)
+            self._mask_arr[:self._length] = True
+        self.kind = kind
+
+    def _promoteToFloat(self):
+        """
+        Changes an int column to a float column.
+        """
+        capacity = len(self._arr)
+        arr = np.empty(capacity, dtype=np.float64)
+        arr[:self._length] = self._arr[:self._length]
+        arr[:self._length][self._mask_arr[:self._length]] = np.nan
+        self._int_arr = np.zeros(capacity, dtype=bool)
+        self._int_arr[:self._length] = ~self._mask_arr[:self._length]
+        self._arr = arr
+        self.kind = KIND_FLOAT
+
+    def _isFloatCompatible(self, kind, value):
+        """
+        Tests if the value can be stored in the column as a float.
+
+        Parameters
+        ----------
+        kind: str (kind of the value)
+        value: object
+
+        Returns
+        -------
+        bool
+        """
+        if not {kind, self.kind} == {KIND_INT, KIND_FLOAT}:
+            return False
+        if kind == KIND_INT:
+            return abs(value) <= MAX_EXACT_INT
+        return np.all(np.abs(self._arr[:self._length][
+              ~self._mask_arr[:self._length]]) <= MAX_EXACT_INT)
+
+    def _reserve(self, size):
+        """
+        Enlarges the arrays so that they have at least size elements.
+
+        Parameters
+        ----------
+        size: int
+        """
+        capacity = len(self._arr)
+        if size <= capacity:
+            return
+        capacity = max(size, 2*capacity, INITIAL_CAPACITY)
+        arr = np.empty(capacity, dtype=self._arr.dtype)
+        arr[:self._length] = self._arr[:self._length]
+        mask_arr = np.zeros(capacity, dtype=bool)
+        mask_arr[:self._length] = self._mask_arr[:self._length]
+        self._arr = arr
+        self._mask_arr = mask_arr
+        if self._int_arr is not None:
+            int_arr = np.zeros(capacity, dtype=bool)
+            int_arr[:self._length] = self._int_arr[:self._length]
+            self._int_arr = int_arr
+
+    def _encode(self, value):
+        """
+        Provides the array value for a value of the kind of the column.
+
+        Parameters
+        ----------
+        value: int/float/str
+
+        Returns
+        -------
+        int/float
+        """
+        if self.kind != KIND_STR:
+            return value
+        code = self._code_dct.get(value)
+        if code is None:
+            code = len(self._categories)
+            self._categories.append(value)
+            self._code_dct[value] = code
+        return code
+
+    def append(self, value):
+        """
+        Appends a value to the column.
+
+        Parameters
+        ----------
+        value: object
+        """
+        kind = _getKind(value)
+        if kind != KIND_NONE:
+            if self.kind == KIND_NONE:
+                self._setKind(kind)
+            elif self._isFloatCompatible(kind, value):
+                if self.kind == KIND_INT:
+                    self._promoteToFloat()
+            elif (kind != self.kind) and (self.kind != KIND_OBJECT):
+                self._setKind(KIND_OBJECT)
+        if self.kind == KIND_OBJECT:
+            self._objects.append(value)
+        elif self.kind != KIND_NONE:
+            self._reserve(self._length + 1)
+            if kind == KIND_NONE:
+                self._arr[self._length] = MISSING_DCT[self.kind]
+                self._mask_arr[self._length] = True
+            else:
+                try:
+                    self._arr[self._length] = self._encode(value)
+                    self._mask_arr[self._length] = False
+                    if (self.kind == KIND_FLOAT) and (kind == KIND_INT):
+                        if self._int_arr is None:
+                            self._int_arr = np.zeros(len(self._arr), dtype=bool)
+                        self._int_arr[self._length] = True
+                    elif self._int_arr is not None:
+                        self._int_arr[self._length] = False
+                except OverflowError:
+                    # Integer that does not fit in the array
+                    self._setKind(KIND_OBJECT)
+                    self._objects.append(value)
+        self._length += 1
+
+    def extend(self, values):
+        """
+        Appends values to the column.
+
+        Parameters
+        ----------
+        values: list
+        """
+        for value in values:
+            self.append(value)
+
+    def _getValue(self, idx):
+        # Value at a non-negative index
+        if self.kind == KIND_OBJECT:
+            return self._objects[idx]
+        if (self.kind == KIND_NONE) or self._mask_arr[idx]:
+            return None
+        if self.kind == KIND_INT:
+            return int(self._arr[idx])
+        if self.kind == KIND_FLOAT:
+            if (self._int_arr is not None) and self._int_arr[idx]:
+                return int(self._arr[idx])
+            return float(self._arr[idx])
+        return self._categories[self._arr[idx]]
+
+    def __getitem__(self, idx):
+        """
+        Parameters
+        ----------
+        idx: int/slice
+
+        Returns
+        -------
+        object if idx is an int
+        list if idx is a slice
+        """
+        if isinstance(idx, slice):
+            return [self._getValue(n) for n in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if (idx < 0) or (idx >= len(self)):
+            raise IndexError("Index %d is out of range." % idx)
+        return self._getValue(idx)
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self._getValue(idx)
+
+    def tolist(self):
+        """
+        Provides the values of the column.
+
+        Returns
+        -------
+        list
+        """
+        if self.kind == KIND_OBJECT:
+            return list(self._objects)
+        return list(self)
+
+    def __str__(self):
+        return str(self.tolist())
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, str(self))
+
+    def makeSeries(self):
+        """
+        Creates a series with the dtype of a series of the list of values.
+        The series for int and float columns use the arrays of the column
+        without copying unless an int column has None values.
+
+        Returns
+        -------
+        pd.Series
+        """
+        if self.kind == KIND_NONE:
+            return pd.Series(self.tolist(), dtype=object)
+        if self.kind == KIND_OBJECT:
+            return pd.Series(self.tolist())
+        arr = self._arr[:self._length]
+        mask_arr = self._mask_arr[:self._length]
+        if self.kind == KIND_STR:
+            # Strings have the dtype of a series of a list of strings.
+            # The code of None (-1) selects the last category.
+            categories = np.empty(len(self._categories) + 1, dtype=object)
+            categories[:-1] = self._categories
+            categories[-1] = None
+            return pd.Series(categories[arr])
+        if (self.kind == KIND_INT) and mask_arr.any():
+            # None is represented by nan as in a DataFrame of lists
+            arr = arr.astype(np.float64)
+            arr[mask_arr] = np.nan
+        return pd.Series(arr, copy=False)
+
+    def __getstate__(self):
+        # Omits unused capacity
+        state = dict(self.__dict__)
+        if self._arr is not None:
+            state["_arr"] = self._arr[:self._length].copy()
+            state["_mask_arr"] = self._mask_arr[:self._length].copy()
+        if self._int_arr is not None:
+            state["_int_arr"] = self._int_arr[:self._length].copy()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if not "_int_arr" in state:
+            # Saved before int columns were promoted to float
+            self._int_arr = None
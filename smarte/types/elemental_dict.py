@@ -1,8 +1,11 @@
 """Dictionary of elemental types with pre-specified attributes"""
 
-from smarte.types.elemental_type import isStr, isInt, isBool, isFloat, isElemental
+from smarte.types.elemental_type import isElemental, isList, convertStr,  \
+      ELEMENTAL_TYPES
 
 import copy
+import functools
+import numbers
 
 
 # Separators
@@ -10,11 +13,181 @@ KEY_VALUE_SEP = "__"  # Separates key-value pairs
 VALUE_SEP = "--" # Separates the key from its value and values from one another
 MAX_LIST_LEN = 5  # Maximum length of a list in a string
 LIST_BREAK = "..."  # Indicates a break in the list
+PARSE_CACHE_SIZE = 1000  # Number of parsed strings kept
+IMMUTABLE_TYPES = (str, numbers.Number, type(None))
+MAX_DEFAULT_DCT = 100  # Number of sets of keys for which defaults are kept
 
 
-class ElementalDict(dict):
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parseStr(stg):
+    """
+    Parses the string representation of a dictionary.
+
+    Returns
+    -------
+    tuple-tuple
+        str: key
+        object/tuple: value or values
+        bool: value is a list
+    """
+    if LIST_BREAK in stg:
+        raise ValueError("Cannot convert a string with a list break: %s" % stg)
+    items = []
+    for key_value in stg.split(KEY_VALUE_SEP):
+        parts = key_value.split(VALUE_SEP)
+        if len(parts) < 2:
+            raise RuntimeError("Wrong size: %s" % key_value)
+        values = tuple([convertStr(v) for v in parts[1:]])
+        if len(values) == 1:
+            items.append((parts[0], values[0], False))
+        else:
+            items.append((parts[0], values, True))
+    return tuple(items)
+
+def parseStr(stg):
+    """
+    Decodes the string representation of a dictionary. Parsed strings are
+    cached.
+
+    Parameters
+    ----------
+    stg: str
+
+    Returns
+    -------
+    dict
+        key: str
+        value: bool, int, float, str, or a list of these
+    """
+    return {k: list(v) if is_list else v for k, v, is_list in _parseStr(stg)}
+
+def makeStr(dct):
+    """
+    Creates the string representation of a dictionary. Long lists are
+    sorted and abbreviated.
+
+    Parameters
+    ----------
+    dct: dict
+        key: str
+        value: bool, int, float, str, or a list of these
+
+    Returns
+    -------
+    str
+    """
+    def stringify(key, value):
+        return key + VALUE_SEP + str(value)
+    #
+    names = []
+    keys = list(dct.keys())
+    keys.sort()
+    for key in keys:
+        value = dct[key]
+        if isinstance(value, str):
+            name = stringify(key, value)
+        elif isinstance(value, list):
+            if len(value) > MAX_LIST_LEN:
+                # List is too long. Add list break
+                value.sort()
+                value_name = VALUE_SEP.join(
+                      str(v) for v in value[0:MAX_LIST_LEN-1])
+                value_name = value_name + LIST_BREAK + str(value[-1])
+            else:
+                value_name = VALUE_SEP.join([str(v) for v in value])
+            name = stringify(key, value_name)
+        else:
+            name = stringify(key, value)
+        names.append(name)
+    return KEY_VALUE_SEP.join(names)
+
+
+class _Schema(object):
+    # Checks and defaults compiled from the default_dct of a class
+
+    def __init__(self, default_dct, is_single_valued):
+        """
+        Parameters
+        ----------
+        default_dct: dict
+        is_single_valued: bool (values cannot be lists)
+        """
+        self.default_dct = default_dct
+        self.is_single_valued = is_single_valued
+        self.keys = frozenset(default_dct.keys())
+        # Defaults of immutable types are shared by instances
+        self.mutable_keys = frozenset([k for k, v in default_dct.items()
+              if not isinstance(v, IMMUTABLE_TYPES)])
+        self.list_default_keys = frozenset([k for k, v in default_dct.items()
+              if isList(v)])
+        # Defaults for the sets of keys provided
+        self._default_dcts = {}
+
+    def validate(self, dct):
+        """
+        Checks that values are correct types and have correct keys.
+
+        Parameters
+        ----------
+        dct: dict
+        """
+        # Validate keys
+        if not self.keys.issuperset(dct.keys()):
+            diff = set(dct.keys()).difference(self.keys)
+            raise ValueError("Invalid keys: %s" % str(diff))
+        # Validate values. Values of subclasses of elemental types are
+        # checked individually.
+        value_types = set(map(type, dct.values()))
+        if value_types.issubset(ELEMENTAL_TYPES):
+            is_list = list in value_types
+        else:
+            is_list = False
+            for value in dct.values():
+                if not isElemental(value):
+                    raise ValueError("Not elemental type in %s" % str(dct))
+                is_list = is_list or isinstance(value, list)
+        if self.is_single_valued:
+            if (len(self.list_default_keys) > 0)  \
+                  and (not self.list_default_keys.issubset(dct.keys())):
+                is_list = True
+            if is_list:
+                raise ValueError("Values must be elemental, non-lists: %s"
+                      % str(dct))
 
+    def makeDefaultDct(self, dct):
+        """
+        Constructs the defaults for keys not in dct.
+
+        Parameters
+        ----------
+        dct: dict
+
+        Returns
+        -------
+        dict
+        """
+        key_set = frozenset(dct.keys())
+        entry = self._default_dcts.get(key_set)
+        if entry is None:
+            template_dct = {k: v for k, v in self.default_dct.items()
+                  if not k in key_set}
+            mutable_keys = [k for k in template_dct.keys()
+                  if k in self.mutable_keys]
+            entry = (template_dct, mutable_keys)
+            if len(self._default_dcts) >= MAX_DEFAULT_DCT:
+                self._default_dcts.clear()
+            self._default_dcts[key_set] = entry
+        template_dct, mutable_keys = entry
+        default_dct = dict(template_dct)
+        for key in mutable_keys:
+            default_dct[key] = copy.deepcopy(template_dct[key])
+        return default_dct
+
+
+class ElementalDict(dict):
+    __slots__ = ()
     default_dct = {}  # Override to specify keywords and default values
+    is_single_valued = False  # Values cannot be lists
 
     def __init__(self, **kwargs):
         """
@@ -23,12 +196,27 @@ class ElementalDict(dict):
         kwargs: dict
         """
         super().__init__(**kwargs)
+        schema = self._getSchema()
         # Validatation checks
-        self._validate(kwargs)
+        schema.validate(kwargs)
         # Assign defaults
-        for key, value in self.default_dct.items():
-            if not key in self.keys():
-                self[key] = copy.deepcopy(value)
+        dict.update(self, schema.makeDefaultDct(kwargs))
+
+    @classmethod
+    def _getSchema(cls):
+        """
+        Provides the schema for the class, constructing it when the class is
+        first used or its default_dct is replaced.
+
+        Returns
+        -------
+        _Schema
+        """
+        schema = cls.__dict__.get("_schema")
+        if (schema is None) or (schema.default_dct is not cls.default_dct):
+            schema = _Schema(cls.default_dct, cls.is_single_valued)
+            cls._schema = schema
+        return schema
 
     def _validate(self, dct):
         """
@@ -38,14 +226,7 @@ class ElementalDict(dict):
         ----------
         dct: dict
         """
-        # Validate keys
-        diff = set(dct.keys()).difference(self.default_dct.keys())
-        if len(diff) > 0:
-            raise ValueError("Invalid keys: %s" % str(diff))
-        # Validate values
-        trues = [isElemental(v) for v in dct.values()]
-        if not all(trues):
-            raise ValueError("Not elemental type in %s" % str(dct))
+        self._getSchema().validate(dct)
 
     def __str__(self):
         """
@@ -56,30 +237,7 @@ class ElementalDict(dict):
         -------
         str
         """
-        def stringify(key, value):
-            return key + VALUE_SEP + str(value)
-        #
-        names = []
-        keys = list(self.keys())
-        keys.sort()
-        for key in keys:
-            value = self[key]
-            if isinstance(value, str):
-                name = stringify(key, value)
-            elif isinstance(value, list):
-                if len(value) > MAX_LIST_LEN:
-                    # List is too long. Add list break
-                    value.sort()
-                    value_name = VALUE_SEP.join(
-                          str(v) for v in value[0:MAX_LIST_LEN-1])
-                    value_name = value_name + LIST_BREAK + str(value[-1])
-                else:
-                    value_name = VALUE_SEP.join([str(v) for v in value])
-                name = stringify(key, value_name)
-            else:
-                name = stringify(key, value)
-            names.append(name)
-        return KEY_VALUE_SEP.join(names)
+        return makeStr(self)
 
     def equals(self, other):
         """
@@ -109,63 +267,7 @@ class ElementalDict(dict):
         -------
         ElementalDict
         """
-        def convert(value):
-            """
-            Converts to correct type.
-
-            Parameters
-            ----------
-            value: str
-
-            Returns
-            -------
-            int, bool, float, str
-            """
-            if isStr(value):
-                if len(value) == 0:
-                    raise ValueError("Invalid value for element instance.")
-                # bool
-                if isBool(eval(value)):
-                    new_value = eval(value)
-                # int
-                elif isInt(eval(value)):
-                    new_value = int(value)
-                # float
-                elif isFloat(eval(value)):
-                    new_value = float(value)
-                # str
-                else:
-                    new_value = value
-            else:
-                new_value = value
-            return new_value
-        #
-        if LIST_BREAK in stg:
-            raise ValueError("Cannot convert a string with a list break: %s" % stg)
-        # Construct the dictionary from the string
-        dct = {}
-        key_values = stg.split(KEY_VALUE_SEP)
-        for key_value in key_values:
-            # Parse the key and value(s)
-            parts = key_value.split(VALUE_SEP)
-            if len(parts) == 2:
-                key, values = parts
-            elif len(parts) < 2:
-                import pdb; pdb.set_trace()
-                raise RuntimeError("Wrong size.")
-            else:
-                key = parts[0]
-                values = parts[1:]
-            # Decode the types
-            if isinstance(values, str):
-                try:
-                    dct[key] = convert(values)
-                except NameError:
-                    dct[key] = values
-            elif isinstance(values, list):
-                dct[key] = [convert(v) for v in values]
-            else:
-                dct[key] = values
+        dct = parseStr(stg)
         return cls(**dct, **kwargs)
 
     def copy(self):
@@ -1,5 +1,14 @@
 """Checks for elemental types"""
 
+import numbers
+import re
+
+BOOL_DCT = {"True": True, "False": False}
+INT_PAT = re.compile(r"[+-]?\d+")
+FLOAT_PAT = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+# Types that are elemental without further checks
+ELEMENTAL_TYPES = frozenset([str, int, float, list, type(None)])
+
 
 def isBool(obj):
     if isInt(obj):
@@ -7,6 +16,8 @@ def isBool(obj):
     return isinstance(obj, bool)
 
 def isElemental(obj):
+    if type(obj) in ELEMENTAL_TYPES:
+        return True
     return isStr(obj) or isList(obj) or isInt(obj) or isFloat(obj) or (obj is None)
 
 def isFloat(obj):
@@ -15,7 +26,10 @@ def isFloat(obj):
     return isinstance(obj, float)
 
 def isInt(obj):
-    return "int" in str(type(obj))
+    # Includes numpy integers
+    if isinstance(obj, bool):
+        return False
+    return isinstance(obj, numbers.Integral)
 
 def isList(obj):
     if isStr(obj):
@@ -25,3 +39,26 @@ def isList(obj):
 def isStr(obj):
     return isinstance(obj, str)
 
+
+def convertStr(stg):
+    """
+    Converts a string to the elemental type of its literal. Strings that are
+    not bool, int, or float literals are unchanged.
+
+    Parameters
+    ----------
+    stg: str
+
+    Returns
+    -------
+    bool, int, float, str
+    """
+    if len(stg) == 0:
+        raise ValueError("Invalid value for element instance.")
+    if stg in BOOL_DCT:
+        return BOOL_DCT[stg]
+    if INT_PAT.fullmatch(stg):
+        return int(stg)
+    if FLOAT_PAT.fullmatch(stg):
+        return float(stg)
+    return stg
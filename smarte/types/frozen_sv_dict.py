@@ -0,0 +1,108 @@
+"""Immutable, hashable SVDict
+
+A FrozenSVDict has the keys and values of an SVDict. Its canonical key is
+the string representation of the SVDict, which is calculated once and
+used for hashing and equality. Values are stored in a tuple ordered by
+key so that instances do not have a dictionary.
+"""
+
+from smarte.types.sv_dict import SVDict
+
+from collections.abc import Mapping
+
+
+def _construct(cls, dct):
+    # Used to unpickle
+    return cls(**dct)
+
+
+class FrozenSVDict(Mapping):
+    __slots__ = ("_values", "_key", "_hash")
+    sv_dict_cls = SVDict  # Override with the mutable class
+    _keys = ()  # Sorted keys
+    _position_dct = {}  # Position of the value of each key
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._keys = tuple(sorted(cls.sv_dict_cls.default_dct.keys()))
+        cls._position_dct = {k: n for n, k in enumerate(cls._keys)}
+
+    def __init__(self, **kwargs):
+        """
+        Parameters
+        ----------
+        kwargs: dict (arguments for sv_dict_cls)
+        """
+        sv_dict = self.sv_dict_cls(**kwargs)
+        key = str(sv_dict)
+        object.__setattr__(self, "_values",
+              tuple(sv_dict[k] for k in self._keys))
+        object.__setattr__(self, "_key", key)
+        object.__setattr__(self, "_hash", hash(key))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s is immutable." % self.__class__.__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError("%s is immutable." % self.__class__.__name__)
+
+    def __getitem__(self, key):
+        return self._values[self._position_dct[key]]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._position_dct
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenSVDict):
+            return (self._hash == other._hash) and (self._key == other._key)
+        if isinstance(other, SVDict):
+            return self._key == str(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __str__(self):
+        return self._key
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, self._key)
+
+    def __reduce__(self):
+        return (_construct, (self.__class__, dict(self)))
+
+    def equals(self, other):
+        """
+        Checks for equal dictionaries in the same way as ElementalDict.equals.
+
+        Parameters
+        ----------
+        other: ElementalDict/FrozenSVDict
+
+        Returns
+        -------
+        bool
+        """
+        return self._key == str(other)
+
+    def thaw(self):
+        """
+        Creates the mutable dictionary.
+
+        Returns
+        -------
+        sv_dict_cls
+        """
+        return self.sv_dict_cls(**dict(self))
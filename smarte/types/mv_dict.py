@@ -33,6 +33,50 @@ class MVDict(ElementalDict):
         # Iterator position
         self.iterate_idx = 0
 
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidateIndex()
+
+    def _invalidateIndex(self):
+        """
+        Discards the index used for membership tests.
+        """
+        self._index = None
+
+    def _getIndex(self):
+        """
+        Provides the index used for membership tests, constructing it if
+        needed.
+
+        Returns
+        -------
+        object (see _makeIndex)
+        """
+        index = getattr(self, "_index", None)
+        if index is None:
+            index = self._makeIndex()
+            self._index = index
+        return index
+
+    def _makeIndex(self):
+        raise RuntimeError("Must override")
+
+    def _isSameKeys(self, sv_dict):
+        """
+        Tests if an element of this collection with the class of sv_dict has
+        the same keys as sv_dict.
+
+        Parameters
+        ----------
+        sv_dict: inherits from SVDict
+
+        Returns
+        -------
+        bool
+        """
+        keys = set(self.keys()).union(sv_dict.default_dct.keys())
+        return keys == set(sv_dict.keys())
+
     def append(self, dct):
         """
         Appends values in dictionary to keys in the MVDict.
@@ -46,6 +90,7 @@ class MVDict(ElementalDict):
         for key, value in self.items():
             if key in dct.keys():
                 value.append(dct[key])
+        self._invalidateIndex()
 
     def extend(self, dct):
         """
@@ -60,6 +105,7 @@ class MVDict(ElementalDict):
         for key, value in self.items():
             if key in dct.keys():
                 value.extend(dct[key])
+        self._invalidateIndex()
 
     def iterate(self, cls, is_restart=True):
         """
@@ -77,13 +123,16 @@ class MVDict(ElementalDict):
         """
         if is_restart:
             self.iterate_idx = 0
-        for idx, dct in enumerate(self._next()):
-            if idx < self.iterate_idx:
-                continue
+        start_idx = self.iterate_idx
+        for idx, dct in enumerate(self._next(start_idx=start_idx),
+              start=start_idx):
             yield cls(**dct)
             self.iterate_idx = idx + 1
 
-    def _next(self):
+    def _next(self, start_idx=0):
+        """
+        Iterates on the elements of the dictionary beginning at start_idx.
+        """
         raise RuntimeError("Must override")
 
     def __contains__(self, sv_dict):
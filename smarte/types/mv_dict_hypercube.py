@@ -1,17 +1,81 @@
 """Dictionary whose values represent a hypercube"""
 
-from smarte.types.sv_dict import SVDict
 from smarte.types.mv_dict import MVDict
 from smarte.types.mv_dict_table import MVDictTable
 
 import numpy as np
+import pandas as pd
 
 
 class MVDictHypercube(MVDict):
 
-    def _next(self):
+    def _getIndexDct(self, idx):
         """
-        Iterator for lists of the same length.
+        Finds the position in each list for an index of the iteration.
+        The last key varies fastest.
+
+        Parameters
+        ----------
+        idx: int (in [0, len(self)))
+
+        Returns
+        -------
+        dict
+            key: key
+            value: position in the list for the key
+        """
+        index_dct = {}
+        for key in reversed(list(self.keys())):
+            idx, index_dct[key] = divmod(idx, len(dict.__getitem__(self, key)))
+        return index_dct
+
+    def __getitem__(self, key):
+        """
+        Provides the value of a key or the elements at positions of
+        the iteration.
+
+        Parameters
+        ----------
+        key: str/int/slice
+
+        Returns
+        -------
+        list if key is a str
+        dict if key is an int
+        list-dict if key is a slice
+        """
+        if isinstance(key, str):
+            return super().__getitem__(key)
+        length = len(self)
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(length))]
+        idx = int(key)
+        if idx < 0:
+            idx += length
+        if (idx < 0) or (idx >= length):
+            raise IndexError("Index %d is out of range." % key)
+        index_dct = self._getIndexDct(idx)
+        return {k: v[index_dct[k]] for k, v in self.items()}
+
+    def seek(self, idx):
+        """
+        Sets the position at which iteration continues if there is no restart.
+
+        Parameters
+        ----------
+        idx: int (in [0, len(self)])
+        """
+        if (idx < 0) or (idx > len(self)):
+            raise IndexError("Index %d is out of range." % idx)
+        self.iterate_idx = idx
+
+    def _next(self, start_idx=0):
+        """
+        Iterator for the combinations of values.
+
+        Parameters
+        ----------
+        start_idx: int (index of the first combination)
 
         Returns
         -------
@@ -19,8 +83,9 @@ class MVDictHypercube(MVDict):
         """
         def get(dct, index_dct):
             return {k: dct[k][index_dct[k]] for k in dct.keys()}
-        # Ensure that dct consists of lists
-        index_dct = {k: 0 for k in self.keys()}  # list position for each key
+        if start_idx >= len(self):
+            return
+        index_dct = self._getIndexDct(start_idx)
         keys = list(self.keys()) #  Order in which keys are incremented
         keys.reverse()
         # First value
@@ -45,6 +110,44 @@ class MVDictHypercube(MVDict):
                 # Have completed iteration
                 break
 
+    def _makeIndex(self):
+        """
+        Constructs the sets of levels of the keys. Values are compared as
+        strings as in ElementalDict.equals.
+
+        Returns
+        -------
+        dict
+            key: key
+            value: set-str
+        """
+        return {k: set(str(v) for v in values) for k, values in self.items()}
+
+    def __contains__(self, sv_dict):
+        """
+        Tests if the SVDict is in this collection. An element is in the
+        hypercube if the value of each key is a level of the key and
+        other keys have their default values.
+
+        Parameters
+        ----------
+        sv_dict: inherits from SVDict
+
+        Returns
+        -------
+        bool
+        """
+        if not self._isSameKeys(sv_dict):
+            return False
+        level_dct = self._getIndex()
+        for key, value in sv_dict.items():
+            if key in level_dct:
+                if not str(value) in level_dct[key]:
+                    return False
+            elif str(value) != str(sv_dict.default_dct[key]):
+                return False
+        return True
+
     def __len__(self):
         """
         Calculates the length of the list produced by iteration.
@@ -56,6 +159,54 @@ class MVDictHypercube(MVDict):
         sizes = [len(v) for v in self.values()]
         return np.prod(sizes)
 
+    def _makeColumnDct(self, is_typed=False):
+        """
+        Constructs the values of each key for all combinations in the order
+        of iteration. Values of a key are repeated for each combination of
+        the values of later keys, and this is tiled for each combination of
+        the values of earlier keys.
+
+        Parameters
+        ----------
+        is_typed: bool (use the array type inferred by pandas for the values)
+
+        Returns
+        -------
+        dict
+            key: key
+            value: np.array (object if not is_typed)
+        """
+        sizes = [len(v) for v in self.values()]
+        num_combination = int(np.prod(sizes))
+        column_dct = {}
+        num_repeat = num_combination
+        num_tile = 1
+        for key, size in zip(self.keys(), sizes):
+            if is_typed:
+                values = pd.Series(self[key]).values
+            else:
+                values = np.empty(size, dtype=object)
+                values[:] = self[key]
+            if num_combination == 0:
+                column_dct[key] = values[0:0]
+                continue
+            num_repeat = num_repeat//size
+            column_dct[key] = np.tile(np.repeat(values, num_repeat), num_tile)
+            num_tile = num_tile*size
+        return column_dct
+
+    def makeDataframe(self):
+        """
+        Creates a DataFrame with a row for each combination in the order
+        of iteration.
+
+        Returns
+        -------
+        pd.DataFrame
+            columns: keys
+        """
+        return pd.DataFrame(self._makeColumnDct(is_typed=True))
+
     def makeMVDictTable(self, mv_table_cls=None):
         """
         Creates a MVDictTable.
@@ -68,14 +219,13 @@ class MVDictHypercube(MVDict):
         -------
         mv_table_cls
         """
-        class _SVDict(SVDict):
-            default_dct = self.default_dct
-        #
         class _MVDictTable(MVDictTable):
             default_dct = self.default_dct
             expansion_dct = self.expansion_dct
         #
         if mv_table_cls is None:
             mv_table_cls = _MVDictTable
-        sv_dicts = list(self.iterate(_SVDict, is_restart=True))
-        return mv_table_cls.makeFromSVDicts(mv_table_cls, sv_dicts)
+        column_dct = self._makeColumnDct()
+        dct = {k: column_dct[k].tolist() if k in column_dct else []
+              for k in mv_table_cls.default_dct.keys()}
+        return mv_table_cls(**dct)
@@ -22,15 +22,80 @@ class MVDictTable(MVDict):
     def __len__(self):
         return len(self[self.first_key])
 
-    def _next(self):
+    def _makeRowKey(self, dct):
+        """
+        Constructs the key of a row. Values are compared as strings as in
+        ElementalDict.equals.
+
+        Parameters
+        ----------
+        dct: dict (row)
+
+        Returns
+        -------
+        tuple-str
+        """
+        return tuple(str(dct[k]) for k in self.keys())
+
+    def _makeIndex(self):
+        """
+        Constructs the keys of the rows.
+
+        Returns
+        -------
+        set-tuple
+        """
+        return set(self._makeRowKey(d) for d in self._next())
+
+    def append(self, dct):
+        """
+        Appends a row and updates the index of rows.
+
+        Parameters
+        ----------
+        dct: dict
+            key: key to use
+            value: value to append
+        """
+        index = getattr(self, "_index", None)
+        super().append(dct)
+        if (index is not None) and all([k in dct.keys() for k in self.keys()]):
+            index.add(self._makeRowKey(dct))
+            self._index = index
+
+    def __contains__(self, sv_dict):
+        """
+        Tests if the SVDict is a row of the table.
+
+        Parameters
+        ----------
+        sv_dict: inherits from SVDict
+
+        Returns
+        -------
+        bool
+        """
+        if not self._isSameKeys(sv_dict):
+            return False
+        for key, value in sv_dict.items():
+            if (not key in self.keys())  \
+                  and (str(value) != str(sv_dict.default_dct[key])):
+                return False
+        return self._makeRowKey(sv_dict) in self._getIndex()
+
+    def _next(self, start_idx=0):
         """
         Iterator for lists of the same length.
 
+        Parameters
+        ----------
+        start_idx: int (index of the first row)
+
         Returns
         -------
         dict
         """
-        for idx in range(len(self[self.first_key])):
+        for idx in range(start_idx, len(self[self.first_key])):
             dct = {k: v[idx] for k, v in self.items()}
             yield dct
 
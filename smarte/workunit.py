@@ -4,20 +4,33 @@ import smarte.constants as cn
 from smarte.persister import Persister
 import smarte as smt
 from smarte.condition_collection import ConditionCollection
-from smarte.condition import Condition
+from smarte.condition import Condition, makeKey
+from smarte.condition_space import ConditionSpace
 from smarte.result_collection import ResultCollection
+from smarte.result_journal import ResultJournal
 from smarte.factor_collection import FactorCollection
+from smarte.types.elemental_dict import KEY_VALUE_SEP, LIST_BREAK
+from smarte.types.elemental_type import isList
 
+import hashlib
+import heapq
+import numpy as np
 import os
 
 WORKUNIT_FILE_PREFIX = "wu_"
+WORKUNIT_SEP = ";"  # Separates workunits on a line that are run in sequence
+FILENAME_HASH_LEN = 12  # Characters of the hash of levels in a file name
+SHARD_SUFFIX_PAT = "__shard-%d-of-%d"  # Added to the filename of a shard
+SHARD_CONTIGUOUS = "contiguous"  # Consecutive permitted conditions
+SHARD_COST = "cost"  # Conditions balanced by estimated cost
+SHARD_STRATEGIES = [SHARD_CONTIGUOUS, SHARD_COST]
 
 
 class Workunit(ConditionCollection):
 
     def __init__(self, result_collection=None, excluded_factor_collection=None,
           out_dir=cn.EXPERIMENT_DIR,
-          filename=None,
+          filename=None, shard_indices=None,
           **kwargs):
         """
         Parameters
@@ -26,6 +39,10 @@ class Workunit(ConditionCollection):
         excluded_factor_collection: FactorCollection
             factor levels to exclude from experiments
         out_dir: str (path to directory where files are found)
+        filename: str (name of files for the workunit without extension)
+        shard_indices: list-int
+            positions of the permitted conditions in this workunit
+            default: all permitted conditions
         kwargs: dict
             See cn.SD_CONDITIONS
         """
@@ -36,13 +53,192 @@ class Workunit(ConditionCollection):
         self.excluded_factor_collection = excluded_factor_collection
         if self.excluded_factor_collection is None:
             self.excluded_factor_collection = FactorCollection()
+        # Hypercube of the conditions that are not excluded
+        self.permitted_collection = self._makePermittedCollection()
+        self._position_dct = None  # Positions of levels. Created on first use.
+        self.shard_indices = shard_indices
+        if self.shard_indices is not None:
+            self.shard_indices = np.array(shard_indices, dtype=np.int64)
         self.out_dir = out_dir
         self.filename = filename
         if self.filename is None:
-            self.filename = WORKUNIT_FILE_PREFIX + str(self)
+            self.filename = self._makeFilename()
         self.persister_path = os.path.join(self.out_dir, "%s.pcl" % self.filename)
         # File for this workunit
         self.persister = Persister(self.persister_path)
+        # Results since the workunit was last saved
+        self.journal = ResultJournal(os.path.join(self.out_dir,
+              "%s.jsonl" % self.filename))
+
+    def _makeFilename(self):
+        """
+        Creates the name of the files of the workunit. If the string of the
+        workunit abbreviates lists of levels, a hash of all levels is added
+        so that different workunits have different files.
+
+        Returns
+        -------
+        str
+        """
+        stg = str(self)
+        if LIST_BREAK in stg:
+            level_stg = str(sorted([(k, sorted([str(v) for v in l]))
+                  if isList(l) else (k, str(l)) for k, l in self.kwargs.items()]))
+            level_hash = hashlib.sha256(level_stg.encode()).hexdigest()
+            stg = stg + KEY_VALUE_SEP + level_hash[:FILENAME_HASH_LEN]
+        return WORKUNIT_FILE_PREFIX + stg
+
+    def _makePermittedCollection(self):
+        """
+        Constructs the hypercube without the excluded levels of factors.
+
+        Returns
+        -------
+        ConditionCollection
+        """
+        dct = {}
+        for factor, levels in self.items():
+            excludes = self.excluded_factor_collection.get(factor, [])
+            if len(excludes) > 0:
+                excludes = set(excludes)
+                levels = [v for v in levels if not v in excludes]
+            dct[factor] = list(levels)
+        return ConditionCollection(**dct)
+
+    def __len__(self):
+        """
+        Number of permitted conditions in the workunit.
+
+        Returns
+        -------
+        int
+        """
+        if self.shard_indices is None:
+            return len(self.permitted_collection)
+        return len(self.shard_indices)
+
+    def __getitem__(self, key):
+        """
+        Provides the levels of a factor or the permitted conditions at
+        positions of the iteration.
+
+        Parameters
+        ----------
+        key: str/int/slice
+
+        Returns
+        -------
+        list if key is a str
+        dict if key is an int
+        list-dict if key is a slice
+        """
+        if isinstance(key, str):
+            return super().__getitem__(key)
+        if self.shard_indices is None:
+            return self.permitted_collection[key]
+        if isinstance(key, slice):
+            return [self.permitted_collection[int(i)]
+                  for i in self.shard_indices[key]]
+        return self.permitted_collection[int(self.shard_indices[key])]
+
+    def _getPermittedIndex(self, condition):
+        """
+        Finds the position of a permitted condition in the iteration of
+        permitted conditions. Levels are compared as strings.
+
+        Parameters
+        ----------
+        condition: Condition
+
+        Returns
+        -------
+        int
+        """
+        if self._position_dct is None:
+            self._position_dct = {f: {str(v): n for n, v in enumerate(l)}
+                  for f, l in self.permitted_collection.items()}
+        idx = 0
+        for factor, position_dct in self._position_dct.items():
+            idx = idx*len(position_dct) + position_dct[str(condition[factor])]
+        return idx
+
+    def __contains__(self, condition):
+        if not condition in self.permitted_collection:
+            return False
+        if self.shard_indices is None:
+            return True
+        idx = self._getPermittedIndex(condition)
+        pos = np.searchsorted(self.shard_indices, idx)
+        return (pos < len(self.shard_indices))  \
+              and (self.shard_indices[pos] == idx)
+
+    def _next(self, start_idx=0):
+        if self.shard_indices is None:
+            yield from self.permitted_collection._next(start_idx=start_idx)
+        else:
+            for idx in self.shard_indices[start_idx:]:
+                yield self.permitted_collection[int(idx)]
+
+    def shard(self, num_shard, strategy=SHARD_CONTIGUOUS, cost_fn=None,
+          cost_factors=None):
+        """
+        Partitions the permitted conditions into workunits. Each shard has
+        its own files, results, and iteration position. Costs are
+        calculated on the ConditionSpace of the permitted conditions.
+
+        Parameters
+        ----------
+        num_shard: int
+        strategy: str
+            SHARD_CONTIGUOUS: consecutive conditions of nearly equal number
+            SHARD_COST: conditions assigned to shards in decreasing cost
+                to the shard with the least total cost
+        cost_fn: Function
+            Parameters: Condition
+            Returns: float (estimated cost of running the condition)
+        cost_factors: list-str (factors that determine the cost)
+            default: all factors
+
+        Returns
+        -------
+        list-Workunit
+        """
+        if not strategy in SHARD_STRATEGIES:
+            raise ValueError("Invalid shard strategy: %s" % strategy)
+        if num_shard < 1:
+            raise ValueError("Must have at least one shard.")
+        if self.shard_indices is None:
+            indices = np.arange(len(self.permitted_collection), dtype=np.int64)
+        else:
+            indices = self.shard_indices
+        if strategy == SHARD_CONTIGUOUS:
+            shard_indices_lst = np.array_split(indices, num_shard)
+        else:
+            if cost_fn is None:
+                raise ValueError("Must provide cost_fn for strategy %s"
+                      % strategy)
+            space = ConditionSpace.makeFromConditionCollection(
+                  self.permitted_collection)
+            costs = space[indices].calcCosts(cost_fn, factors=cost_factors)
+            # Longest processing time first
+            heap = [(0.0, n) for n in range(num_shard)]
+            assignment_lst = [[] for _ in range(num_shard)]
+            for pos in np.argsort(costs, kind="stable")[::-1]:
+                load, shard_idx = heapq.heappop(heap)
+                assignment_lst[shard_idx].append(indices[pos])
+                heapq.heappush(heap, (load + costs[pos], shard_idx))
+            shard_indices_lst = [np.sort(np.array(a, dtype=np.int64))
+                  for a in assignment_lst]
+        # Shards have the same permitted conditions as this workunit
+        dct = {k: list(v) for k, v in self.items()}
+        workunits = []
+        for shard_idx, shard_indices in enumerate(shard_indices_lst):
+            filename = self.filename + SHARD_SUFFIX_PAT % (shard_idx, num_shard)
+            workunits.append(self.__class__(
+                  excluded_factor_collection=self.excluded_factor_collection,
+                  out_dir=self.out_dir, filename=filename,
+                  shard_indices=shard_indices, **dct))
+        return workunits
 
     def serialize(self):
         """
@@ -68,8 +264,64 @@ class Workunit(ConditionCollection):
         path = os.path.join(out_dir, filename)
         persister = Persister(path)
         data = persister.load()
+        data.recover()
         return data
 
+    def recover(self):
+        """
+        Restores the results in the journal that are not in the saved
+        workunit and the position of the iteration. Results are identified
+        by their conditions since a restart index is not the position of
+        its condition. The iteration restarts at the index of the last
+        record.
+        """
+        if not hasattr(self, "journal"):
+            # Saved before there were journals
+            self.journal = ResultJournal(os.path.join(self.out_dir,
+                  "%s.jsonl" % self.filename))
+        if not hasattr(self, "permitted_collection"):
+            # Saved before excluded levels were removed
+            self.permitted_collection = self._makePermittedCollection()
+        if not hasattr(self, "shard_indices"):
+            self.shard_indices = None
+        if not hasattr(self, "_position_dct"):
+            self._position_dct = None
+        keys = None
+        for iterate_idx, result in self.journal.iterateRecords():
+            if keys is None:
+                keys = set([makeKey(d) for d in self.result_collection._next()])
+            key = makeKey(result)
+            if not key in keys:
+                self.appendResult(result)
+                keys.add(key)
+            self.iterate_idx = iterate_idx
+
+    def journalResult(self, result, iterate_idx):
+        """
+        Adds the result and records it in the journal. This is much faster
+        than serializing the workunit.
+
+        Parameters
+        ----------
+        result: Result
+        iterate_idx: int (iteration index at which to restart)
+        """
+        self.appendResult(result)
+        self.journal.append(iterate_idx, result)
+
+    def compact(self):
+        """
+        Saves the workunit with the results in the journal, deletes the
+        journal, and writes the results.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        self.serialize()
+        self.journal.delete()
+        return self.makeResultCsv()
+
     def equals(self, workunit):
         """
         Tests if two workunits have the same conditions and results.
@@ -98,8 +350,8 @@ class Workunit(ConditionCollection):
 
     def iterate(self, is_restart=True):
         """
-        Iterates across all permitted conditions. Takes into account excluded
-        conditions.
+        Iterates across all permitted conditions. Excluded levels are not
+        in the hypercube that is iterated.
 
         Parameters
         ----------
@@ -109,9 +361,7 @@ class Workunit(ConditionCollection):
         -------
         Condition
         """
-        for condition in super().iterate(Condition, is_restart=is_restart):
-            if not condition in self.excluded_factor_collection:
-                yield condition
+        return super().iterate(Condition, is_restart=is_restart)
 
     @classmethod
     def getWorkunits(cls, out_dir=cn.EXPERIMENT_DIR):
@@ -166,7 +416,8 @@ class Workunit(ConditionCollection):
     @classmethod
     def makeWorkunitsFromFile(cls, path, **kwargs):
         """
-        Retrieves the workunits in a file.
+        Retrieves the workunits in a file. A line may have workunits
+        separated by WORKUNIT_SEP.
 
         Parameters
         ----------
@@ -181,6 +432,7 @@ class Workunit(ConditionCollection):
             lines = fd.readlines()
         workunit_strs = [l.strip() for l in lines]
         workunit_strs = [l for l in workunit_strs if l[0] != "#"]
+        workunit_strs = [w for l in workunit_strs for w in l.split(WORKUNIT_SEP)]
         #
         workunits = []
         for workunit_str in workunit_strs:
@@ -9,11 +9,21 @@
 
 import smarte as smt
 from smarte import constants as cn
+from smarte.completed_index import CompletedIndex, makeKey
+from smarte.condition import Condition
+from smarte.cost_model import COST_FACTORS
+from smarte.factor_collection import FactorCollection
+from smarte.model_cache import MODEL_CACHE
+from smarte.persister import Persister
 from smarte.result import Result
-from smarte.workunit import Workunit
+from smarte.workunit import Workunit, WORKUNIT_FILE_PREFIX,  \
+      SHARD_CONTIGUOUS, SHARD_COST, SHARD_STRATEGIES, WORKUNIT_SEP
 import SBMLModel as mdl
 
 import argparse
+import collections
+import concurrent.futures
+import numpy as np
 import os
 import pandas as pd
 import sys
@@ -26,33 +36,279 @@ NUM_REPLICATION = 3
 UNNAMED = "Unnamed:"
 BIOMODEL_EXCLUDE_PATH = os.path.join(cn.DATA_DIR, "biomodels_exclude.csv")
 BIOMODEL_EXCLUDE_DF = pd.read_csv(BIOMODEL_EXCLUDE_PATH)
-BIOMODEL_EXCLUDES = list(BIOMODEL_EXCLUDE_DF[cn.SD_BIOMODEL_NUM].values)
+BIOMODEL_EXCLUDES = [int(v) for v in BIOMODEL_EXCLUDE_DF[cn.SD_BIOMODEL_NUM].values]
 DUMMY_RESULT = {"a": 0.5, "b": 0.5}
 EXCLUDE_FACTOR_DCT = dict(biomodel_num=BIOMODEL_EXCLUDES)
 FINE_GRAIN_RESULT_PAT = "fine_grain_result-%d.csv"
+PENDING_FACTOR = 2  # Conditions submitted per worker process
+
+
+def runCondition(condition):
+    """
+    Runs the experiment for a condition. This is done in a worker process if
+    the WorkunitRunner uses multiple processes.
+
+    Parameters
+    ----------
+    condition: Condition
+
+    Returns
+    -------
+    Result
+    """
+    biomodel_num = condition[cn.SD_BIOMODEL_NUM]
+    result = smt.Result(**condition)
+    try:
+        model = MODEL_CACHE.get(biomodel_num)
+    except ValueError:
+        model = None
+    if model is None:
+        result[cn.SD_STATUS] = "Cannot create model."
+        return result
+    observed_ts = WorkunitRunner.getTimeseries(biomodel_num,
+          condition[cn.SD_NOISE_MAG], condition[cn.SD_TS_INSTANCE])
+    try:
+        dct = smt.SBMLFitter.evaluateBiomodelFit(
+              model, observed_ts,
+              range_min_frac=condition[cn.SD_RANGE_MIN_FRAC],
+              range_max_frac=condition[cn.SD_RANGE_MAX_FRAC],
+              latincube_idx=condition[cn.SD_LATINCUBE_IDX],
+              method_names=condition[cn.SD_METHOD],
+              max_fev=condition[cn.SD_MAX_FEV],
+              )
+    except (ValueError, RuntimeError) as exp1:
+        result[cn.SD_STATUS] = str(exp1)
+        return result
+    for key in cn.SD_CACHE_METRICS:
+        _ = dct.pop(key, None)
+    dct.update(condition)
+    return Result(**dct)
+
+def parseShard(shard_stg):
+    """
+    Parses the specification of a shard of a workunit.
+
+    Parameters
+    ----------
+    shard_stg: str ("<shard index>/<number of shards>")
+
+    Returns
+    -------
+    int (shard index)
+    int (number of shards)
+    """
+    parts = shard_stg.split("/")
+    try:
+        shard_idx, num_shard = [int(p) for p in parts]
+    except ValueError:
+        raise ValueError("Invalid shard: %s" % shard_stg)
+    if (shard_idx < 0) or (shard_idx >= num_shard):
+        raise ValueError("Invalid shard: %s" % shard_stg)
+    return shard_idx, num_shard
 
 
 class WorkunitRunner(object):
 
-    def __init__(self, workunit):
+    def __init__(self, workunit, max_workers=1, cost_model=None,
+          completed_index=None):
         """
         Parameters
         ----------
         workunit: Workunit
-        directory: str (directory for file output)
-        exclude_factor_dct: dict (any condition with a factor value is excluded)
-             key: factor
-             value: list-levels
-        out_path: str (path where results are stored)
+        max_workers: int (number of processes that run conditions)
+            None: number of CPUs
+        cost_model: CostModel (used to report the estimated time remaining)
+        completed_index: CompletedIndex
+            conditions completed or being run by other runners are skipped
         """
         self.workunit = workunit
+        self.cost_model = cost_model
+        self.completed_index = completed_index
+        self.claimed_dct = {}  # Claimed conditions without results
+        # Conditions claimed by other runners and their iteration indices
+        self.deferred_dct = {}
+        self.next_idx = 0  # Index after the last condition with a result
+        self.remaining_time = None  # Predicted seconds for remaining conditions
         self.multivalued_factors = self.workunit.calcMultivaluedFactors()
+        num_cpu = os.cpu_count()
+        if max_workers is None:
+            max_workers = num_cpu
+        self.max_workers = max(1, min(max_workers, num_cpu))
+
+    def _initializeRemainingTime(self):
+        """
+        Predicts the time for the conditions that have not been run.
+        """
+        if self.cost_model is None:
+            return
+        conditions = [Condition(**d)
+              for d in self.workunit[self.workunit.iterate_idx:]]
+        self.remaining_time = float(np.sum(
+              self.cost_model.predictMany(conditions)))
+
+    def _updateRemainingTime(self, condition):
+        if self.remaining_time is not None:
+            self.remaining_time = max(0.0,
+                  self.remaining_time - self.cost_model.predict(condition))
 
     def _writeMessage(self, condition, status, is_report):
+        self._updateRemainingTime(condition)
         if is_report:
             stgs = ["%s=%s" % (k, str(condition[k])) for k in self.multivalued_factors]
             stg = ", ".join(stgs)
-            print("***%s: %s" % (stg, status))
+            if self.remaining_time is None:
+                print("***%s: %s" % (stg, status))
+            else:
+                eta = self.remaining_time/self.max_workers
+                print("***%s: %s (ETA %d sec)" % (stg, status, eta))
+
+    def _claim(self, iterate_idx, condition):
+        """
+        Claims a condition in the completed index. A condition that is
+        claimed by another runner but not completed is deferred.
+
+        Parameters
+        ----------
+        iterate_idx: int (iteration index of the condition)
+        condition: Condition
+
+        Returns
+        -------
+        bool (True if this runner should run the condition)
+        """
+        key = makeKey(condition)
+        if self.completed_index.claim(condition):
+            _ = self.deferred_dct.pop(key, None)
+            self.claimed_dct[key] = condition
+            return True
+        if self.completed_index.isCompleted(condition):
+            _ = self.deferred_dct.pop(key, None)
+            self._updateRemainingTime(condition)
+        else:
+            self.deferred_dct[key] = (iterate_idx, condition)
+        return False
+
+    def _iterateConditions(self):
+        """
+        Iterates on the conditions of the workunit that are not completed or
+        being run by another runner. Conditions are claimed in the
+        completed index. Deferred conditions are checked again at the end
+        since their claims may have been released.
+
+        Returns
+        -------
+        int (iteration index of the condition)
+        Condition
+        """
+        for condition in self.workunit.iterate(is_restart=False):
+            iterate_idx = self.workunit.iterate_idx
+            if self.completed_index is not None:
+                if not self._claim(iterate_idx, condition):
+                    continue
+            yield iterate_idx, condition
+        for iterate_idx, condition in list(self.deferred_dct.values()):
+            if self._claim(iterate_idx, condition):
+                yield iterate_idx, condition
+
+    def _updateRestartIdx(self, iterate_idx):
+        """
+        Finds where a restart begins after the result of a condition. A
+        restart does not skip deferred conditions, which may not get results
+        from other runners. Deferred conditions run at the end do not move
+        the restart back.
+
+        Parameters
+        ----------
+        iterate_idx: int (iteration index of the condition)
+
+        Returns
+        -------
+        int
+        """
+        self.next_idx = max(self.next_idx, iterate_idx + 1)
+        idxs = [i for i, _ in self.deferred_dct.values()]
+        return min(idxs + [self.next_idx])
+
+    def _recordResult(self, iterate_idx, condition, result, is_report=True):
+        """
+        Journals the result of a condition and records that the condition
+        is completed.
+
+        Parameters
+        ----------
+        iterate_idx: int (iteration index of the condition)
+        condition: Condition
+        result: Result
+        is_report: bool (report progress)
+        """
+        self.workunit.journalResult(result, self._updateRestartIdx(iterate_idx))
+        self._completeCondition(condition)
+        self._writeMessage(condition, result[cn.SD_STATUS], is_report=is_report)
+
+    def _completeCondition(self, condition):
+        """
+        Records that a claimed condition has a result.
+
+        Parameters
+        ----------
+        condition: Condition
+        """
+        if self.completed_index is not None:
+            self.completed_index.complete(condition)
+            _ = self.claimed_dct.pop(makeKey(condition), None)
+
+    def _releaseClaims(self):
+        """
+        Releases the claims of conditions that do not have results.
+        """
+        for condition in self.claimed_dct.values():
+            self.completed_index.release(condition)
+        self.claimed_dct = {}
+
+    def _iterateResults(self):
+        """
+        Runs the conditions in this process.
+
+        Returns
+        -------
+        int (iteration index of the condition)
+        Condition
+        Result
+        """
+        for iterate_idx, condition in self._iterateConditions():
+            yield iterate_idx, condition, runCondition(condition)
+
+    def _iterateParallelResults(self):
+        """
+        Runs the conditions in a pool of processes. Results are provided in the
+        order of the conditions. The number of conditions submitted is bounded
+        so that results are not accumulated in memory.
+
+        Returns
+        -------
+        int (iteration index of the condition)
+        Condition
+        Result
+        """
+        max_pending = PENDING_FACTOR*self.max_workers
+        pendings = collections.deque()
+        with concurrent.futures.ProcessPoolExecutor(
+              max_workers=self.max_workers) as executor:
+            try:
+                for iterate_idx, condition in self._iterateConditions():
+                    future = executor.submit(runCondition, condition)
+                    pendings.append((iterate_idx, condition, future))
+                    if len(pendings) >= max_pending:
+                        iterate_idx, condition, future = pendings.popleft()
+                        yield iterate_idx, condition, future.result()
+                while len(pendings) > 0:
+                    iterate_idx, condition, future = pendings.popleft()
+                    yield iterate_idx, condition, future.result()
+            except BaseException:
+                # Interrupted. Don't start the remaining conditions.
+                for _, _, future in pendings:
+                    future.cancel()
+                raise
 
     def run(self, is_report=True):
         """
@@ -71,41 +327,27 @@ class WorkunitRunner(object):
         # Iterate on conditions specified in the Workunit.
         # If there is an interruption and the calculation is restarted,
         # continue from where left off.
-        for condition in self.workunit.iterate(is_restart=False):
-            # Setup to run the experiment
-            biomodel_num = condition[cn.SD_BIOMODEL_NUM]
-            result = smt.Result(**condition)
-            try:
-                model = mdl.Model.getBiomodel(biomodel_num)
-            except ValueError:
-                model = None
-            if model is None:
-                result[cn.SD_STATUS] = "Cannot create model."
-                self.workunit.appendResult(result)
-            # Assign the qualifiers
-            else:
-                observed_ts = self.getTimeseries(biomodel_num,
-                      condition[cn.SD_NOISE_MAG], condition[cn.SD_TS_INSTANCE])
-                try:
-                   dct = smt.SBMLFitter.evaluateBiomodelFit(
-                          biomodel_num, observed_ts,
-                          range_min_frac=condition[cn.SD_RANGE_MIN_FRAC],
-                          range_max_frac=condition[cn.SD_RANGE_MAX_FRAC],
-                          latincube_idx=condition[cn.SD_LATINCUBE_IDX],
-                          method_names=condition[cn.SD_METHOD],
-                          max_fev=condition[cn.SD_MAX_FEV],
-                          )
-                except (ValueError, RuntimeError) as exp1:
-                    result[cn.SD_STATUS] = str(exp1)
-                dct.update(condition)
-                result = Result(**dct)
-                self.workunit.appendResult(result)
-                # Accumulate results
-            # Save the results
-            self.workunit.serialize()
-            df = self.workunit.makeResultCsv()
-            #
-            self._writeMessage(condition, result[cn.SD_STATUS], is_report=is_report)
+        # Results are journaled so that the workunit is saved only at the
+        # beginning and the end.
+        self.workunit.recover()
+        self.workunit.serialize()
+        self._initializeRemainingTime()
+        if self.max_workers == 1:
+            iterator = self._iterateResults()
+        else:
+            iterator = self._iterateParallelResults()
+        try:
+            for iterate_idx, condition, result in iterator:
+                self._recordResult(iterate_idx, condition, result,
+                      is_report=is_report)
+        except BaseException:
+            # Other runners can run the conditions without results
+            if self.completed_index is not None:
+                self._releaseClaims()
+            raise
+        df = self.workunit.compact()
+        if is_report and (self.max_workers == 1):
+            print("***Model cache: %s" % str(MODEL_CACHE.getStatistics()))
         # Handle the missing models
         return df
 
@@ -138,23 +380,63 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Runs simulations for a workunit.")
     parser.add_argument("workunit_str", type=str,
           help="workunit in string representation")
+    parser.add_argument("--max_workers", type=int, default=1,
+          help="number of processes that run conditions")
+    parser.add_argument("--cost_model_path", type=str, default=None,
+          help="saved CostModel used to report the estimated time remaining")
+    parser.add_argument("--completed_index_path", type=str,
+          default=cn.COMPLETED_INDEX_PATH,
+          help="index of conditions completed or being run by any runner")
+    parser.add_argument("--no_completed_index", action="store_true",
+          help="run conditions even if other runners have completed them")
+    parser.add_argument("--shard", type=str, default=None,
+          help="run only shard i of n of the workunit, specified as i/n")
+    parser.add_argument("--shard_strategy", type=str, default=SHARD_CONTIGUOUS,
+          choices=SHARD_STRATEGIES,
+          help="how conditions are assigned to shards (%s needs --cost_model_path)"
+          % SHARD_COST)
     args = parser.parse_args()
-    for key in cn.SD_CONDITIONS:
-        if not key in args.workunit_str:
-            print("*** Input Error. Workunit is missing '%s'." % key)
-            sys.exit(-1)
-    # Recover the workunit if it exists
-    try:
-        a_workunit = Workunit.deserialize(args.workunit_str, out_dir=cn.EXPERIMENT_DIR)
-    except Exception as exp:
-        # Not present. Create a new workunit.
+    if (args.shard_strategy == SHARD_COST) and (args.cost_model_path is None):
+        parser.error("--shard_strategy %s requires --cost_model_path" % SHARD_COST)
+    workunit_strs = args.workunit_str.split(WORKUNIT_SEP)
+    for workunit_str in workunit_strs:
+        for key in cn.SD_CONDITIONS:
+            if not key in workunit_str:
+                print("*** Input Error. Workunit is missing '%s'." % key)
+                sys.exit(-1)
+    cost_model = None
+    if args.cost_model_path is not None:
+        cost_model = Persister(args.cost_model_path).load()
+    # Workunits in the same string are run in sequence
+    for workunit_str in workunit_strs:
         try:
-            a_workunit = Workunit.makeFromStr(args.workunit_str)
+            a_workunit = Workunit.makeFromStr(workunit_str,
+                  excluded_factor_collection=FactorCollection(
+                  **EXCLUDE_FACTOR_DCT))
         except Exception as exp1:
             print(exp1)
             raise ValueError("*** Input Error: Bad workunit string: %s"
-                  % args.workunit_str)
-    #
-    runner = WorkunitRunner(a_workunit)
-    _ = runner.run()
-    print("\n***COMPLETED %s" % args.workunit_str)
+                  % workunit_str)
+        if args.shard is not None:
+            shard_idx, num_shard = parseShard(args.shard)
+            cost_fn = None if cost_model is None else cost_model.predict
+            a_workunit = a_workunit.shard(num_shard,
+                  strategy=args.shard_strategy, cost_fn=cost_fn,
+                  cost_factors=COST_FACTORS)[shard_idx]
+        # Recover the workunit if it exists. The file name abbreviates long
+        # lists of levels in the workunit string.
+        if a_workunit.persister.isExist():
+            a_workunit = Workunit.deserialize(
+                  a_workunit.filename[len(WORKUNIT_FILE_PREFIX):],
+                  out_dir=cn.EXPERIMENT_DIR)
+        # Claims are owned by the workunit so that a restart takes them back
+        completed_index = None
+        if not args.no_completed_index:
+            completed_index = CompletedIndex(path=args.completed_index_path,
+                  owner=a_workunit.filename)
+        runner = WorkunitRunner(a_workunit, max_workers=args.max_workers,
+              cost_model=cost_model, completed_index=completed_index)
+        _ = runner.run()
+        if completed_index is not None:
+            completed_index.close()
+        print("\n***COMPLETED %s" % workunit_str)
@@ -0,0 +1,129 @@
+from smarte import completed_index as ci
+from smarte.completed_index import CompletedIndex
+from smarte.condition import Condition
+from smarte.condition_collection import ConditionCollection
+import smarte.constants as cn
+
+from io import StringIO
+import multiprocessing
+import os
+import pandas as pd
+import unittest
+
+IGNORE_TEST = False
+IS_PLOT = False
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_PATH = os.path.join(TEST_DIR, "test_completed_index.db")
+COLLECTION = ConditionCollection(biomodel_num=list(range(1, 21)),
+      ts_instance=[1, 2], latincube_idx=[1], noise_mag=0.1)
+CONDITIONS = list(COLLECTION.iterate(Condition))
+NUM_PROCESS = 4
+
+
+def _claimAll(path):
+    # Claims conditions in another process
+    index = CompletedIndex(path=path)
+    keys = [ci.makeKey(c) for c in CONDITIONS if index.claim(c)]
+    index.close()
+    return keys
+
+
+#############################
+# Tests
+#############################
+class TestCompletedIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.remove()
+        self.index = CompletedIndex(path=TEST_PATH)
+
+    def tearDown(self):
+        self.index.close()
+        self.remove()
+
+    def remove(self):
+        for suffix in ["", "-wal", "-shm"]:
+            path = TEST_PATH + suffix
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def testMakeKey(self):
+        if IGNORE_TEST:
+            return
+        condition = CONDITIONS[0]
+        dct = dict(condition)
+        dct[cn.SD_BIOMODEL_NUM] = float(dct[cn.SD_BIOMODEL_NUM])
+        self.assertEqual(ci.makeKey(dct), ci.makeKey(condition))
+        self.assertNotEqual(ci.makeKey(CONDITIONS[1]), ci.makeKey(condition))
+
+    def testClaimComplete(self):
+        if IGNORE_TEST:
+            return
+        condition = CONDITIONS[0]
+        other_index = CompletedIndex(path=TEST_PATH)
+        other_index.owner = "other"
+        self.assertTrue(self.index.claim(condition))
+        self.assertFalse(other_index.claim(condition))
+        self.assertFalse(condition in self.index)
+        # Only the owner releases a claim
+        other_index.release(condition)
+        self.assertFalse(other_index.claim(condition))
+        self.index.release(condition)
+        self.assertTrue(other_index.claim(condition))
+        other_index.complete(condition)
+        self.assertTrue(condition in self.index)
+        self.assertEqual(len(self.index), 1)
+        self.assertFalse(self.index.claim(condition))
+        other_index.close()
+
+    def testStaleClaim(self):
+        if IGNORE_TEST:
+            return
+        condition = CONDITIONS[0]
+        other_index = CompletedIndex(path=TEST_PATH, claim_timeout=-1)
+        other_index.owner = "other"
+        self.assertTrue(self.index.claim(condition))
+        self.assertTrue(other_index.claim(condition))
+        other_index.complete(condition)
+        self.assertFalse(other_index.claim(condition))
+        other_index.close()
+
+    def testOwnerClaim(self):
+        if IGNORE_TEST:
+            return
+        condition = CONDITIONS[0]
+        index = CompletedIndex(path=TEST_PATH, owner="wu_a")
+        self.assertTrue(index.claim(condition))
+        index.close()
+        # A restarted runner takes back its claims
+        restarted_index = CompletedIndex(path=TEST_PATH, owner="wu_a")
+        self.assertTrue(restarted_index.claim(condition))
+        self.assertFalse(self.index.claim(condition))
+        restarted_index.close()
+
+    def testAddResults(self):
+        if IGNORE_TEST:
+            return
+        df = pd.DataFrame([dict(c) for c in CONDITIONS[:5]])
+        # Values read from files
+        df = pd.read_csv(StringIO(df.to_csv(index=False)))
+        df[cn.SD_BIOMODEL_NUM] = df[cn.SD_BIOMODEL_NUM].astype(float)
+        self.assertEqual(self.index.addResults(df), 5)
+        self.assertEqual(len(self.index), 5)
+        self.assertTrue(CONDITIONS[4] in self.index)
+        self.assertFalse(CONDITIONS[5] in self.index)
+        self.assertEqual(self.index.addResults(pd.DataFrame()), 0)
+
+    def testConcurrentClaims(self):
+        if IGNORE_TEST:
+            return
+        self.index.close()
+        with multiprocessing.Pool(NUM_PROCESS) as pool:
+            key_lsts = pool.map(_claimAll, [TEST_PATH]*NUM_PROCESS)
+        keys = [k for l in key_lsts for k in l]
+        self.assertEqual(len(keys), len(CONDITIONS))
+        self.assertEqual(len(set(keys)), len(CONDITIONS))
+
+
+if __name__ == '__main__':
+  unittest.main()
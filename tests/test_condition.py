@@ -1,4 +1,4 @@
-from smarte.condition import Condition
+from smarte.condition import Condition, FrozenCondition
 import smarte.constants as cn
 
 import os
@@ -32,6 +32,15 @@ class TestCondition(unittest.TestCase):
         new_condition = Condition(**condition)
         self.assertFalse(new_condition.equals(self.condition))
         self.assertTrue(isinstance(new_condition, Condition))
+
+    def testFreeze(self):
+        if IGNORE_TEST:
+            return
+        frozen = self.condition.freeze()
+        self.assertTrue(isinstance(frozen, FrozenCondition))
+        self.assertEqual(str(frozen), str(self.condition))
+        self.assertTrue(frozen in set([self.condition.copy().freeze()]))
+        self.assertTrue(frozen.thaw().equals(self.condition))
         
 
 if __name__ == '__main__':
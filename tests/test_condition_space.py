@@ -0,0 +1,99 @@
+from smarte.condition import Condition
+from smarte.condition_collection import ConditionCollection
+from smarte.condition_space import ConditionSpace
+from smarte.factor_collection import FactorCollection
+from smarte.workunit import Workunit
+import smarte.constants as cn
+
+import numpy as np
+import unittest
+
+IGNORE_TEST = False
+IS_PLOT = False
+BIOMODEL_NUMS = list(range(1, 21))
+TS_INSTANCES = [1, 2, 3]
+LATINCUBE_IDXS = [1, 2]
+
+
+#############################
+# Tests
+#############################
+class TestConditionSpace(unittest.TestCase):
+
+    def setUp(self):
+        self.collection = ConditionCollection(biomodel_num=BIOMODEL_NUMS,
+              ts_instance=TS_INSTANCES, latincube_idx=LATINCUBE_IDXS)
+        self.space = ConditionSpace.makeFromConditionCollection(
+              self.collection)
+
+    def testConstructor(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(len(self.space), len(self.collection))
+        self.assertEqual(self.space.code_arr.shape,
+              (len(self.collection), len(cn.SD_CONDITIONS)))
+        # No factors
+        space = ConditionSpace({})
+        self.assertEqual(len(space), 0)
+        self.assertEqual(len(space.shard(2)[0]), 0)
+        self.assertEqual(len(space.calcCosts(lambda c: 1.0)), 0)
+
+    def testGetCondition(self):
+        if IGNORE_TEST:
+            return
+        conditions = list(self.collection.iterate(Condition))
+        for idx in [0, 7, len(conditions) - 1]:
+            condition = self.space[idx]
+            self.assertTrue(isinstance(condition, Condition))
+            self.assertTrue(condition.equals(conditions[idx]))
+        trues = [c.equals(d) for c, d in zip(self.space.iterate(), conditions)]
+        self.assertTrue(all(trues))
+
+    def testSelectExclude(self):
+        if IGNORE_TEST:
+            return
+        space = self.space.select(biomodel_num=[2, 3], ts_instance=[1])
+        self.assertEqual(len(space), 2*len(LATINCUBE_IDXS))
+        self.assertEqual(set(space.getValues(cn.SD_BIOMODEL_NUM)), set([2, 3]))
+        #
+        factor_collection = FactorCollection(biomodel_num=[1, 2], ts_instance=[3])
+        space = self.space.exclude(factor_collection)
+        workunit = Workunit(excluded_factor_collection=factor_collection,
+              **self.collection)
+        conditions = list(workunit.iterate())
+        self.assertEqual(len(space), len(conditions))
+        trues = [c.equals(d) for c, d in zip(space.iterate(), conditions)]
+        self.assertTrue(all(trues))
+
+    def testShard(self):
+        if IGNORE_TEST:
+            return
+        spaces = self.space.shard(7)
+        self.assertEqual(len(spaces), 7)
+        code_arr = np.concatenate([s.code_arr for s in spaces])
+        self.assertTrue(np.array_equal(code_arr, self.space.code_arr))
+        sizes = [len(s) for s in spaces]
+        self.assertLessEqual(max(sizes) - min(sizes), 1)
+
+    def testCalcCosts(self):
+        if IGNORE_TEST:
+            return
+        cost_fn = lambda c: c[cn.SD_BIOMODEL_NUM]*c[cn.SD_TS_INSTANCE]
+        expected_arr = np.array([cost_fn(c) for c in self.space.iterate()])
+        self.assertTrue(np.allclose(self.space.calcCosts(cost_fn),
+              expected_arr))
+        space = self.space.select(ts_instance=[2])
+        costs = space.calcCosts(cost_fn, factors=[cn.SD_BIOMODEL_NUM])
+        self.assertTrue(np.allclose(costs, 2*space.getValues(
+              cn.SD_BIOMODEL_NUM).astype(float)))
+        # Conditions are constructed once for each level of the factors
+        conditions = []
+        def countingCost(condition):
+            conditions.append(condition)
+            return 1.0
+        _ = self.space.calcCosts(countingCost, factors=[cn.SD_TS_INSTANCE])
+        self.assertEqual(len(conditions), len(TS_INSTANCES))
+
+
+if __name__ == '__main__':
+  unittest.main()
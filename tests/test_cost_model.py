@@ -0,0 +1,87 @@
+from smarte.condition import Condition
+from smarte.cost_model import CostModel
+import smarte.constants as cn
+
+import numpy as np
+import os
+import pandas as pd
+import unittest
+
+IGNORE_TEST = False
+IS_PLOT = False
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_CSV = os.path.join(TEST_DIR, "analysis", "test_experiment_provider.csv")
+NUM_RESULT = 200
+
+
+def _makeResultDf():
+    # Times that are exactly log-linear in the descriptors
+    np.random.seed(0)
+    dct = {
+          cn.SD_BIOMODEL_NUM: np.random.randint(1, 50, NUM_RESULT),
+          cn.SD_MAX_FEV: np.random.choice([100, 1000, 10000], NUM_RESULT),
+          cn.SD_METHOD: np.random.choice([cn.METHOD_LEASTSQ,
+                cn.METHOD_DIFFERENTIAL_EVOLUTION], NUM_RESULT),
+          cn.SD_STATUS: cn.SD_STATUS_SUCCESS,
+          }
+    df = pd.DataFrame(dct)
+    for num, descriptor in enumerate(cn.SD_MODEL_DESCRIPTORS):
+        df[descriptor] = df[cn.SD_BIOMODEL_NUM]*(num + 1)
+    log_time = 0.5*np.log1p(df[cn.SD_NUM_PARAMETER])  \
+          + np.log(df[cn.SD_MAX_FEV])  \
+          + (df[cn.SD_METHOD] == cn.METHOD_DIFFERENTIAL_EVOLUTION)*2 - 8
+    df[cn.SD_TOT_TIME] = np.exp(log_time)
+    return df
+
+
+#############################
+# Tests
+#############################
+class TestCostModel(unittest.TestCase):
+
+    def setUp(self):
+        self.df = _makeResultDf()
+        self.cost_model = CostModel.makeFromDataframe(self.df)
+
+    def testPredict(self):
+        if IGNORE_TEST:
+            return
+        conditions = [Condition(**r) for r in
+              self.df[[cn.SD_BIOMODEL_NUM, cn.SD_MAX_FEV, cn.SD_METHOD]
+              ].to_dict("records")]
+        times = self.cost_model.predictMany(conditions)
+        np.testing.assert_allclose(times, self.df[cn.SD_TOT_TIME].values,
+              rtol=1e-6)
+        self.assertAlmostEqual(self.cost_model.predict(conditions[0]),
+              times[0])
+        # Unknown models and methods have a prediction
+        condition = Condition(biomodel_num=1000, method="other")
+        self.assertGreater(self.cost_model.predict(condition), 0)
+
+    def testOrderLongestFirst(self):
+        if IGNORE_TEST:
+            return
+        conditions = [Condition(biomodel_num=1, max_fev=f,
+              method=cn.METHOD_LEASTSQ) for f in [100, 10000, 1000]]
+        ordered = self.cost_model.orderLongestFirst(conditions)
+        self.assertEqual([c[cn.SD_MAX_FEV] for c in ordered],
+              [10000, 1000, 100])
+        times = self.cost_model.predictMany(conditions)
+        self.assertAlmostEqual(
+              self.cost_model.estimateRemainingTime(conditions), sum(times))
+        self.assertAlmostEqual(self.cost_model.estimateRemainingTime(
+              conditions, num_worker=3), max(times))
+        self.assertEqual(self.cost_model.estimateRemainingTime([]), 0)
+
+    def testMakeFromCsvs(self):
+        if IGNORE_TEST:
+            return
+        cost_model = CostModel.makeFromCsvs([TEST_CSV])
+        condition = Condition(biomodel_num=1, max_fev=10000)
+        self.assertGreater(cost_model.predict(condition), 0)
+        with self.assertRaises(ValueError):
+            _ = CostModel.makeFromDataframe(self.df[self.df[cn.SD_MAX_FEV] < 0])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,74 @@
+from smarte.lru_cache import LRUCache
+import smarte.lru_cache as lru
+
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MAX_SIZE = 3
+
+
+#############################
+# Tests
+#############################
+class TestLRUCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = LRUCache(max_size=MAX_SIZE)
+
+    def testConstructor(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(len(self.cache), 0)
+        with self.assertRaises(ValueError):
+            _ = LRUCache(max_size=0)
+
+    def testGetPut(self):
+        if IGNORE_TEST:
+            return
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.put("a", 1)
+        self.assertEqual(self.cache.get("a"), 1)
+        dct = self.cache.getStatistics()
+        self.assertEqual(dct[lru.HITS], 1)
+        self.assertEqual(dct[lru.MISSES], 1)
+        self.assertEqual(dct[lru.EVICTIONS], 0)
+
+    def testEviction(self):
+        if IGNORE_TEST:
+            return
+        for idx in range(MAX_SIZE):
+            self.cache.put(idx, idx)
+        # Make 0 the most recently used
+        _ = self.cache.get(0)
+        self.cache.put(MAX_SIZE, MAX_SIZE)
+        self.assertEqual(len(self.cache), MAX_SIZE)
+        self.assertTrue(0 in self.cache)
+        self.assertFalse(1 in self.cache)
+        self.assertEqual(self.cache.getStatistics()[lru.EVICTIONS], 1)
+
+    def testSizeFunc(self):
+        if IGNORE_TEST:
+            return
+        cache = LRUCache(max_size=10, size_func=lambda v: len(v))
+        cache.put("a", "x"*6)
+        cache.put("b", "x"*6)
+        self.assertFalse("a" in cache)
+        self.assertEqual(cache.size, 6)
+        # Values larger than the cache are not stored
+        cache.put("c", "x"*11)
+        self.assertFalse("c" in cache)
+
+    def testClear(self):
+        if IGNORE_TEST:
+            return
+        self.cache.put("a", 1)
+        _ = self.cache.get("a")
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.getStatistics()[lru.HITS], 0)
+
+
+if __name__ == '__main__':
+  unittest.main()
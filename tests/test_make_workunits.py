@@ -0,0 +1,101 @@
+import smarte.constants as cn
+from smarte.multi_experiment_condition import MultiExperimentCondition
+from smarte.workunit import Workunit
+
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+
+IGNORE_TEST = False
+IS_PLOT = False
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(TEST_DIR)
+TOOLS_DIR = os.path.join(PROJECT_DIR, "tools")
+sys.path.insert(0, TOOLS_DIR)
+import make_workunits as mw
+RESULT_DIR = os.path.join(TEST_DIR, "test_make_workunits")
+WORKUNITS_PATH = os.path.join(RESULT_DIR, "workunits.txt")
+NUM_MODEL = 10
+LEVEL_DCT = {cn.SD_BIOMODEL_NUM: list(range(1, NUM_MODEL + 1)),
+      cn.SD_TS_INSTANCE: [1, 2, 3], cn.SD_LATINCUBE_IDX: [1]}
+NUM_CONDITION = 3*NUM_MODEL
+
+
+#############################
+# Tests
+#############################
+class TestMakeWorkunits(unittest.TestCase):
+
+    def setUp(self):
+        self.remove()
+        os.makedirs(RESULT_DIR)
+        self.multi_condition = MultiExperimentCondition.makeFromDct(LEVEL_DCT)
+
+    def tearDown(self):
+        self.remove()
+
+    def remove(self):
+        if os.path.isdir(RESULT_DIR):
+            shutil.rmtree(RESULT_DIR)
+
+    def _readWorkunits(self):
+        with open(WORKUNITS_PATH, "r") as fd:
+            lines = fd.read().split("\n")
+        workunit_lsts = [[Workunit.makeFromStr(s, out_dir=RESULT_DIR)
+              for s in l.split(mw.WORKUNIT_SEP)] for l in lines]
+        return workunit_lsts
+
+    def testPlanWorkunits(self):
+        if IGNORE_TEST:
+            return
+        # Boxes are split on more than one factor
+        box_lsts, costs = mw.planWorkunits(self.multi_condition, 4)
+        self.assertEqual(len(box_lsts), 4)
+        self.assertEqual(sorted(costs), [7, 7, 8, 8])
+        # Workers are not left idle while conditions can be split
+        box_lsts, costs = mw.planWorkunits(self.multi_condition, 100)
+        self.assertEqual(len(box_lsts), NUM_CONDITION)
+        # Costs of conditions
+        cost_fn = lambda c: c[cn.SD_BIOMODEL_NUM]
+        box_lsts, costs = mw.planWorkunits(self.multi_condition, 4,
+              cost_fn=cost_fn)
+        self.assertEqual(sum(costs), 3*sum(LEVEL_DCT[cn.SD_BIOMODEL_NUM]))
+        self.assertLess(max(costs) - min(costs), NUM_MODEL)
+
+    def testMain(self):
+        if IGNORE_TEST:
+            return
+        workunit_strs, costs = mw.main(LEVEL_DCT, 4, path=WORKUNITS_PATH,
+              result_dir=RESULT_DIR, is_exclude=False)
+        self.assertEqual(len(workunit_strs), 4)
+        workunit_lsts = self._readWorkunits()
+        self.assertEqual(len(workunit_lsts), 4)
+        condition_strs = [str(c) for l in workunit_lsts for w in l
+              for c in w.iterate()]
+        self.assertEqual(len(condition_strs), NUM_CONDITION)
+        self.assertEqual(len(set(condition_strs)), NUM_CONDITION)
+
+    def testCommandLine(self):
+        if IGNORE_TEST:
+            return
+        python_path = os.pathsep.join([PROJECT_DIR]
+              + [p for p in [os.environ.get("PYTHONPATH")] if p])
+        env = dict(os.environ, PYTHONPATH=python_path)
+        script = os.path.join(TOOLS_DIR, "make_workunits.py")
+        result = subprocess.run([sys.executable, script, "--help"],
+              capture_output=True, text=True, env=env)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        args = [sys.executable, script, "--num_worker", "4",
+              "--path", WORKUNITS_PATH, "--result_dir", RESULT_DIR,
+              "--no_exclude", "--ts_instance", "1", "2", "3",
+              "--latincube_idx", "1", "--biomodel_num"]  \
+              + [str(n) for n in LEVEL_DCT[cn.SD_BIOMODEL_NUM]]
+        result = subprocess.run(args, capture_output=True, text=True, env=env)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(len(self._readWorkunits()), 4)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,69 @@
+from smarte.model_cache import ModelCache, estimateModelMemory
+import smarte.lru_cache as lru
+import SBMLModel as mdl
+
+import numpy as np
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+BIOMODEL_NUM = 12
+# Cache has space for either model but not both
+MAX_MEMORY = max([estimateModelMemory(mdl.Model.getBiomodel(n))
+      for n in [BIOMODEL_NUM, BIOMODEL_NUM + 1]])
+
+
+#############################
+# Tests
+#############################
+class TestModelCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ModelCache(max_size=MAX_MEMORY)
+
+    def testGet(self):
+        if IGNORE_TEST:
+            return
+        model = self.cache.get(BIOMODEL_NUM)
+        self.assertTrue("Model" in str(type(model)))
+        model2 = self.cache.get(BIOMODEL_NUM)
+        self.assertTrue(model is model2)
+        dct = self.cache.getStatistics()
+        self.assertEqual(dct[lru.HITS], 1)
+        self.assertEqual(dct[lru.MISSES], 1)
+
+    def testEviction(self):
+        if IGNORE_TEST:
+            return
+        _ = self.cache.get(BIOMODEL_NUM)
+        _ = self.cache.get(BIOMODEL_NUM + 1)
+        self.assertEqual(self.cache.getStatistics()[lru.EVICTIONS], 1)
+        # Models larger than the cache are not kept
+        cache = ModelCache(max_size=1)
+        model = cache.get(BIOMODEL_NUM)
+        self.assertFalse(model is cache.get(BIOMODEL_NUM))
+
+    def testReset(self):
+        if IGNORE_TEST:
+            return
+        model = self.cache.get(BIOMODEL_NUM)
+        name = model.parameter_names[0]
+        value = model.get([name])[name]
+        arr1 = np.array(model.roadrunner.simulate())
+        model.set({name: 10*value + 1})
+        model.roadrunner.simulate()
+        model = self.cache.get(BIOMODEL_NUM)
+        self.assertEqual(model.get([name])[name], value)
+        arr2 = np.array(model.roadrunner.simulate())
+        self.assertTrue(np.allclose(arr1, arr2))
+        # Selections
+        selections = list(model.roadrunner.timeCourseSelections)
+        model.roadrunner.timeCourseSelections = selections[:2]
+        model = self.cache.get(BIOMODEL_NUM)
+        self.assertEqual(list(model.roadrunner.timeCourseSelections),
+              selections)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,131 @@
+from smarte.model_cache import ModelCache
+from smarte import model_disk_cache as mdc
+from smarte.model_disk_cache import ModelDiskCache, SBMLReadError
+import SBMLModel as mdl
+
+import numpy as np
+import os
+import roadrunner
+import shutil
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+BIOMODEL_NUM = 12
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(TEST_DIR, "test_model_disk_cache")
+MODEL = mdl.Model.getBiomodel(BIOMODEL_NUM)
+SBML = MODEL.roadrunner.getSBML()
+
+
+#############################
+# Tests
+#############################
+class TestModelDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.remove()
+        self.sbml = SBML
+        self.disk_cache = ModelDiskCache(directory=CACHE_DIR,
+              sbml_reader=lambda _: self.sbml)
+
+    def tearDown(self):
+        self.remove()
+
+    def remove(self):
+        if os.path.isdir(CACHE_DIR):
+            shutil.rmtree(CACHE_DIR)
+
+    def testPutGet(self):
+        if IGNORE_TEST:
+            return
+        self.assertIsNone(self.disk_cache.get(BIOMODEL_NUM))
+        model = MODEL
+        self.disk_cache.put(BIOMODEL_NUM, model)
+        self.assertTrue(self.disk_cache.isExist(BIOMODEL_NUM))
+        new_model = self.disk_cache.get(BIOMODEL_NUM)
+        self.assertEqual(new_model.biomodel_num, BIOMODEL_NUM)
+        arr1 = np.array(model.roadrunner.simulate())
+        arr2 = np.array(new_model.roadrunner.simulate())
+        self.assertTrue(np.allclose(arr1, arr2))
+        #
+        self.disk_cache.delete(BIOMODEL_NUM)
+        self.assertFalse(self.disk_cache.isExist(BIOMODEL_NUM))
+
+    def testStale(self):
+        if IGNORE_TEST:
+            return
+        self.disk_cache.put(BIOMODEL_NUM, MODEL)
+        self.assertFalse(self.disk_cache.isStale(BIOMODEL_NUM))
+        # The SBML of the BioModel changes
+        self.sbml = SBML + " "
+        disk_cache = ModelDiskCache(directory=CACHE_DIR,
+              sbml_reader=lambda _: self.sbml)
+        self.assertFalse(disk_cache.isExist(BIOMODEL_NUM))
+        self.assertTrue(disk_cache.isStale(BIOMODEL_NUM))
+        self.assertIsNone(disk_cache.get(BIOMODEL_NUM))
+
+    def testModelCache(self):
+        if IGNORE_TEST:
+            return
+        model_cache = ModelCache(disk_cache=self.disk_cache)
+        _ = model_cache.get(BIOMODEL_NUM)
+        self.assertTrue(self.disk_cache.isExist(BIOMODEL_NUM))
+        # A new process has an empty memory cache
+        model_cache = ModelCache(disk_cache=self.disk_cache,
+              loader=lambda _: None)
+        model = model_cache.get(BIOMODEL_NUM)
+        self.assertEqual(model.biomodel_num, BIOMODEL_NUM)
+
+    def testDefaultReader(self):
+        if IGNORE_TEST:
+            return
+        sbml = mdc.readBiomodelSBML(BIOMODEL_NUM)
+        self.assertTrue(isinstance(sbml, str))
+        rr = roadrunner.RoadRunner(sbml)
+        arr1 = np.array(rr.simulate())
+        arr2 = np.array(MODEL.roadrunner.simulate())
+        self.assertTrue(np.allclose(arr1, arr2))
+        disk_cache = ModelDiskCache(directory=CACHE_DIR)
+        self.assertEqual(disk_cache.getHash(BIOMODEL_NUM), mdc.calcSBMLHash(sbml))
+        disk_cache.put(BIOMODEL_NUM, MODEL)
+        self.assertTrue(disk_cache.isExist(BIOMODEL_NUM))
+        self.assertEqual(disk_cache.get(BIOMODEL_NUM).biomodel_num,
+              BIOMODEL_NUM)
+
+    def testReaderFailure(self):
+        if IGNORE_TEST:
+            return
+        def reader(_):
+            raise ValueError("no SBML")
+        disk_cache = ModelDiskCache(directory=CACHE_DIR, sbml_reader=reader)
+        with self.assertRaises(SBMLReadError):
+            _ = disk_cache.get(BIOMODEL_NUM)
+        # Models are constructed without the disk cache
+        model_cache = ModelCache(disk_cache=disk_cache)
+        model = model_cache.get(BIOMODEL_NUM)
+        self.assertIsNotNone(model)
+        self.assertFalse(os.path.isdir(disk_cache.directory))
+
+    def testCorruptEntry(self):
+        if IGNORE_TEST:
+            return
+        path = self.disk_cache.put(BIOMODEL_NUM, MODEL)
+        with open(path, "w") as fd:
+            fd.write("corrupt")
+        self.assertIsNone(self.disk_cache.get(BIOMODEL_NUM))
+        self.assertFalse(self.disk_cache.isExist(BIOMODEL_NUM))
+
+    def testGetModelHash(self):
+        if IGNORE_TEST:
+            return
+        model = mdl.Model(MODEL.roadrunner)
+        model_hash = mdc.getModelHash(model)
+        self.assertEqual(model_hash, mdc.calcSBMLHash(SBML))
+        # The hash is calculated once
+        self.assertEqual(getattr(model, mdc.HASH_ATTR), model_hash)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,121 @@
+from smarte.condition import Condition
+from smarte.condition_collection import ConditionCollection
+from smarte.factor_collection import FactorCollection
+from smarte.multi_experiment_condition import MultiExperimentCondition
+from smarte.workunit import Workunit
+import smarte.constants as cn
+
+import os
+import unittest
+
+IGNORE_TEST = False
+IS_PLOT = False
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_WORKUNITS_FILE = os.path.join(TEST_DIR, "test_workunit_workunits.txt")
+DCT1 = dict(biomodel_num=list(range(1, 11)), ts_instance=[1, 2, 3],
+      latincube_idx=[1, 2])
+DCT2 = dict(biomodel_num=list(range(6, 16)), ts_instance=[2, 3, 4],
+      latincube_idx=[1, 2])
+
+
+def _makeConditionStrs(dct):
+    collection = ConditionCollection(**dct)
+    return set(str(c) for c in collection.iterate(Condition))
+
+
+#############################
+# Tests
+#############################
+class TestMultiExperimentCondition(unittest.TestCase):
+
+    def setUp(self):
+        self.multi1 = MultiExperimentCondition.makeFromDct(DCT1)
+        self.multi2 = MultiExperimentCondition.makeFromDct(DCT2)
+        self.strs1 = _makeConditionStrs(DCT1)
+        self.strs2 = _makeConditionStrs(DCT2)
+
+    def check(self, multi_condition, condition_strs):
+        self.assertEqual(len(multi_condition), len(condition_strs))
+        strs = [str(c) for c in multi_condition.iterate()]
+        self.assertEqual(len(strs), len(condition_strs))
+        self.assertEqual(set(strs), condition_strs)
+
+    def testConstructor(self):
+        if IGNORE_TEST:
+            return
+        self.check(self.multi1, self.strs1)
+        multi_condition = MultiExperimentCondition()
+        self.assertTrue(multi_condition.isEmpty())
+        self.assertEqual(len(multi_condition), 0)
+        # Overlapping boxes are made disjoint
+        boxes = [ConditionCollection(**DCT1), ConditionCollection(**DCT2)]
+        multi_condition = MultiExperimentCondition(boxes)
+        self.check(multi_condition, self.strs1.union(self.strs2))
+
+    def testSetOperations(self):
+        if IGNORE_TEST:
+            return
+        self.check(self.multi1.union(self.multi2),
+              self.strs1.union(self.strs2))
+        self.check(self.multi1.intersection(self.multi2),
+              self.strs1.intersection(self.strs2))
+        self.check(self.multi1.difference(self.multi2),
+              self.strs1.difference(self.strs2))
+        self.check(self.multi1.add(DCT2), self.strs1.union(self.strs2))
+        self.assertTrue(self.multi1.difference(self.multi1).isEmpty())
+        self.assertTrue(self.multi1.union(self.multi2).equals(
+              self.multi2.union(self.multi1)))
+        self.assertFalse(self.multi1.equals(self.multi2))
+
+    def testContains(self):
+        if IGNORE_TEST:
+            return
+        multi_condition = self.multi1.difference(self.multi2)
+        for condition in ConditionCollection(**DCT1).iterate(Condition):
+            self.assertEqual(condition in multi_condition,
+                  not str(condition) in self.strs2)
+
+    def testSubtract(self):
+        if IGNORE_TEST:
+            return
+        excludes = dict(biomodel_num=[2, 3], ts_instance=[1])
+        workunit = Workunit(
+              excluded_factor_collection=FactorCollection(**excludes),
+              **DCT1)
+        expected_strs = set(str(c) for c in workunit.iterate())
+        self.check(self.multi1.subtract(excludes), expected_strs)
+        self.check(MultiExperimentCondition.makeFromConditionCollection(
+              workunit), expected_strs)
+
+    def testLarge(self):
+        if IGNORE_TEST:
+            return
+        # Sizes are calculated without enumerating conditions
+        dct1 = dict(DCT1)
+        dct1.update(biomodel_num=cn.SD_CONDITION_VALUE_ALL,
+              max_fev=list(range(100)), noise_mag=list(range(100)))
+        dct2 = dict(dct1)
+        dct2.update(max_fev=list(range(50, 150)))
+        multi1 = MultiExperimentCondition.makeFromDct(dct1)
+        multi2 = MultiExperimentCondition.makeFromDct(dct2)
+        size = len(multi1)
+        self.assertGreater(size, 10**7)
+        self.assertEqual(len(multi1.union(multi2)), size + size//2)
+        self.assertEqual(len(multi1.intersection(multi2)), size//2)
+        self.assertEqual(len(multi1.difference(multi2)), size//2)
+
+    def testMakeFromWorkunitsFile(self):
+        if IGNORE_TEST:
+            return
+        multi_condition = MultiExperimentCondition.makeFromWorkunitsFile(
+              TEST_WORKUNITS_FILE)
+        # The second workunit contains the first
+        self.assertEqual(len(multi_condition),
+              len(cn.SD_CONDITION_EXPANSION_DCT[cn.SD_BIOMODEL_NUM])
+              *len(cn.SD_CONDITION_EXPANSION_DCT[cn.SD_TS_INSTANCE]))
+        collections = multi_condition.makeConditionCollections()
+        self.assertEqual(len(collections), 1)
+
+
+if __name__ == '__main__':
+  unittest.main()
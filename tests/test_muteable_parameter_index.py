@@ -0,0 +1,70 @@
+from smarte.muteable_parameter_index import MuteableParameterIndex
+import smarte.muteable_parameter_index as mpi
+import smarte.constants as cn
+import SBMLModel as mdl
+
+import os
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MODEL = """
+J1: S1 -> S2; k1*S1
+J2: S2 -> S3; k2*S2
+
+S1 = 10
+S2 = 0
+S3 = 0
+k1 = 1
+k2 = 2
+k3 := 2*k2
+"""
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_PATH = os.path.join(TEST_DIR, "test_muteable_parameter_index.csv")
+
+
+#############################
+# Tests
+#############################
+class TestMuteableParameterIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.remove()
+        self.model = mdl.Model(MODEL)
+        self.index = MuteableParameterIndex(path=TEST_PATH)
+
+    def tearDown(self):
+        self.remove()
+
+    def remove(self):
+        if os.path.isfile(TEST_PATH):
+            os.remove(TEST_PATH)
+
+    def testCalcMuteableParameterNames(self):
+        if IGNORE_TEST:
+            return
+        names = mpi.calcMuteableParameterNames(self.model)
+        self.assertTrue("k1" in names)
+        self.assertFalse("k3" in names)
+
+    def testGet(self):
+        if IGNORE_TEST:
+            return
+        names = self.index.get(self.model)
+        self.assertEqual(names, mpi.calcMuteableParameterNames(self.model))
+        # Other models with the same SBML use the same entry
+        model = mdl.Model(MODEL)
+        self.assertEqual(self.index.get(model), names)
+
+    def testSave(self):
+        if IGNORE_TEST:
+            return
+        df = self.index.save([(1, self.model)])
+        self.assertEqual(list(df[cn.SD_BIOMODEL_NUM]), [1])
+        index = MuteableParameterIndex(path=TEST_PATH)
+        self.assertEqual(index.get(mdl.Model(MODEL)), self.index.get(self.model))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,73 @@
+import smarte as smt
+from smarte.population_evaluator import PopulationEvaluator
+import SBMLModel as mdl
+
+import lmfit
+import numpy as np
+import tellurium as te
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MODEL = """
+J1: S1 -> S2; k1*S1
+J2: S2 -> S3; k2*S2
+
+S1 = 10
+S2 = 0
+S3 = 0
+k1 = 1
+k2 = 2
+"""
+POINT_DENSITY = 2
+END_TIME = 5
+NUM_POINT = END_TIME*POINT_DENSITY + 1
+TS = mdl.Timeseries(te.loada(MODEL).simulate(0, END_TIME, NUM_POINT))
+PARAMETERS = lmfit.Parameters()
+PARAMETERS.add(name="k1", value=1, min=0.5, max=10)
+PARAMETERS.add(name="k2", value=1, min=0.5, max=10)
+
+
+#############################
+# Tests
+#############################
+class TestPopulationEvaluator(unittest.TestCase):
+
+    def setUp(self):
+        self.sfitter = smt.SBMLFitter(MODEL, PARAMETERS.copy(), TS,
+              point_density=POINT_DENSITY)
+        self.evaluator = PopulationEvaluator(self.sfitter, 2)
+
+    def tearDown(self):
+        self.evaluator.close()
+
+    def testMakeParameterDct(self):
+        if IGNORE_TEST:
+            return
+        # Internal value of 0 is the middle of the range
+        dct = self.evaluator.makeParameterDct([0, 0])
+        for name, parameter in PARAMETERS.items():
+            expected = (parameter.min + parameter.max)/2
+            self.assertLess(np.abs(dct[name] - expected), 1e-8)
+
+    def testCall(self):
+        if IGNORE_TEST:
+            return
+        population = [np.array([0, 0]), np.array([0.5, -0.5])]
+        def func(values):
+            parameter_dct = self.evaluator.makeParameterDct(values)
+            key = self.sfitter.makeSimulationKey(parameter_dct)
+            self.assertTrue(key in self.sfitter.prefetch_dct)
+            return self.sfitter._simulate(**parameter_dct)
+        results = self.evaluator(func, population)
+        self.assertEqual(len(results), len(population))
+        self.assertEqual(len(self.sfitter.prefetch_dct), 0)
+        # Parallel and serial simulations are the same
+        parameter_dct = self.evaluator.makeParameterDct(population[1])
+        arr = self.sfitter._simulate(**parameter_dct)
+        self.assertTrue(np.allclose(results[1], arr))
+
+
+if __name__ == '__main__':
+  unittest.main()
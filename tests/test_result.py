@@ -1,4 +1,4 @@
-from smarte.result import Result
+from smarte.result import Result, FrozenResult
 from smarte.condition import Condition
 from smarte.condition_collection import ConditionCollection
 import smarte.constants as cn
@@ -25,6 +25,15 @@ class TestResult(unittest.TestCase):
         self.assertGreater(len(self.result), len(self.condition))
         trues = [self.result[k] == v for k, v in self.condition.items()]
         self.assertTrue(all(trues))
+
+    def testFreeze(self):
+        if IGNORE_TEST:
+            return
+        frozen = self.result.freeze()
+        self.assertTrue(isinstance(frozen, FrozenResult))
+        self.assertEqual(dict(frozen), dict(self.result))
+        dct = {frozen: 1}
+        self.assertEqual(dct[Result(**self.condition).freeze()], 1)
         
         
 
@@ -1,9 +1,13 @@
 from smarte.result_collection import ResultCollection
 from smarte.condition_collection import ConditionCollection
+from smarte.result import Result
 import smarte.constants as cn
+from smarte.types.column_buffer import ColumnBuffer
 
+import numpy as np
 import os
 import pandas as pd
+import pickle
 import unittest
 
 IGNORE_TEST = False
@@ -31,7 +35,40 @@ class TestResultCollection(unittest.TestCase):
         result_collection = ResultCollection()
         result_collection.extend(RESULT_DCT)
         self.assertTrue(result_collection.equals(result_collection))
-        
+
+    def testAppend(self):
+        if IGNORE_TEST:
+            return
+        result_collection = ResultCollection()
+        result = Result(method="leastsq", rssq=0.5, cnt=3,
+              status=cn.SD_STATUS_SUCCESS)
+        result_collection.append(result)
+        result_collection.append(result)
+        self.assertEqual(len(result_collection), 2)
+        self.assertTrue(isinstance(result_collection[cn.SD_RSSQ], ColumnBuffer))
+        self.assertTrue(result in result_collection)
+        new_result = list(result_collection.iterate(Result))[1]
+        self.assertTrue(new_result.equals(result))
+        new_collection = pickle.loads(pickle.dumps(result_collection))
+        self.assertTrue(new_collection.equals(result_collection))
+
+    def testMakeDataframe(self):
+        if IGNORE_TEST:
+            return
+        result_collection = ResultCollection()
+        for rssq in [0.5, 1.5]:
+            result_collection.append(Result(method="leastsq", rssq=rssq,
+                  cnt=3))
+        df = result_collection.makeDataframe()
+        self.assertEqual(len(df), 2)
+        self.assertEqual(df[cn.SD_RSSQ].dtype, np.float64)
+        self.assertEqual(df[cn.SD_CNT].dtype, np.int64)
+        # Same dtypes as for lists of values
+        list_df = pd.DataFrame({k: list(v) for k, v in result_collection.items()})
+        self.assertTrue(df.dtypes.equals(list_df.dtypes))
+        self.assertTrue(np.shares_memory(df[cn.SD_RSSQ].values,
+              result_collection[cn.SD_RSSQ]._arr))
+
 
 if __name__ == '__main__':
   unittest.main()
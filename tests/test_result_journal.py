@@ -0,0 +1,68 @@
+from smarte.result import Result
+from smarte.result_journal import ResultJournal
+import smarte.constants as cn
+
+import numpy as np
+import os
+import unittest
+
+IGNORE_TEST = False
+IS_PLOT = False
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_PATH = os.path.join(TEST_DIR, "test_result_journal.jsonl")
+REMOVE_FILES = [TEST_PATH]
+
+
+#############################
+# Tests
+#############################
+class TestResultJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.remove()
+        self.journal = ResultJournal(TEST_PATH)
+
+    def tearDown(self):
+        self.remove()
+
+    def remove(self):
+        for ffile in REMOVE_FILES:
+            if os.path.isfile(ffile):
+                os.remove(ffile)
+
+    def testAppendIterate(self):
+        if IGNORE_TEST:
+            return
+        self.assertFalse(self.journal.isExist())
+        self.assertEqual(len(list(self.journal.iterateRecords())), 0)
+        for biomodel_num in range(1, 4):
+            result = Result(biomodel_num=biomodel_num)
+            result[cn.SD_RSSQ] = np.float64(biomodel_num/2)
+            self.journal.append(biomodel_num, result)
+        records = list(self.journal.iterateRecords())
+        self.assertEqual(len(records), 3)
+        for iterate_idx, result in records:
+            self.assertTrue(isinstance(result, Result))
+            self.assertEqual(result[cn.SD_BIOMODEL_NUM], iterate_idx)
+            self.assertEqual(result[cn.SD_RSSQ], iterate_idx/2)
+
+    def testPartialRecord(self):
+        if IGNORE_TEST:
+            return
+        self.journal.append(1, Result(biomodel_num=1))
+        with open(TEST_PATH, "a") as fd:
+            fd.write('{"iterate_idx": 2, "res')
+        records = list(self.journal.iterateRecords())
+        self.assertEqual(len(records), 1)
+
+    def testDelete(self):
+        if IGNORE_TEST:
+            return
+        self.journal.append(1, Result(biomodel_num=1))
+        self.assertTrue(self.journal.isExist())
+        self.journal.delete()
+        self.assertFalse(self.journal.isExist())
+
+
+if __name__ == '__main__':
+  unittest.main()
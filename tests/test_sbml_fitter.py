@@ -76,12 +76,65 @@ class TestSBMLFitter(unittest.TestCase):
               point_density=POINT_DENSITY)
         self.assertTrue("Fitterpp" in str(type(self.sfitter.fitter)))
 
+    def testFitWorkers(self):
+        if IGNORE_TEST:
+            return
+        self.init()
+        sfitter = smt.SBMLFitter(MODEL, self.parameters, TS,
+              point_density=POINT_DENSITY, workers=2,
+              method_names=[cn.METHOD_DIFFERENTIAL_EVOLUTION])
+        sfitter.fit()
+        self.assertIsNone(sfitter.population_evaluator._pool)
+        values_dct = dict(sfitter.fitter.final_params.valuesdict())
+        for name in ["k1", "k2"]:
+            self.assertLess(np.abs(PARAMETER_DCT[name] - values_dct[name]), 0.01)
+
     def testSimulate(self):
         if IGNORE_TEST:
             return
         df = self.sfitter._simulate(is_dataframe=True, **{"k1": 4, "k2": 4})
         self.assertTrue(np.abs(df.loc[5000, "S3"] - 10) < 0.1)
 
+    def testCalcCandidateResiduals(self):
+        if IGNORE_TEST:
+            return
+        names = list(self.sfitter.parameters.keys())
+        candidate_arr = np.array([[PARAMETER_DCT[n] for n in names],
+              [2*PARAMETER_DCT[n] for n in names]])
+        residual_arr = self.sfitter.calcCandidateResiduals(candidate_arr)
+        self.assertEqual(residual_arr.shape,
+              (2, NUM_POINT, len(self.sfitter.data_columns)))
+        self.assertLess(np.max(np.abs(residual_arr[0])), 1e-3)
+        self.assertGreater(np.max(np.abs(residual_arr[1])), 1e-3)
+        # Parallel simulations
+        sfitter = smt.SBMLFitter(MODEL, self.parameters, TS,
+              point_density=POINT_DENSITY, workers=2)
+        parallel_arr = sfitter.calcCandidateResiduals(candidate_arr)
+        # Worker processes are not left running
+        self.assertIsNone(sfitter.population_evaluator._pool)
+        self.assertTrue(np.allclose(residual_arr, parallel_arr))
+        #
+        with self.assertRaises(ValueError):
+            _ = self.sfitter.calcCandidateResiduals(candidate_arr[:, 1:])
+
+    def testCalcResiduals(self):
+        if IGNORE_TEST:
+            return
+        names = list(self.sfitter.parameters.keys())
+        values = np.array([2*PARAMETER_DCT[n] for n in names])
+        std_arr = self.sfitter.std_ser[self.sfitter.data_columns].values
+        expected_arr = self.sfitter.calcCandidateResiduals(
+              np.array([values]))[0]/std_arr
+        residual_arr = self.sfitter.calcResiduals(values)
+        self.assertTrue(np.allclose(residual_arr, expected_arr))
+        # Selections are restored after a full simulation
+        _ = self.sfitter._simulate(is_dataframe=True)
+        residual_arr = self.sfitter.calcResiduals(values)
+        self.assertTrue(np.allclose(residual_arr, expected_arr))
+        # The fitter uses the same simulation
+        arr = self.sfitter._simulate(**dict(zip(names, values)))
+        self.assertEqual(list(arr.colnames), self.sfitter.data_columns)
+
     def testFitAllColumns(self):
         if IGNORE_TEST:
             return
@@ -160,6 +213,24 @@ class TestSBMLFitter(unittest.TestCase):
         self.assertTrue(isinstance(dct, dict))
         self.assertTrue("differential_evolution" in dct["method"])
 
+    def testSimulationCache(self):
+        if IGNORE_TEST:
+            return
+        self.init()
+        sfitter = smt.SBMLFitter(MODEL, self.parameters, TS, is_collect=True,
+              point_density=POINT_DENSITY, simulation_cache_size=100)
+        arr1 = sfitter._simulate(**{"k1": 4, "k2": 4})
+        arr2 = sfitter._simulate(**{"k1": 4 + 1e-14, "k2": 4})
+        self.assertTrue(arr1 is arr2)
+        df = sfitter._simulate(is_dataframe=True, **{"k1": 4, "k2": 4})
+        self.assertFalse(df is arr1)
+        dct = sfitter.evaluateFit(TRUE_PARAMETERS)
+        self.assertGreaterEqual(dct[cn.SD_SIMULATION_CACHE_HITS], 1)
+        self.assertGreaterEqual(dct[cn.SD_SIMULATION_CACHE_MISSES], 2)
+        # No statistics without caching
+        dct = self.sfitter.evaluateFit(TRUE_PARAMETERS)
+        self.assertFalse(cn.SD_SIMULATION_CACHE_HITS in dct.keys())
+
     def testFitLatinCube(self):
         if IGNORE_TEST:
             return
@@ -210,6 +281,30 @@ class TestSBMLFitter(unittest.TestCase):
               method_names=["differential_evolution"])
         self.assertLess(np.abs(dct[cn.SD_CNT] - max_fev), 2)
         
+    def testEvaluateBiomodelMultistart(self):
+        if IGNORE_TEST:
+            return
+        model_num = 12
+        data = smt.SBMLFitter.makeBiomodelSyntheticData(model_num, 0)
+        latincube_idxs = [1, 2, 3]
+        kwargs = dict(latincube_idxs=latincube_idxs, max_fev=100,
+              method_names=[cn.METHOD_DIFFERENTIAL_EVOLUTION])
+        results = smt.SBMLFitter.evaluateBiomodelMultistart(model_num,
+              data[0], max_workers=2, **kwargs)
+        self.assertEqual(len(results), len(latincube_idxs) + 1)
+        self.assertEqual([d[cn.SD_LATINCUBE_IDX] for d in results[:-1]],
+              latincube_idxs)
+        best_dct = results[-1]
+        self.assertEqual(best_dct[cn.SD_LATINCUBE_IDX], -len(latincube_idxs))
+        self.assertTrue(best_dct[cn.SD_METHOD].endswith(cn.BLC_SUFFIX))
+        self.assertEqual(best_dct[cn.SD_RSSQ],
+              min([d[cn.SD_RSSQ] for d in results[:-1]]))
+        # Early abort
+        results = smt.SBMLFitter.evaluateBiomodelMultistart(model_num,
+              data[0], max_workers=1, rssq_threshold=np.inf, **kwargs)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0][cn.SD_LATINCUBE_IDX], latincube_idxs[0])
+
     def testEvaluateBiomodelFit17(self):
         if IGNORE_TEST:
             return
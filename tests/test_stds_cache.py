@@ -0,0 +1,58 @@
+from smarte.stds_cache import StdsCache
+import smarte.lru_cache as lru
+import SBMLModel as mdl
+
+import numpy as np
+import os
+import shutil
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+BIOMODEL_NUM = 12
+MODEL = mdl.Model.getBiomodel(BIOMODEL_NUM)
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(TEST_DIR, "test_stds_cache")
+ARGS = (0, 5, 51)
+
+
+#############################
+# Tests
+#############################
+class TestStdsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.remove()
+        self.cache = StdsCache(directory=CACHE_DIR)
+
+    def tearDown(self):
+        self.remove()
+
+    def remove(self):
+        if os.path.isdir(CACHE_DIR):
+            shutil.rmtree(CACHE_DIR)
+
+    def testCalculateStds(self):
+        if IGNORE_TEST:
+            return
+        expected_ser = MODEL.calculateStds(*ARGS)
+        std_ser = self.cache.calculateStds(MODEL, *ARGS)
+        self.assertTrue(np.allclose(expected_ser.values, std_ser.values))
+        _ = self.cache.calculateStds(MODEL, *ARGS)
+        self.assertEqual(self.cache.getStatistics()[lru.HITS], 1)
+        # Different arguments are different entries
+        _ = self.cache.calculateStds(MODEL, 0, 10, 51)
+        self.assertEqual(self.cache.getStatistics()[lru.MISSES], 2)
+
+    def testPersistence(self):
+        if IGNORE_TEST:
+            return
+        std_ser = self.cache.calculateStds(MODEL, *ARGS)
+        cache = StdsCache(directory=CACHE_DIR)
+        new_ser = cache.calculateStds(MODEL, *ARGS)
+        self.assertTrue(np.allclose(std_ser.values, new_ser.values))
+
+
+if __name__ == '__main__':
+  unittest.main()
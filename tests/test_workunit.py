@@ -4,7 +4,7 @@ from smarte.condition_collection import ConditionCollection
 from smarte.condition import Condition
 from smarte.result import Result
 from smarte.factor_collection import FactorCollection
-from smarte.workunit import Workunit
+from smarte.workunit import Workunit, WORKUNIT_SEP
 
 import os
 import pandas as pd
@@ -60,6 +60,69 @@ class TestWorkunit(unittest.TestCase):
         self.assertTrue(all(trues))
         self.assertEqual(len(conditions), 5)
 
+    def testExcludeLevels(self):
+        if IGNORE_TEST:
+            return
+        excluded_factor_collection = FactorCollection(ts_instance=[2, 4])
+        workunit = Workunit.makeFromStr(WORKUNIT_STR2,
+              excluded_factor_collection=excluded_factor_collection)
+        conditions = list(workunit.iterate())
+        self.assertEqual(len(workunit), 3)
+        self.assertEqual(len(conditions), len(workunit))
+        self.assertEqual([c[cn.SD_TS_INSTANCE] for c in conditions], [1, 3, 5])
+        self.assertEqual(workunit[1][cn.SD_TS_INSTANCE], 3)
+        self.assertTrue(Condition(**workunit[1]) in workunit)
+        dct = dict(workunit[1])
+        dct[cn.SD_TS_INSTANCE] = 2
+        self.assertFalse(Condition(**dct) in workunit)
+        self.assertEqual(str(workunit),
+              str(Workunit.makeFromStr(WORKUNIT_STR2)))
+        # All conditions are excluded
+        self.assertEqual(len(self.workunit), 0)
+        self.assertEqual(len(list(self.workunit.iterate())), 0)
+
+    def testShard(self):
+        if IGNORE_TEST:
+            return
+        excluded_factor_collection = FactorCollection(ts_instance=[2])
+        workunit = Workunit.makeFromStr(WORKUNIT_STR3, out_dir=TEST_DIR,
+              excluded_factor_collection=excluded_factor_collection)
+        condition_strs = [str(c) for c in workunit.iterate()]
+        cost_fn = lambda c: c[cn.SD_BIOMODEL_NUM]
+        for strategy, kwargs in [("contiguous", {}),
+              ("cost", dict(cost_fn=cost_fn)),
+              ("cost", dict(cost_fn=cost_fn,
+              cost_factors=[cn.SD_BIOMODEL_NUM]))]:
+            shards = workunit.shard(7, strategy=strategy, **kwargs)
+            self.assertEqual(len(shards), 7)
+            self.assertEqual(len(set([s.filename for s in shards])), 7)
+            self.assertEqual(sum([len(s) for s in shards]), len(workunit))
+            shard_strs = []
+            for shard in shards:
+                strs = [str(c) for c in shard.iterate()]
+                self.assertEqual(len(strs), len(shard))
+                shard_strs.extend(strs)
+            self.assertEqual(sorted(shard_strs), sorted(condition_strs))
+            self.assertTrue(Condition(**shards[3][0]) in shards[3])
+            self.assertFalse(Condition(**shards[3][0]) in shards[4])
+        costs = [sum([cost_fn(c) for c in s.iterate()]) for s in shards]
+        self.assertLess(max(costs) - min(costs), max(cost_fn(c)
+              for c in workunit.iterate()))
+        # Shards are resumed from their own files
+        shard = shards[1]
+        conditions = list(shard.iterate())
+        shard.seek(0)
+        shard.serialize()
+        shard.journalResult(Result(**conditions[0]), 1)
+        workunit_str = shard.filename.replace("wu_", "")
+        new_shard = Workunit.deserialize(workunit_str, out_dir=TEST_DIR)
+        self.assertEqual(new_shard.iterate_idx, 1)
+        new_conditions = list(new_shard.iterate(is_restart=False))
+        self.assertEqual(len(new_conditions), len(conditions) - 1)
+        self.assertTrue(new_conditions[0].equals(conditions[1]))
+        with self.assertRaises(ValueError):
+            _ = workunit.shard(2, strategy="cost")
+
     def testSerializeDeserializeEquals(self):
         if IGNORE_TEST:
             return
@@ -68,6 +131,24 @@ class TestWorkunit(unittest.TestCase):
               out_dir=TEST_DIR)
         self.assertTrue(self.workunit.equals(new_workunit))
 
+    def testJournalRecover(self):
+        if IGNORE_TEST:
+            return
+        workunit = Workunit.makeFromStr(WORKUNIT_STR2, out_dir=TEST_DIR)
+        workunit.serialize()
+        conditions = list(workunit.iterate(is_restart=True))
+        for idx, condition in enumerate(conditions[:2]):
+            workunit.journalResult(Result(**condition), idx + 1)
+        new_workunit = Workunit.deserialize(str(workunit), out_dir=TEST_DIR)
+        self.assertEqual(new_workunit.iterate_idx, 2)
+        self.assertEqual(len(new_workunit.result_collection), 2)
+        # Compacted results are not recovered again
+        df = new_workunit.compact()
+        self.assertEqual(len(df), 2)
+        self.assertFalse(new_workunit.journal.isExist())
+        new_workunit = Workunit.deserialize(str(workunit), out_dir=TEST_DIR)
+        self.assertEqual(len(new_workunit.result_collection), 2)
+
     def testAppendResult(self):
         if IGNORE_TEST:
             return
@@ -101,6 +182,28 @@ class TestWorkunit(unittest.TestCase):
         self.assertEqual(len(workunits), 3)
         trues = [isinstance(w, Workunit) for w in workunits]
         self.assertTrue(all(trues))
+        # Workunits on the same line
+        path = os.path.join(TEST_DIR, "test_workunit_sep.txt")
+        with open(path, "w") as fd:
+            fd.write(WORKUNIT_SEP.join([workunit_str, WORKUNIT_STR2]))
+        workunits = self.workunit.makeWorkunitsFromFile(path)
+        os.remove(path)
+        self.assertEqual(len(workunits), 2)
+
+    def testMakeFilename(self):
+        if IGNORE_TEST:
+            return
+        workunit = Workunit.makeFromStr(workunit_str, out_dir=TEST_DIR)
+        self.assertEqual(workunit.filename, "wu_" + str(workunit))
+        # Abbreviated lists of levels have different file names
+        stg1 = WORKUNIT_STR2.replace("ts_instance--1--2--3--4--5",
+              "ts_instance--1--2--3--4--5--6--9")
+        stg2 = WORKUNIT_STR2.replace("ts_instance--1--2--3--4--5",
+              "ts_instance--1--2--3--4--7--8--9")
+        workunit1 = Workunit.makeFromStr(stg1, out_dir=TEST_DIR)
+        workunit2 = Workunit.makeFromStr(stg2, out_dir=TEST_DIR)
+        self.assertEqual(str(workunit1), str(workunit2))
+        self.assertNotEqual(workunit1.filename, workunit2.filename)
 
     def testCalcMultivaluedFactors(self):
         if IGNORE_TEST:
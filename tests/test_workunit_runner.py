@@ -1,4 +1,8 @@
 import smarte as smt
+from smarte import workunit_runner as wr
+from smarte.completed_index import CompletedIndex
+from smarte.result import Result
+from smarte.workunit import WORKUNIT_FILE_PREFIX
 import SBMLModel as mdl
 import fitterpp as fpp
 import smarte.constants as cn
@@ -21,6 +25,7 @@ TEST_FILE1 = os.path.join(TEST_DIR, "test_experiment_runner1.csv")
 WORKUNIT = smt.Workunit(biomodel_num=list(range(1, NUM_MODEL + 1)),
       ts_instance=TS_INSTANCE, noise_mag=0.1,
       out_dir=TEST_DIR)
+TEST_DB = os.path.join(TEST_DIR, "test_workunit_runner.db")
 REMOVE_FILES = [TEST_FILE1]
 
 
@@ -45,6 +50,9 @@ class TestWorkunitRunner(unittest.TestCase):
             if is_remove:
                 path = os.path.join(TEST_DIR, ffile)
                 os.remove(path)
+        for suffix in ["", "-wal", "-shm"]:
+            if os.path.isfile(TEST_DB + suffix):
+                os.remove(TEST_DB + suffix)
 
     def testConstructor(self):
         if IGNORE_TEST:
@@ -67,6 +75,90 @@ class TestWorkunitRunner(unittest.TestCase):
             _ = smt.WorkunitRunner.getTimeseries(biomodel_num,
                   noise_mag, ts_instance)
 
+    def testParseShard(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(wr.parseShard("1/4"), (1, 4))
+        for stg in ["4/4", "-1/4", "1", "a/4", "1/2/3"]:
+            with self.assertRaises(ValueError):
+                _ = wr.parseShard(stg)
+
+    def _makeCompletedIndexes(self):
+        # Index of this runner and of another runner
+        other_index = CompletedIndex(path=TEST_DB, owner="other")
+        completed_index = CompletedIndex(path=TEST_DB,
+              owner=self.workunit.filename)
+        return completed_index, other_index
+
+    def testIterateConditions(self):
+        if IGNORE_TEST:
+            return
+        self.init()
+        conditions = list(self.workunit.iterate(is_restart=False))
+        self.workunit.seek(0)
+        completed_index, other_index = self._makeCompletedIndexes()
+        self.assertTrue(other_index.claim(conditions[1]))
+        self.assertTrue(other_index.claim(conditions[2]))
+        runner = smt.WorkunitRunner(self.workunit,
+              completed_index=completed_index)
+        iterator = runner._iterateConditions()
+        self.assertEqual(runner._updateRestartIdx(next(iterator)[0]), 1)
+        iterate_idx, condition = next(iterator)
+        self.assertEqual(iterate_idx, 3)
+        # A restart does not pass the conditions claimed by the other runner
+        self.assertEqual(runner._updateRestartIdx(iterate_idx), 1)
+        # Released conditions are run at the end
+        other_index.complete(conditions[1])
+        other_index.release(conditions[2])
+        iterate_idxs = []
+        restart_idxs = []
+        for iterate_idx, _ in iterator:
+            iterate_idxs.append(iterate_idx)
+            restart_idxs.append(runner._updateRestartIdx(iterate_idx))
+        self.assertEqual(iterate_idxs, list(range(4, len(conditions))) + [2])
+        self.assertEqual(restart_idxs,
+              [1]*(len(iterate_idxs) - 1) + [len(conditions)])
+        self.assertEqual(len(runner.deferred_dct), 0)
+        completed_index.close()
+        other_index.close()
+
+    def testRestartDeferred(self):
+        if IGNORE_TEST:
+            return
+        self.init()
+        self.workunit.serialize()
+        conditions = list(self.workunit.iterate(is_restart=False))
+        self.workunit.seek(0)
+        completed_index, other_index = self._makeCompletedIndexes()
+        self.assertTrue(other_index.claim(conditions[1]))
+        runner = smt.WorkunitRunner(self.workunit,
+              completed_index=completed_index)
+        num_result = 5
+        for iterate_idx, condition in runner._iterateConditions():
+            runner._recordResult(iterate_idx, condition, Result(**condition),
+                  is_report=False)
+            if len(self.workunit.result_collection) == num_result:
+                # Interrupted without releasing claims
+                break
+        workunit = smt.Workunit.deserialize(
+              self.workunit.filename[len(WORKUNIT_FILE_PREFIX):],
+              out_dir=TEST_DIR)
+        self.assertEqual(len(workunit.result_collection), num_result)
+        # The restart begins at the condition claimed by the other runner
+        self.assertEqual(workunit.iterate_idx, 1)
+        # The other runner gives up its claim. The restarted runner takes
+        # back its own claims and runs only conditions without results.
+        other_index.release(conditions[1])
+        completed_index.close()
+        completed_index = CompletedIndex(path=TEST_DB,
+              owner=workunit.filename)
+        runner = smt.WorkunitRunner(workunit, completed_index=completed_index)
+        iterate_idxs = [i for i, _ in runner._iterateConditions()]
+        self.assertEqual(iterate_idxs, [1] + list(range(num_result + 1,
+              len(conditions))))
+        completed_index.close()
+        other_index.close()
+
     def testRun(self):
         if IGNORE_TEST:
             return
@@ -77,6 +169,19 @@ class TestWorkunitRunner(unittest.TestCase):
         self.assertGreater(count, 0)
         self.assertGreater(len(df), count)
 
+    def testRunParallel(self):
+        if IGNORE_TEST:
+            return
+        self.init()
+        df = self.runner.run(is_report=IGNORE_TEST)
+        workunit = copy.deepcopy(WORKUNIT)
+        runner = smt.WorkunitRunner(workunit, max_workers=2)
+        parallel_df = runner.run(is_report=IGNORE_TEST)
+        self.assertEqual(len(df), len(parallel_df))
+        for column in [cn.SD_BIOMODEL_NUM, cn.SD_STATUS]:
+            self.assertEqual(list(df[column]), list(parallel_df[column]))
+        self.assertEqual(workunit.iterate_idx, len(workunit))
+
     def testRunWorkunitBug1(self):
         if IGNORE_TEST:
             return
@@ -0,0 +1,107 @@
+from smarte.types import column_buffer as cb
+from smarte.types.column_buffer import ColumnBuffer
+
+import copy
+import numpy as np
+import pandas as pd
+import pickle
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+INTS = [3, None, 1, np.int64(5)]
+FLOATS = [0.5, None, 1.5]
+STRS = ["a", "b", None, "a"]
+
+
+#############################
+# Tests
+#############################
+class TestColumnBuffer(unittest.TestCase):
+
+    def testConstructor(self):
+        if IGNORE_TEST:
+            return
+        for values, kind in [(INTS, cb.KIND_INT), (FLOATS, cb.KIND_FLOAT),
+              (STRS, cb.KIND_STR), ([None, None], cb.KIND_NONE),
+              ([], cb.KIND_NONE)]:
+            buffer = ColumnBuffer(values)
+            self.assertEqual(buffer.kind, kind)
+            self.assertEqual(len(buffer), len(values))
+            self.assertEqual(buffer.tolist(), list(values))
+            self.assertEqual([str(v) for v in buffer],
+                  [str(v) for v in values])
+
+    def testAppend(self):
+        if IGNORE_TEST:
+            return
+        buffer = ColumnBuffer()
+        size = 10*cb.INITIAL_CAPACITY + 1
+        for value in range(size):
+            buffer.append(value)
+        self.assertEqual(buffer.tolist(), list(range(size)))
+        self.assertEqual(buffer.kind, cb.KIND_INT)
+        self.assertEqual(buffer[-1], size - 1)
+        self.assertEqual(buffer[1:3], [1, 2])
+        with self.assertRaises(IndexError):
+            _ = buffer[size]
+
+    def testObject(self):
+        if IGNORE_TEST:
+            return
+        values = [None, 0, 0.5, "a", [1], 2**70]
+        buffer = ColumnBuffer()
+        for value in values:
+            buffer.append(value)
+        self.assertEqual(buffer.kind, cb.KIND_OBJECT)
+        self.assertEqual(buffer.tolist(), values)
+        buffer = ColumnBuffer([1, 2**70])
+        self.assertEqual(buffer.tolist(), [1, 2**70])
+
+    def testMakeSeries(self):
+        if IGNORE_TEST:
+            return
+        buffer = ColumnBuffer([0.5, 1.5])
+        ser = buffer.makeSeries()
+        self.assertTrue(np.shares_memory(ser.values, buffer._arr))
+        ser = ColumnBuffer(INTS).makeSeries()
+        self.assertTrue(np.isnan(ser[1]))
+        self.assertEqual(ser[3], 5)
+        ser = ColumnBuffer(STRS).makeSeries()
+        self.assertEqual(ser.dtype, pd.Series(STRS).dtype)
+        self.assertEqual(ser[3], "a")
+        self.assertTrue(pd.isna(ser[2]))
+
+    def testPromote(self):
+        if IGNORE_TEST:
+            return
+        values = [0, None, 0.1, 2]
+        buffer = ColumnBuffer(values)
+        self.assertEqual(buffer.kind, cb.KIND_FLOAT)
+        self.assertEqual(str(buffer), str(values))
+        ser = buffer.makeSeries()
+        self.assertEqual(ser.dtype, pd.Series(values).dtype)
+        self.assertTrue(np.shares_memory(ser.values, buffer._arr))
+        other = pickle.loads(pickle.dumps(buffer))
+        self.assertEqual(str(other), str(values))
+        # Ints that are not exact as floats
+        values = [0.5, 2**60]
+        buffer = ColumnBuffer(values)
+        self.assertEqual(buffer.kind, cb.KIND_OBJECT)
+        self.assertEqual(buffer.tolist(), values)
+
+    def testPickleCopy(self):
+        if IGNORE_TEST:
+            return
+        buffer = ColumnBuffer(STRS)
+        for other in [pickle.loads(pickle.dumps(buffer)),
+              copy.deepcopy(buffer)]:
+            self.assertEqual(other.tolist(), STRS)
+            self.assertEqual(len(other._arr), len(STRS))
+            other.append("c")
+            self.assertEqual(other[-1], "c")
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -1,5 +1,8 @@
 from smarte.types.elemental_dict import ElementalDict,  \
-      VALUE_SEP, LIST_BREAK, KEY_VALUE_SEP
+      VALUE_SEP, LIST_BREAK, KEY_VALUE_SEP, parseStr
+from smarte.types.elemental_type import convertStr, isInt
+
+import numpy as np
 
 import unittest
 
@@ -69,6 +72,58 @@ class TestElementalDict(unittest.TestCase):
         with self.assertRaises(ValueError):
             _ = ElementalDictTest.makeFromStr(stg)
 
+    def testDefaults(self):
+        if IGNORE_TEST:
+            return
+        class ListDictTest(ElementalDict):
+            __slots__ = ()
+            default_dct = {"a": [1, 2], "b": None}
+        dct1 = ListDictTest()
+        dct2 = ListDictTest(b=3)
+        dct1["a"].append(3)
+        self.assertEqual(dct2["a"], [1, 2])
+        self.assertEqual(list(dct2.keys()), ["b", "a"])
+        self.assertFalse(hasattr(dct1, "__dict__"))
+        with self.assertRaises(ValueError):
+            _ = ListDictTest(b={})
+
+    def testIsInt(self):
+        if IGNORE_TEST:
+            return
+        for value in [1, np.int64(1), np.int32(1)]:
+            self.assertTrue(isInt(value))
+        for value in [True, 1.0, "1", None]:
+            self.assertFalse(isInt(value))
+
+    def testConvertStr(self):
+        if IGNORE_TEST:
+            return
+        for stg, value in [("True", True), ("-12", -12), ("2.0", 2.0),
+              ("1e-3", 1e-3), (".5", 0.5), ("all", "all"), ("None", "None"),
+              ("inf", "inf"), ("differential_evolution", "differential_evolution")]:
+            new_value = convertStr(stg)
+            self.assertEqual(new_value, value)
+            self.assertEqual(type(new_value), type(value))
+        with self.assertRaises(ValueError):
+            _ = convertStr("")
+
+    def testParseStr(self):
+        if IGNORE_TEST:
+            return
+        dct = ElementalDictTest(a=[100, 200.2], b="testing", c=1.04)
+        stg = str(dct)
+        new_dct = ElementalDictTest.makeFromStr(stg)
+        self.assertTrue(dct.equals(new_dct))
+        # Results of the cache are not shared
+        new_dct["a"].append(1)
+        self.assertEqual(parseStr(stg)["a"], [100, 200.2])
+        #
+        stg = "a--1__b--leastsq--differential_evolution__c--True"
+        self.assertEqual(parseStr(stg), {"a": 1,
+              "b": ["leastsq", "differential_evolution"], "c": True})
+        with self.assertRaises(RuntimeError):
+            _ = parseStr("a--1__b")
+
 
 if __name__ == '__main__':
   unittest.main()
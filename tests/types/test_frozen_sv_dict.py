@@ -0,0 +1,76 @@
+from smarte.types.frozen_sv_dict import FrozenSVDict
+from smarte.types.sv_dict import SVDict
+
+import copy
+import pickle
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+
+
+class SVDictTest(SVDict):
+    default_dct = {"a": None, "b": 1, "c": "x"}
+
+class FrozenSVDictTest(FrozenSVDict):
+    __slots__ = ()
+    sv_dict_cls = SVDictTest
+
+
+#############################
+# Tests
+#############################
+class TestFrozenSVDict(unittest.TestCase):
+
+    def setUp(self):
+        self.sv_dict = SVDictTest(a=2, c="y")
+        self.frozen = FrozenSVDictTest(**self.sv_dict)
+
+    def testConstructor(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(dict(self.frozen), dict(self.sv_dict))
+        self.assertEqual(str(self.frozen), str(self.sv_dict))
+        self.assertEqual(list(self.frozen.keys()), ["a", "b", "c"])
+        self.assertFalse(hasattr(self.frozen, "__dict__"))
+        with self.assertRaises(ValueError):
+            _ = FrozenSVDictTest(d=1)
+
+    def testImmutable(self):
+        if IGNORE_TEST:
+            return
+        with self.assertRaises(TypeError):
+            self.frozen["a"] = 3
+        with self.assertRaises(AttributeError):
+            self.frozen._key = "a"
+
+    def testHashEquals(self):
+        if IGNORE_TEST:
+            return
+        other = FrozenSVDictTest(a=2, b=1, c="y")
+        self.assertEqual(self.frozen, other)
+        self.assertEqual(hash(self.frozen), hash(other))
+        self.assertEqual(len(set([self.frozen, other])), 1)
+        self.assertNotEqual(self.frozen, FrozenSVDictTest(a=3))
+        self.assertTrue(self.frozen == self.sv_dict)
+        self.assertTrue(self.frozen.equals(self.sv_dict))
+
+    def testPickleCopy(self):
+        if IGNORE_TEST:
+            return
+        for other in [pickle.loads(pickle.dumps(self.frozen)),
+              copy.deepcopy(self.frozen)]:
+            self.assertEqual(self.frozen, other)
+            self.assertTrue(isinstance(other, FrozenSVDictTest))
+
+    def testThaw(self):
+        if IGNORE_TEST:
+            return
+        sv_dict = self.frozen.thaw()
+        self.assertTrue(isinstance(sv_dict, SVDictTest))
+        self.assertTrue(sv_dict.equals(self.sv_dict))
+
+
+if __name__ == '__main__':
+  unittest.main()
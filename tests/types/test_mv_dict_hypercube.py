@@ -1,4 +1,6 @@
+from smarte.types.mv_dict import MVDict
 from smarte.types.mv_dict_hypercube import MVDictHypercube
+from smarte.types.sv_dict import SVDict
 from smarte.types.elemental_type import isList
 
 import unittest
@@ -12,6 +14,9 @@ DCT = dict(a=[1, 2], b=[10], c="all")
 class MVDictHypercubeTest(MVDictHypercube):
     default_dct = {k: [] for k in DCT.keys()}
     expansion_dct = {"c": list(range(4))}
+
+class SVDictTest(SVDict):
+    default_dct = {"a": None, "b": None, "c": None, "d": 0}
         
 
 #############################
@@ -38,12 +43,72 @@ class TestMVDictHypercube(unittest.TestCase):
         for key, value in dct.items():
             self.assertEqual(2*len(self.dict[key]), len(value))
 
+    def testGetitem(self):
+        if IGNORE_TEST:
+            return
+        dcts = list(self.dict._next())
+        self.assertEqual(len(dcts), len(self.dict))
+        for idx, dct in enumerate(dcts):
+            self.assertEqual(self.dict[idx], dct)
+        self.assertEqual(self.dict[-1], dcts[-1])
+        self.assertEqual(self.dict[2:5], dcts[2:5])
+        self.assertEqual(self.dict[::3], dcts[::3])
+        self.assertEqual(self.dict["b"], [10])
+        with self.assertRaises(IndexError):
+            _ = self.dict[len(dcts)]
+
+    def testSeek(self):
+        if IGNORE_TEST:
+            return
+        dcts = list(self.dict._next())
+        for idx in [0, 3, len(dcts) - 1, len(dcts)]:
+            self.dict.seek(idx)
+            items = list(self.dict.iterate(dict, is_restart=False))
+            self.assertEqual(items, dcts[idx:])
+            self.assertEqual(self.dict.iterate_idx, len(dcts))
+        with self.assertRaises(IndexError):
+            self.dict.seek(len(dcts) + 1)
+
+    def testContains(self):
+        if IGNORE_TEST:
+            return
+        def test(sv_dict):
+            # Compare with the membership test that iterates
+            expected = MVDict.__contains__(self.dict, sv_dict)
+            self.assertEqual(sv_dict in self.dict, expected)
+            return expected
+        #
+        self.dict.seek(3)
+        self.assertTrue(test(SVDictTest(a=2, b=10, c=3)))
+        self.assertTrue(test(SVDictTest(a=1, b=10, c=0, d=0)))
+        self.assertFalse(test(SVDictTest(a=1, b=10, c=4)))
+        self.assertFalse(test(SVDictTest(a=1, b=10, c=0, d=1)))
+        self.assertFalse(test(SVDictTest(a=3, b=10, c=0)))
+        self.assertEqual(self.dict.iterate_idx, 3)
+        # Changes to the levels
+        self.dict.append({"a": 3})
+        self.assertTrue(test(SVDictTest(a=3, b=10, c=0)))
+        self.dict["b"] = [11]
+        self.assertFalse(test(SVDictTest(a=3, b=10, c=0)))
+
     def testMakeMVDictTable(self):
         if IGNORE_TEST:
             return
         mv_dict_table = self.dict.makeMVDictTable()
         length = len(self.dict)
         self.assertEqual(length, len(mv_dict_table))
+        self.assertEqual(list(mv_dict_table._next()), list(self.dict._next()))
+
+    def testMakeDataframe(self):
+        if IGNORE_TEST:
+            return
+        df = self.dict.makeDataframe()
+        self.assertEqual(list(df.columns), list(self.dict.keys()))
+        self.assertEqual(df.to_dict(orient="records"), list(self.dict._next()))
+        self.assertEqual(df["c"].dtype, int)
+        # Empty hypercube
+        dct = MVDictHypercubeTest(a=[], b=[10], c=[1, 2])
+        self.assertEqual(len(dct.makeDataframe()), 0)
 
 
 if __name__ == '__main__':
@@ -52,6 +52,15 @@ class TestMVDictTable(unittest.TestCase):
         trues = [isinstance(e, SVDictTest) for e in sv_dicts]
         self.assertTrue(all(trues))
 
+    def testContains(self):
+        if IGNORE_TEST:
+            return
+        self.assertTrue(SVDictTest(a=3, b=30, c=300) in self.dict)
+        self.assertFalse(SVDictTest(a=3, b=30, c=200) in self.dict)
+        self.dict.append(dict(a=3, b=30, c=200))
+        self.assertTrue(SVDictTest(a=3, b=30, c=200) in self.dict)
+        self.assertEqual(self.dict.iterate_idx, 0)
+
     def testMakeFromSVDicts(self):
         if IGNORE_TEST:
             return
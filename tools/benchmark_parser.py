@@ -0,0 +1,99 @@
+"""Compares the time to parse workunit strings with the eval based parser."""
+
+from smarte import constants as cn
+from smarte.types import elemental_dict
+from smarte.types.elemental_dict import KEY_VALUE_SEP, VALUE_SEP
+from smarte.types.elemental_type import isBool, isInt, isFloat, isStr
+
+import argparse
+import time
+
+NUM_REPETITION = 1000
+
+
+def _evalConvert(value):
+    # Type conversion done by ElementalDict.makeFromStr before it parsed literals
+    if isStr(value):
+        if isBool(eval(value)):
+            new_value = eval(value)
+        elif isInt(eval(value)):
+            new_value = int(value)
+        elif isFloat(eval(value)):
+            new_value = float(value)
+        else:
+            new_value = value
+    else:
+        new_value = value
+    return new_value
+
+def _evalParseStr(stg):
+    dct = {}
+    for key_value in stg.split(KEY_VALUE_SEP):
+        parts = key_value.split(VALUE_SEP)
+        key = parts[0]
+        if len(parts) == 2:
+            try:
+                dct[key] = _evalConvert(parts[1])
+            except NameError:
+                dct[key] = parts[1]
+        else:
+            dct[key] = []
+            for value in parts[1:]:
+                try:
+                    dct[key].append(_evalConvert(value))
+                except NameError:
+                    dct[key].append(value)
+    return dct
+
+def _calcTime(func, stgs, num_repetition):
+    start = time.time()
+    for _ in range(num_repetition):
+        for stg in stgs:
+            _ = func(stg)
+    return time.time() - start
+
+def main(path=cn.WORKUNITS_FILE, num_repetition=NUM_REPETITION):
+    """
+    Parses the workunit strings in a file with each parser.
+
+    Parameters
+    ----------
+    path: str (file of workunit strings)
+    num_repetition: int (number of times the strings are parsed)
+
+    Returns
+    -------
+    dict
+        key: name of the parser
+        value: time in seconds
+    """
+    with open(path, "r") as fd:
+        stgs = [l.strip() for l in fd.readlines()]
+    stgs = [s for s in stgs if (len(s) > 0) and (s[0] != "#")]
+    for stg in stgs:
+        if _evalParseStr(stg) != elemental_dict.parseStr(stg):
+            raise RuntimeError("Parsers differ for %s" % stg)
+    #
+    def parseStrUncached(stg):
+        elemental_dict._parseStr.cache_clear()
+        return elemental_dict.parseStr(stg)
+    #
+    return {
+          "eval": _calcTime(_evalParseStr, stgs, num_repetition),
+          "parseStr (no cache)": _calcTime(parseStrUncached, stgs,
+                num_repetition),
+          "parseStr": _calcTime(elemental_dict.parseStr, stgs, num_repetition),
+          }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+          description="Measures the time to parse workunit strings.")
+    parser.add_argument("--path", type=str, default=cn.WORKUNITS_FILE,
+          help="file of workunit strings")
+    parser.add_argument("--num_repetition", type=int, default=NUM_REPETITION,
+          help="number of times the strings are parsed")
+    args = parser.parse_args()
+    time_dct = main(path=args.path, num_repetition=args.num_repetition)
+    for name, elapsed in time_dct.items():
+        print("%s: %.4f sec" % (name, elapsed))
@@ -0,0 +1,90 @@
+"""Measures the evaluations per second of the simulation hot path.
+
+Compares a simulation that sets the roadrunner selections on each call,
+which is what SBMLFitter._simulate did, with SBMLFitter._simulate, which
+sets them only if they have changed. _simulate is the simulation that
+fitterpp does for each evaluation of a fit.
+"""
+
+from smarte.model_cache import MODEL_CACHE
+from smarte.sbml_fitter import SBMLFitter
+
+import argparse
+import lmfit
+import numpy as np
+import time
+
+NUM_EVALUATION = 1000
+
+
+def _makeFitter(biomodel_num, num_parameter):
+    model = MODEL_CACHE.get(biomodel_num)
+    if model is None:
+        raise ValueError("Cannot construct BioModel %d" % biomodel_num)
+    parameter_names = model.parameter_names[:num_parameter]
+    parameter_dct = model.get(parameter_names)
+    parameters = lmfit.Parameters()
+    for name, value in parameter_dct.items():
+        parameters.add(name, value=value, min=0, max=10*value + 1)
+    data_ts = model.simulate(0, 10, 101)
+    return SBMLFitter(model, parameters, data_ts, 0, 10)
+
+def _calcRate(func, values_arr):
+    start = time.time()
+    for values in values_arr:
+        func(values)
+    return len(values_arr)/(time.time() - start)
+
+def main(biomodel_num=1, num_parameter=3, num_evaluation=NUM_EVALUATION):
+    """
+    Reports the evaluations per second for each way of simulating.
+
+    Parameters
+    ----------
+    biomodel_num: int
+    num_parameter: int (number of parameters varied)
+    num_evaluation: int
+
+    Returns
+    -------
+    dict
+        key: name of the method
+        value: evaluations per second
+    """
+    sfitter = _makeFitter(biomodel_num, num_parameter)
+    names = list(sfitter.parameters.keys())
+    initial_arr = np.array([sfitter.parameters[n].value for n in names])
+    factor_arr = np.random.uniform(0.5, 1.5, (num_evaluation, len(names)))
+    values_arr = initial_arr*factor_arr
+    rr = sfitter.model.roadrunner
+    #
+    def simulateSelections(values):
+        sfitter.model.set(dict(zip(names, values)))
+        rr.reset()
+        return rr.simulate(sfitter.start_time, sfitter.end_time,
+              sfitter.num_point, sfitter.data_columns)
+    #
+    def simulate(values):
+        return sfitter._simulate(**dict(zip(names, values)))
+    #
+    return {
+          "selections per call": _calcRate(simulateSelections, values_arr),
+          "_simulate": _calcRate(simulate, values_arr),
+          }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+          description="Measures simulation evaluations per second.")
+    parser.add_argument("--biomodel_num", type=int, default=1,
+          help="BioModel simulated")
+    parser.add_argument("--num_parameter", type=int, default=3,
+          help="number of parameters varied")
+    parser.add_argument("--num_evaluation", type=int, default=NUM_EVALUATION,
+          help="number of evaluations for each method")
+    args = parser.parse_args()
+    rate_dct = main(biomodel_num=args.biomodel_num,
+          num_parameter=args.num_parameter,
+          num_evaluation=args.num_evaluation)
+    for name, rate in rate_dct.items():
+        print("%s: %.1f evaluations/sec" % (name, rate))
@@ -0,0 +1,39 @@
+"""Records the conditions of existing results in the completed index."""
+
+from smarte import constants as cn
+from smarte.completed_index import CompletedIndex
+
+import argparse
+
+
+def main(directory=cn.EXPERIMENT_DIR, path=cn.COMPLETED_INDEX_PATH):
+    """
+    Adds the conditions of the results in workunit CSV files and zip
+    archives to the index.
+
+    Parameters
+    ----------
+    directory: str (directory with results)
+    path: str (path to the index)
+
+    Returns
+    -------
+    int (number of completed conditions in the index)
+    """
+    index = CompletedIndex(path=path)
+    _ = index.addResultFiles(directory=directory)
+    num_completed = len(index)
+    index.close()
+    return num_completed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+          description="Records existing results in the completed index.")
+    parser.add_argument("--directory", type=str, default=cn.EXPERIMENT_DIR,
+          help="directory with result CSV files and zip archives")
+    parser.add_argument("--path", type=str, default=cn.COMPLETED_INDEX_PATH,
+          help="path to the index")
+    args = parser.parse_args()
+    num = main(directory=args.directory, path=args.path)
+    print("***%d completed conditions in %s" % (num, args.path))
@@ -0,0 +1,43 @@
+"""Creates the index of muteable parameters for BioModels."""
+
+from smarte import constants as cn
+from smarte.model_cache import ModelCache
+from smarte.model_disk_cache import ModelDiskCache
+from smarte.muteable_parameter_index import MuteableParameterIndex
+
+
+def main(biomodel_nums=cn.SD_CONDITION_EXPANSION_DCT[cn.SD_BIOMODEL_NUM],
+      path=cn.MUTEABLE_PARAMETER_PATH):
+    """
+    Writes the muteable parameters of BioModels to the index file.
+
+    Parameters
+    ----------
+    biomodel_nums: list-int
+    path: str (path to the index file)
+
+    Returns
+    -------
+    int (number of models in the index)
+    """
+    # Models are used once. A cache of 1 byte keeps none in memory.
+    model_cache = ModelCache(max_size=1, disk_cache=ModelDiskCache())
+    # Entries in an existing index file are reused since they are
+    # keyed by the SBML hash
+    index = MuteableParameterIndex(path=path)
+    def iterateModels():
+        for biomodel_num in biomodel_nums:
+            try:
+                model = model_cache.get(biomodel_num)
+            except Exception:
+                model = None
+            if model is not None:
+                yield biomodel_num, model
+    #
+    df = index.save(iterateModels())
+    return len(df)
+
+
+if __name__ == '__main__':
+    num = main()
+    print("***Indexed %d models in %s" % (num, cn.MUTEABLE_PARAMETER_PATH))
@@ -1,25 +1,386 @@
-"""Creates workunits based on levels of factors"""
+"""Creates workunits based on levels of factors
+
+The planner constructs the conditions for levels of factors and removes the
+conditions of excluded BioModels and conditions that already have results.
+The remaining conditions are partitioned into hypercubes that are packed
+into one line for each worker so that the lines have nearly equal predicted
+run times. Run times are predicted by a CostModel. Hypercubes are written as
+workunit strings with complete lists of levels. A line with several
+hypercubes has workunit strings separated by WORKUNIT_SEP, which are run
+in sequence.
+"""
 
-import smarte as smt
 import smarte.constants as cn
+from smarte.completed_index import readResults
+from smarte.condition import Condition
+from smarte.cost_model import COST_FACTORS, CostModel
+from smarte.multi_experiment_condition import MultiExperimentCondition
+from smarte.persister import Persister
+from smarte.types.elemental_dict import KEY_VALUE_SEP, VALUE_SEP
+from smarte.types.elemental_type import convertStr
+from smarte.workunit import WORKUNIT_SEP
+from smarte.workunit_runner import EXCLUDE_FACTOR_DCT
 
+import argparse
+import heapq
+import itertools
+import numpy as np
 import os
 
+FACTORS = list(cn.SD_CONDITIONS)
+MAX_GRANULARITY = 16  # Maximum number of parts in a worker's share of cost
+BALANCE_TOLERANCE = 0.05  # Acceptable excess of the max cost over the mean
+
+
+class _CostCalculator(object):
+    # Calculates the predicted cost of boxes of conditions
+
+    def __init__(self, cost_fn=None):
+        """
+        Parameters
+        ----------
+        cost_fn: Function
+            Parameters: Condition
+            Returns: float (predicted run time)
+            default: each condition has the same cost
+        """
+        self.cost_fn = cost_fn
+        self.cost_dct = {}  # key: levels of COST_FACTORS, value: cost
+
+    def _getCost(self, dct):
+        if self.cost_fn is None:
+            return 1.0
+        key = tuple(dct[f] for f in COST_FACTORS)
+        if not key in self.cost_dct:
+            self.cost_dct[key] = float(self.cost_fn(Condition(**dct)))
+        return self.cost_dct[key]
+
+    def calcLevelCosts(self, box, factor):
+        """
+        Calculates the cost of the conditions with each level of a factor.
+
+        Parameters
+        ----------
+        box: dict
+            key: factor
+            value: collection of levels
+        factor: str
+
+        Returns
+        -------
+        dict
+            key: level
+            value: cost
+        """
+        other_factors = [f for f in COST_FACTORS if f != factor]
+        size = 1
+        for other_factor in FACTORS:
+            if (not other_factor in COST_FACTORS) and (other_factor != factor):
+                size *= len(box[other_factor])
+        cost_dct = {}
+        for level in box[factor]:
+            cost = 0.0
+            for levels in itertools.product(*[box[f] for f in other_factors]):
+                dct = dict(zip(other_factors, levels))
+                dct[factor] = level
+                cost += self._getCost(dct)
+            cost_dct[level] = cost*size
+        return cost_dct
+
+    def calcCost(self, box):
+        """
+        Calculates the cost of the conditions in a box.
+
+        Returns
+        -------
+        float
+        """
+        return sum(self.calcLevelCosts(box, FACTORS[0]).values())
+
+
+def _splitBox(box, num_part, calculator, factor):
+    """
+    Partitions a box on a factor. Levels are assigned in decreasing cost to
+    the part with the least cost.
+
+    Parameters
+    ----------
+    box: dict
+    num_part: int (no larger than the number of levels of the factor)
+    calculator: _CostCalculator
+    factor: str
+
+    Returns
+    -------
+    list-dict
+    """
+    cost_dct = calculator.calcLevelCosts(box, factor)
+    levels = sorted(cost_dct.keys(), key=lambda v: cost_dct[v], reverse=True)
+    heap = [(0.0, n) for n in range(num_part)]
+    level_lsts = [[] for _ in range(num_part)]
+    for level in levels:
+        cost, part_idx = heapq.heappop(heap)
+        level_lsts[part_idx].append(level)
+        heapq.heappush(heap, (cost + cost_dct[level], part_idx))
+    boxes = []
+    for level_lst in level_lsts:
+        new_box = dict(box)
+        new_box[factor] = frozenset(level_lst)
+        boxes.append(new_box)
+    return boxes
+
+def _partitionBox(box, max_cost, calculator):
+    """
+    Splits a box recursively on the factor with the most levels until each
+    part costs no more than max_cost or has a single condition.
+
+    Parameters
+    ----------
+    box: dict
+    max_cost: float
+    calculator: _CostCalculator
+
+    Returns
+    -------
+    list-dict
+    """
+    cost = calculator.calcCost(box)
+    factors = [f for f in FACTORS if len(box[f]) > 1]
+    if (cost <= max_cost) or (len(factors) == 0):
+        return [box]
+    factor = max(factors, key=lambda f: len(box[f]))
+    num_part = min(len(box[factor]), int(np.ceil(cost/max_cost)))
+    boxes = []
+    for part in _splitBox(box, num_part, calculator, factor):
+        boxes.extend(_partitionBox(part, max_cost, calculator))
+    return boxes
+
+def _packBoxes(boxes, costs, num_bin):
+    """
+    Assigns boxes in decreasing cost to the bin with the least cost.
+
+    Parameters
+    ----------
+    boxes: list-dict
+    costs: list-float
+    num_bin: int
+
+    Returns
+    -------
+    list-list-dict (boxes in each bin)
+    list-float (cost of each bin)
+    """
+    num_bin = min(num_bin, len(boxes))
+    heap = [(0.0, n) for n in range(num_bin)]
+    box_lsts = [[] for _ in range(num_bin)]
+    bin_costs = [0.0]*num_bin
+    for idx in sorted(range(len(boxes)), key=lambda n: costs[n], reverse=True):
+        cost, bin_idx = heapq.heappop(heap)
+        box_lsts[bin_idx].append(boxes[idx])
+        bin_costs[bin_idx] = cost + costs[idx]
+        heapq.heappush(heap, (bin_costs[bin_idx], bin_idx))
+    return box_lsts, bin_costs
+
+def _mergeBoxes(boxes):
+    """
+    Combines boxes that differ in the levels of at most one factor.
+
+    Parameters
+    ----------
+    boxes: list-dict
+
+    Returns
+    -------
+    list-dict
+    """
+    boxes = list(boxes)
+    is_merged = True
+    while is_merged:
+        is_merged = False
+        for idx1, idx2 in itertools.combinations(range(len(boxes)), 2):
+            box1, box2 = boxes[idx1], boxes[idx2]
+            factors = [f for f in FACTORS
+                  if frozenset(box1[f]) != frozenset(box2[f])]
+            if len(factors) <= 1:
+                new_box = dict(box1)
+                for factor in factors:
+                    new_box[factor] = frozenset(box1[factor]).union(box2[factor])
+                boxes[idx1] = new_box
+                del boxes[idx2]
+                is_merged = True
+                break
+    return boxes
+
+def planWorkunits(multi_condition, num_worker, cost_fn=None):
+    """
+    Partitions conditions into hypercubes and packs them into one list of
+    hypercubes for each worker so that the lists have nearly equal costs.
+    The disjoint boxes of the conditions are split recursively across
+    factors into parts that cost no more than a fraction of a worker's
+    share, and the parts are packed by decreasing cost. The fraction is
+    halved until the packing is balanced or MAX_GRANULARITY is reached.
+    Parts for the same worker are merged where they form a hypercube.
+
+    Parameters
+    ----------
+    multi_condition: MultiExperimentCondition
+    num_worker: int
+    cost_fn: Function (see _CostCalculator)
+
+    Returns
+    -------
+    list-list-dict (hypercubes for each worker)
+    list-float (predicted cost for each worker)
+    """
+    calculator = _CostCalculator(cost_fn)
+    boxes = multi_condition.boxes
+    if len(boxes) == 0:
+        return [], []
+    share = sum([calculator.calcCost(b) for b in boxes])/num_worker
+    best_plan = None
+    num_part = -1
+    granularity = 1
+    while granularity <= MAX_GRANULARITY:
+        parts = []
+        for box in boxes:
+            parts.extend(_partitionBox(box, share/granularity, calculator))
+        if len(parts) == num_part:
+            # Parts cannot be split further
+            break
+        num_part = len(parts)
+        costs = [calculator.calcCost(b) for b in parts]
+        box_lsts, bin_costs = _packBoxes(parts, costs, num_worker)
+        if (best_plan is None) or (max(bin_costs) < max(best_plan[1])):
+            best_plan = (box_lsts, bin_costs)
+        if max(bin_costs) <= share*(1 + BALANCE_TOLERANCE):
+            break
+        granularity *= 2
+    box_lsts, bin_costs = best_plan
+    return [_mergeBoxes(l) for l in box_lsts], bin_costs
+
+def makeWorkunitStr(box):
+    """
+    Creates the string representation of a hypercube with all of its levels.
+    Levels are sorted. The string of a Workunit abbreviates long lists.
+
+    Parameters
+    ----------
+    box: dict
+
+    Returns
+    -------
+    str
+    """
+    stgs = [VALUE_SEP.join([f] + [str(v) for v in sorted(box[f])])
+          for f in sorted(FACTORS)]
+    return KEY_VALUE_SEP.join(stgs)
+
+def makeCompletedCondition(df):
+    """
+    Constructs the conditions that have results.
+
+    Parameters
+    ----------
+    df: pd.DataFrame (results)
+
+    Returns
+    -------
+    MultiExperimentCondition
+    """
+    if len(set(FACTORS).difference(df.columns)) > 0:
+        return MultiExperimentCondition()
+    df = df[FACTORS].dropna().drop_duplicates()
+    other_factors = [f for f in FACTORS if f != cn.SD_BIOMODEL_NUM]
+    boxes = []
+    for levels, group_df in df.groupby(other_factors):
+        box = {f: [_convert(v)] for f, v in zip(other_factors, levels)}
+        box[cn.SD_BIOMODEL_NUM] = [_convert(v)
+              for v in group_df[cn.SD_BIOMODEL_NUM].values]
+        boxes.append(box)
+    return MultiExperimentCondition(boxes)
+
+def _convert(value):
+    # Makes values read from files the same as values parsed from strings
+    return convertStr(str(value))
+
+def main(level_dct, num_worker, path=cn.WORKUNITS_FILE,
+      result_dir=cn.EXPERIMENT_DIR, cost_model_path=None, is_exclude=True):
+    """
+    Writes workunits for the conditions that have not been run.
+
+    Parameters
+    ----------
+    level_dct: dict
+        key: factor
+        value: list of levels or cn.SD_CONDITION_VALUE_ALL
+        Factors that are not specified have their default levels.
+    num_worker: int (number of workunits run at the same time)
+    path: str (file of workunit strings)
+    result_dir: str (directory with results and workunit files)
+    cost_model_path: str (saved CostModel)
+        default: estimate the model from the results
+    is_exclude: bool (remove the BioModels in EXCLUDE_FACTOR_DCT)
+
+    Returns
+    -------
+    list-str (workunit strings for each worker)
+    list-float (predicted costs)
+    """
+    multi_condition = MultiExperimentCondition.makeFromDct(level_dct)
+    if is_exclude:
+        multi_condition = multi_condition.subtract(EXCLUDE_FACTOR_DCT)
+    result_df = readResults(directory=result_dir)
+    multi_condition = multi_condition.difference(
+          makeCompletedCondition(result_df))
+    if cost_model_path is not None:
+        cost_model = Persister(cost_model_path).load()
+    else:
+        try:
+            cost_model = CostModel.makeFromDataframe(result_df)
+        except (KeyError, ValueError):
+            # No usable results. Conditions have the same cost.
+            cost_model = None
+    cost_fn = None if cost_model is None else cost_model.predict
+    box_lsts, costs = planWorkunits(multi_condition, num_worker,
+          cost_fn=cost_fn)
+    workunit_strs = [WORKUNIT_SEP.join([makeWorkunitStr(b) for b in l])
+          for l in box_lsts]
+    with open(path, "w") as fd:
+        fd.write("\n".join(workunit_strs))
+    return workunit_strs, costs
+
 
-workunits = []
-for max_fev in [1000]:
-    for method in ["differential_evolution", "leastsq"]:
-        for latincube_idx in range(1, 2):
-            for noise_mag in [0.1, 0.2]:
-                for ts_instance in [1, 2]:
-                    workunit = smt.Workunit(
-                          max_fev=max_fev,
-                          method=method,
-                          latincube_idx=latincube_idx,
-                          noise_mag=noise_mag,
-                          ts_instance=ts_instance,
-                          )
-                    workunits.append(str(workunit))
-
-with open(cn.WORKUNITS_FILE, "w") as fd:
-    fd.write("\n".join(workunits))
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+          description="Writes workunits with nearly equal predicted run times.")
+    for factor in FACTORS:
+        parser.add_argument("--%s" % factor, type=str, nargs="+",
+              default=None, help="levels of %s" % factor)
+    parser.add_argument("--num_worker", type=int, default=os.cpu_count(),
+          help="number of workunits run at the same time")
+    parser.add_argument("--path", type=str, default=cn.WORKUNITS_FILE,
+          help="file of workunit strings")
+    parser.add_argument("--result_dir", type=str, default=cn.EXPERIMENT_DIR,
+          help="directory with results and workunit files")
+    parser.add_argument("--cost_model_path", type=str, default=None,
+          help="saved CostModel")
+    parser.add_argument("--no_exclude", action="store_true",
+          help="keep the BioModels in data/biomodels_exclude.csv")
+    args = parser.parse_args()
+    level_dct = {}
+    for factor in FACTORS:
+        levels = getattr(args, factor)
+        if levels is None:
+            continue
+        if levels == [cn.SD_CONDITION_VALUE_ALL]:
+            level_dct[factor] = cn.SD_CONDITION_VALUE_ALL
+        else:
+            level_dct[factor] = [convertStr(v) for v in levels]
+    workunit_strs, costs = main(level_dct, args.num_worker, path=args.path,
+          result_dir=args.result_dir, cost_model_path=args.cost_model_path,
+          is_exclude=not args.no_exclude)
+    for workunit_str, cost in zip(workunit_strs, costs):
+        print("%12.1f %s" % (cost, workunit_str[:100]))
+    if len(costs) > 0:
+        print("***Wrote %d workunits to %s. Predicted max/mean cost: %2.2f"
+              % (len(costs), args.path, max(costs)/np.mean(costs)))
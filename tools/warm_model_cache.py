@@ -0,0 +1,57 @@
+"""Populates the persistent cache of compiled BioModels."""
+
+from smarte import constants as cn
+from smarte.model_disk_cache import ModelDiskCache
+import SBMLModel as mdl
+
+import argparse
+
+
+def main(start_num=1, num_model=cn.NUM_BIOMODEL_MAX, is_force=False,
+      directory=cn.MODEL_CACHE_DIR):
+    """
+    Compiles BioModels and saves them in the disk cache. Models are compiled
+    only if they have no entry for their current SBML.
+
+    Parameters
+    ----------
+    start_num: int (starting model)
+    num_model: int (number of models)
+    is_force: bool (replace entries for SBML that has changed)
+    directory: str (directory of the cache)
+
+    Returns
+    -------
+    int (number of models added)
+    """
+    disk_cache = ModelDiskCache(directory=directory)
+    num_added = 0
+    for model_num in range(start_num, start_num + num_model):
+        try:
+            if disk_cache.isExist(model_num):
+                continue
+            if disk_cache.isStale(model_num) and (not is_force):
+                continue
+            model = mdl.Model.getBiomodel(model_num)
+            if model is None:
+                continue
+            disk_cache.put(model_num, model)
+            num_added += 1
+        except Exception as exp:
+            print("***Model %d: %s" % (model_num, str(exp)))
+    return num_added
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+          description="Saves compiled BioModels in the model cache.")
+    parser.add_argument("--start_num", type=int, default=1,
+          help="first BioModel number")
+    parser.add_argument("--num_model", type=int, default=cn.NUM_BIOMODEL_MAX,
+          help="number of BioModels")
+    parser.add_argument("--force", action="store_true",
+          help="recompile models whose SBML has changed")
+    args = parser.parse_args()
+    num = main(start_num=args.start_num, num_model=args.num_model,
+          is_force=args.force)
+    print("***Added %d models to %s" % (num, cn.MODEL_CACHE_DIR))